@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+导入耗时基准测试
+在全新的解释器中反复导入模块，比较冷启动耗时
+
+用法:
+    python benchmarks/import_time.py [模块名 ...] [-n 次数]
+"""
+
+import os
+import sys
+import argparse
+import statistics
+import subprocess
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_MODULES = ('cli', 'shortcut_checker')
+
+
+def measure(module, runs):
+    """
+    测量导入模块的耗时
+
+    参数:
+        module (str): 模块名，空字符串表示只启动解释器
+        runs (int): 重复次数
+
+    返回:
+        list: 每次的导入耗时(秒)，由-X importtime汇总，不含解释器启动
+    """
+    code = f"import {module}" if module else "pass"
+    samples = []
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", code],
+            cwd=ROOT, capture_output=True, text=True, check=True
+        )
+        total = 0
+        for line in result.stderr.splitlines():
+            # 只累加顶层模块(缩进最浅)的累计耗时
+            if not line.startswith("import time:") or "|" not in line:
+                continue
+            parts = line.split("|")
+            name = parts[2]
+            if parts[1].strip().isdigit() and name.startswith(" ") and not name.startswith("  "):
+                total += int(parts[1])
+        samples.append(total / 1e6)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description="测量模块的冷启动导入耗时")
+    parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES)
+    parser.add_argument("-n", "--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    baseline = statistics.median(measure('', args.runs))
+    print(f"{'模块':<20}{'中位数(ms)':>12}{'最小(ms)':>12}")
+    for module in args.modules:
+        samples = measure(module, args.runs)
+        # 扣除解释器启动时本来就会导入的模块
+        median = max(statistics.median(samples) - baseline, 0)
+        best = max(min(samples) - baseline, 0)
+        print(f"{module:<20}{median * 1000:>12.1f}{best * 1000:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
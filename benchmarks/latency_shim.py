@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+文件系统延迟模拟模块
+在本机文件系统调用前注入固定延迟，用于在Linux上重现网络共享的访问特性
+"""
+
+import os
+import time
+import random
+import builtins
+import threading
+
+
+class LatencyShim:
+    """
+    文件系统延迟注入器
+
+    作为上下文管理器使用，期间对指定目录下路径的os.stat、os.lstat、os.scandir、
+    os.listdir和open调用先等待latency秒再执行。os.path.exists和os.path.isdir
+    内部调用os.stat，因此也会变慢；已绑定到默认参数的os.path.exists同样生效
+    """
+
+    _PATCHED = ('stat', 'lstat', 'scandir', 'listdir')
+
+    def __init__(self, prefixes, latency, jitter=0.0, seed=0):
+        """
+        参数:
+            prefixes (list): 需要变慢的目录，只有这些目录下的路径会注入延迟
+            latency (float): 每次调用的延迟(秒)
+            jitter (float): 随机附加的最大延迟(秒)，模拟网络抖动
+            seed (int): 抖动的随机种子
+        """
+        self.prefixes = tuple(os.path.abspath(p) for p in prefixes)
+        self.latency = latency
+        self.jitter = jitter
+        self.calls = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._originals = {}
+
+    def __enter__(self):
+        for name in self._PATCHED:
+            original = getattr(os, name)
+            self._originals[name] = original
+            setattr(os, name, self._wrap(original))
+        self._originals['open'] = builtins.open
+        builtins.open = self._wrap(builtins.open)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        builtins.open = self._originals.pop('open')
+        for name, original in self._originals.items():
+            setattr(os, name, original)
+        self._originals.clear()
+        return False
+
+    def _wrap(self, function):
+        """包装文件系统函数，第一个参数在指定目录下时先等待"""
+        def wrapper(path='.', *args, **kwargs):
+            if self._is_slow(path):
+                self._delay()
+            return function(path, *args, **kwargs)
+        return wrapper
+
+    def _is_slow(self, path):
+        """判断路径是否在需要变慢的目录下"""
+        if isinstance(path, int):
+            # 文件描述符
+            return False
+        try:
+            path = os.fspath(path)
+        except TypeError:
+            return False
+        if isinstance(path, bytes):
+            path = os.fsdecode(path)
+        return path.startswith(self.prefixes)
+
+    def _delay(self):
+        with self._lock:
+            self.calls += 1
+            delay = self.latency
+            if self.jitter:
+                delay += self._rng.random() * self.jitter
+        time.sleep(delay)
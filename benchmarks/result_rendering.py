@@ -0,0 +1,116 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+结果列表渲染基准测试
+向主窗口分批追加大量无效快捷方式，测量界面线程的耗时；
+--baseline改为测量原来每行一个QListWidgetItem、每行从磁盘读取图标的做法，用于对比
+
+用法:
+    python benchmarks/result_rendering.py [-n 数量] [--baseline]
+"""
+
+import os
+import sys
+import time
+import argparse
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 与ShortcutCheckerThread一致的批大小
+BATCH_SIZE = 200
+
+# 原来结果列表的样式
+BASELINE_STYLE = """
+    QListWidget {
+        border: 1px solid #c0c0c0;
+        border-radius: 3px;
+        background-color: white;
+        padding: 5px;
+    }
+    QListWidget::item {
+        padding: 5px;
+        border-bottom: 1px solid #e0e0e0;
+    }
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description="测量结果列表的渲染耗时")
+    parser.add_argument("-n", "--count", type=int, default=20000)
+    parser.add_argument("--baseline", action="store_true",
+                        help="测量原来的QListWidget逐项添加做法")
+    args = parser.parse_args()
+
+    # 无显示环境下也能运行
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    sys.path.insert(0, ROOT)
+    os.chdir(ROOT)
+
+    from PyQt6.QtWidgets import QApplication
+    from main import CheckInkApp
+
+    app = QApplication(sys.argv[:1])
+    if args.baseline:
+        window = _baseline_list()
+    else:
+        window = CheckInkApp()
+    window.show()
+    paths = [f"C:\\Users\\user\\Desktop\\shortcut{i}.{'url' if i % 3 == 0 else 'lnk'}"
+             for i in range(args.count)]
+
+    start = time.perf_counter()
+    for i in range(0, len(paths), BATCH_SIZE):
+        window.append_results(paths[i:i + BATCH_SIZE])
+    app.processEvents()
+    elapsed = time.perf_counter() - start
+
+    print(f"{'QListWidget(原做法)' if args.baseline else '结果模型'} "
+          f"追加 {args.count} 条结果用时 {elapsed:.3f} 秒 "
+          f"({args.count / elapsed:.0f} 条/秒)")
+
+
+def _load_icon(icon_path, size):
+    """原来的图标加载: 每次都从磁盘读取并缩放"""
+    from PyQt6.QtCore import Qt
+    from PyQt6.QtGui import QPixmap, QColor
+
+    full_path = os.path.join(ROOT, icon_path)
+    if os.path.exists(full_path):
+        return QPixmap(full_path).scaled(size[0], size[1],
+                                         Qt.AspectRatioMode.KeepAspectRatio,
+                                         Qt.TransformationMode.SmoothTransformation)
+    pixmap = QPixmap(*size)
+    pixmap.fill(QColor('#4a86e8'))
+    return pixmap
+
+
+def _baseline_list():
+    """原来的结果列表: 每个结果一个可勾选的QListWidgetItem"""
+    from PyQt6.QtCore import Qt
+    from PyQt6.QtGui import QIcon
+    from PyQt6.QtWidgets import QListWidget, QListWidgetItem
+
+    list_widget = QListWidget()
+    list_widget.setSelectionMode(QListWidget.SelectionMode.MultiSelection)
+    list_widget.setStyleSheet(BASELINE_STYLE)
+    list_widget.resize(800, 600)
+
+    def append_results(invalid_shortcuts):
+        for shortcut in invalid_shortcuts:
+            item = QListWidgetItem()
+            item.setText(shortcut)
+            item.setFlags(item.flags() | Qt.ItemFlag.ItemIsUserCheckable)
+            item.setCheckState(Qt.CheckState.Unchecked)
+            if shortcut.lower().endswith('.lnk'):
+                item.setIcon(QIcon(_load_icon("assets/lnk.png", (16, 16))))
+            elif shortcut.lower().endswith('.url'):
+                item.setIcon(QIcon(_load_icon("assets/url.png", (16, 16))))
+            list_widget.addItem(item)
+
+    list_widget.append_results = append_results
+    return list_widget
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,320 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+扫描基准测试
+在合成快捷方式树上分别测量查找、解析和检查的吞吐量、单个快捷方式耗时的百分位数、
+峰值内存以及保存结果时每条结果占用的内存，并可与保存的基线比较，
+性能退化超过容差时以非零退出码结束
+
+用法:
+    python benchmarks/scan_benchmark.py [-n 数量] [-j 线程数] [--latency 毫秒] [-r 次数]
+    python benchmarks/scan_benchmark.py --save-baseline      # 记录本机基线
+    python benchmarks/scan_benchmark.py --check-baseline     # 与基线比较
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import tracemalloc
+from contextlib import nullcontext
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from synthetic_tree import generate_tree, load_manifest, SHORTCUTS_DIR, SHARE_DIR, MANIFEST_NAME
+from latency_shim import LatencyShim
+
+
+# 默认的基线文件，按场景保存各项指标
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+# 默认容差，指标比基线差超过该比例视为退化
+DEFAULT_TOLERANCE = 0.25
+
+# 参与基线比较的指标，微秒级的百分位数波动太大，只报告不比较
+GATED_METRICS = ('discovery_rate', 'parse_rate', 'check_rate', 'peak_memory_mb',
+                 'store_bytes_per_entry')
+
+# 越大越好的指标，其余指标越小越好
+HIGHER_IS_BETTER = ('discovery_rate', 'parse_rate', 'check_rate')
+
+# 计算百分位数时最多单独计时的快捷方式数
+LATENCY_SAMPLE = 2000
+
+
+def percentile(samples, fraction):
+    """
+    计算已排序样本的百分位数(最近秩法)
+
+    参数:
+        samples (list): 已排序的样本
+        fraction (float): 0到1之间的比例
+
+    返回:
+        float: 百分位数，没有样本时为0
+    """
+    if not samples:
+        return 0.0
+    index = min(len(samples) - 1, max(0, int(round(fraction * len(samples))) - 1))
+    return samples[index]
+
+
+def records_size(results):
+    """
+    计算ScanResult列表及其路径、目标和用时对象占用的字节数
+
+    参数:
+        results (list): ScanResult列表
+
+    返回:
+        int: 字节数
+    """
+    total = sys.getsizeof(results)
+    for result in results:
+        total += (sys.getsizeof(result) + sys.getsizeof(result.path)
+                  + sys.getsizeof(result.elapsed))
+        if result.target is not None:
+            total += sys.getsizeof(result.target)
+    return total
+
+
+def run_benchmark(tree, workers, latency=0.0, sample=LATENCY_SAMPLE):
+    """
+    在合成快捷方式树上运行各阶段的测量
+
+    参数:
+        tree (str): generate_tree的输出目录
+        workers (int): 完整检查使用的线程数
+        latency (float): 注入到目标目录的文件系统延迟(秒)，0表示不注入
+        sample (int): 单独计时的快捷方式数
+
+    返回:
+        tuple: (指标字典, 与清单不符的快捷方式集合)
+    """
+    from shortcut_checker import ShortcutChecker
+    from result_store import ResultStore
+    from lnk_parser import read_lnk_target, LnkParseError
+
+    manifest = load_manifest(tree)
+    folder = os.path.join(tree, SHORTCUTS_DIR)
+    share = os.path.join(tree, SHARE_DIR)
+    metrics = {}
+
+    # 查找: 只遍历目录
+    checker = ShortcutChecker()
+    start = time.perf_counter()
+    shortcuts = list(checker.iter_shortcuts(folder))
+    elapsed = time.perf_counter() - start
+    metrics['shortcuts'] = len(shortcuts)
+    metrics['discovery_rate'] = len(shortcuts) / elapsed
+
+    # 解析: 读取每个文件并得出目标，不检查目标是否存在
+    durations = []
+    start = time.perf_counter()
+    for path in shortcuts:
+        t = time.perf_counter()
+        if path.lower().endswith('.lnk'):
+            try:
+                read_lnk_target(path)
+            except (LnkParseError, OSError):
+                pass
+        else:
+            checker._read_url(path)
+        durations.append(time.perf_counter() - t)
+    elapsed = time.perf_counter() - start
+    durations.sort()
+    metrics['parse_rate'] = len(shortcuts) / elapsed
+    metrics['parse_p50_us'] = percentile(durations, 0.5) * 1e6
+    metrics['parse_p99_us'] = percentile(durations, 0.99) * 1e6
+
+    with LatencyShim([share], latency) if latency else nullcontext():
+        # 单个快捷方式的检查耗时，不使用扫描内的目标结果表
+        step = max(1, len(shortcuts) // sample)
+        durations = []
+        checker = ShortcutChecker()
+        for path in shortcuts[::step]:
+            t = time.perf_counter()
+            checker.check_shortcut(path)
+            durations.append(time.perf_counter() - t)
+        durations.sort()
+        metrics['check_p50_ms'] = percentile(durations, 0.5) * 1e3
+        metrics['check_p90_ms'] = percentile(durations, 0.9) * 1e3
+        metrics['check_p99_ms'] = percentile(durations, 0.99) * 1e3
+
+        # 完整检查: 查找、解析和验证同时进行
+        checker = ShortcutChecker()
+        start = time.perf_counter()
+        invalid = checker.check_folder(folder, workers=workers)
+        elapsed = time.perf_counter() - start
+        metrics['check_rate'] = len(shortcuts) / elapsed
+
+    # 峰值内存单独测量，tracemalloc会拖慢上面的计时
+    checker = ShortcutChecker()
+    tracemalloc.start()
+    checker.check_folder(folder, workers=workers)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    metrics['peak_memory_mb'] = peak / 2 ** 20
+
+    # 每条结果的内存: ScanResult列表按对象大小累计，ResultStore按实际分配测量
+    results = checker.scan_folder(folder, workers=workers)
+    metrics['records_bytes_per_entry'] = records_size(results) / len(results)
+    tracemalloc.start()
+    store = ResultStore(results)
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    metrics['store_bytes_per_entry'] = retained / len(store)
+
+    expected = {os.path.join(folder, path) for path in manifest['broken']}
+    mismatched = expected.symmetric_difference(invalid)
+    return metrics, mismatched
+
+
+def scenario_key(params, workers, latency):
+    """由生成参数、线程数和延迟组成的场景名，基线按场景保存"""
+    return (f"n{params['count']}-d{params['depth']}-f{params['fanout']}"
+            f"-dup{params['duplicate_ratio']}-j{workers}-lat{latency * 1000:g}ms")
+
+
+def best_of(runs):
+    """
+    合并多次测量，每项指标取最好的一次，减少偶然波动
+
+    参数:
+        runs (list): 每次的指标字典
+
+    返回:
+        dict: 合并后的指标
+    """
+    merged = dict(runs[0])
+    for metrics in runs[1:]:
+        for name, value in metrics.items():
+            if name in HIGHER_IS_BETTER:
+                merged[name] = max(merged[name], value)
+            elif name != 'shortcuts':
+                merged[name] = min(merged[name], value)
+    return merged
+
+
+def compare(metrics, baseline, tolerance):
+    """
+    与基线比较
+
+    参数:
+        metrics (dict): 本次的指标
+        baseline (dict): 基线的指标
+        tolerance (float): 容差比例
+
+    返回:
+        list: 退化的指标: (名称, 基线值, 本次值)
+    """
+    regressions = []
+    for name in GATED_METRICS:
+        expected = baseline.get(name)
+        actual = metrics.get(name)
+        if expected is None or actual is None:
+            continue
+        if name in HIGHER_IS_BETTER:
+            worse = actual < expected * (1 - tolerance)
+        else:
+            worse = actual > expected * (1 + tolerance)
+        if worse:
+            regressions.append((name, expected, actual))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="测量扫描各阶段的性能")
+    parser.add_argument("--tree", help="已生成的快捷方式树，默认在临时目录中生成")
+    parser.add_argument("-n", "--count", type=int, default=10000)
+    parser.add_argument("--depth", type=int, default=3)
+    parser.add_argument("--fanout", type=int, default=4)
+    parser.add_argument("--duplicates", type=float, default=0.5, help="目标重复率")
+    parser.add_argument("-j", "--workers", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="注入到目标目录的文件系统延迟(毫秒)，模拟网络共享")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="基线文件")
+    parser.add_argument("--save-baseline", action="store_true", help="把本次结果保存为基线")
+    parser.add_argument("--check-baseline", action="store_true",
+                        help="与基线比较，退化超过容差时退出码为1")
+    parser.add_argument("-r", "--repeat", type=int, default=3, help="重复次数，每项取最好的一次")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument("--json", action="store_true", help="以JSON输出指标")
+    args = parser.parse_args()
+
+    latency = args.latency / 1000
+    temporary = None
+    if args.tree:
+        tree = os.path.abspath(args.tree)
+        if not os.path.exists(os.path.join(tree, MANIFEST_NAME)):
+            generate_tree(tree, args.count, args.depth, args.fanout,
+                          duplicate_ratio=args.duplicates)
+    else:
+        temporary = tree = tempfile.mkdtemp(prefix='checkink-bench-')
+        generate_tree(tree, args.count, args.depth, args.fanout, duplicate_ratio=args.duplicates)
+
+    try:
+        runs = []
+        mismatched = set()
+        for _ in range(max(1, args.repeat)):
+            metrics, wrong = run_benchmark(tree, args.workers, latency)
+            runs.append(metrics)
+            mismatched |= wrong
+        metrics = best_of(runs)
+        key = scenario_key(load_manifest(tree)['params'], args.workers, latency)
+    finally:
+        if temporary:
+            shutil.rmtree(temporary, ignore_errors=True)
+
+    if args.json:
+        print(json.dumps({'scenario': key, 'metrics': metrics}, indent=2))
+    else:
+        print(f"场景 {key}")
+        print(f"  快捷方式        {metrics['shortcuts']}")
+        print(f"  查找            {metrics['discovery_rate']:.0f} 个/秒")
+        print(f"  解析            {metrics['parse_rate']:.0f} 个/秒 "
+              f"(p50 {metrics['parse_p50_us']:.0f}us, p99 {metrics['parse_p99_us']:.0f}us)")
+        print(f"  单个检查        p50 {metrics['check_p50_ms']:.2f}ms, "
+              f"p90 {metrics['check_p90_ms']:.2f}ms, p99 {metrics['check_p99_ms']:.2f}ms")
+        print(f"  完整检查        {metrics['check_rate']:.0f} 个/秒 ({args.workers} 线程)")
+        print(f"  峰值内存        {metrics['peak_memory_mb']:.1f} MB")
+        print(f"  每条结果        {metrics['store_bytes_per_entry']:.0f} 字节 "
+              f"(ScanResult列表 {metrics['records_bytes_per_entry']:.0f} 字节)")
+
+    status = 0
+    if mismatched:
+        print(f"错误: {len(mismatched)} 个快捷方式的结果与清单不符", file=sys.stderr)
+        status = 2
+
+    baselines = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding='utf-8') as f:
+            baselines = json.load(f)
+
+    if args.check_baseline:
+        if key not in baselines:
+            print(f"基线中没有场景 {key}，请先使用--save-baseline记录", file=sys.stderr)
+            status = status or 2
+        else:
+            regressions = compare(metrics, baselines[key], args.tolerance)
+            for name, expected, actual in regressions:
+                print(f"退化: {name} 基线 {expected:.2f}，本次 {actual:.2f}", file=sys.stderr)
+            if regressions:
+                status = status or 1
+
+    if args.save_baseline and not mismatched:
+        baselines[key] = metrics
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(baselines, f, indent=2, sort_keys=True)
+        print(f"已保存基线 {key}")
+
+    sys.exit(status)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,265 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+合成快捷方式树生成器
+按指定的数量、深度和目标重复率生成真实的MS-SHLLINK二进制.lnk文件和.url文件，
+其中一部分指向不存在的目标，供基准测试在任意平台上使用
+
+用法:
+    python benchmarks/synthetic_tree.py 目录 [-n 数量] [--depth 深度] [--duplicates 比例]
+"""
+
+import os
+import sys
+import json
+import random
+import struct
+import argparse
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from lnk_parser import (
+    LINK_CLSID, HEADER_SIZE, HAS_LINK_INFO, HAS_WORKING_DIR, IS_UNICODE,
+    VOLUME_ID_AND_LOCAL_BASE_PATH,
+)
+
+
+# 清单文件名，记录生成参数和预期的无效快捷方式
+MANIFEST_NAME = 'manifest.json'
+
+# 快捷方式和目标所在的子目录
+SHORTCUTS_DIR = 'shortcuts'
+SHARE_DIR = 'share'
+
+# 每个目标目录中的目标数
+TARGETS_PER_DIR = 200
+
+# 部分快捷方式使用中文文件名，覆盖非ASCII路径
+_NAMES = ('App', 'Tool', 'Editor', '工具', '文档', 'Game')
+
+
+def build_lnk(target, working_dir=None, unicode_info=True):
+    """
+    构造指向本地路径的.lnk文件内容
+
+    参数:
+        target (str): 目标路径，写入LinkInfo的LocalBasePath
+        working_dir (str): 可选的起始位置
+        unicode_info (bool): 是否同时写入LocalBasePathUnicode，
+            为False时只写ANSI路径，target必须能用ASCII编码
+
+    返回:
+        bytes: 完整的快捷方式文件内容
+    """
+    flags = HAS_LINK_INFO | IS_UNICODE
+    if working_dir:
+        flags |= HAS_WORKING_DIR
+
+    header = struct.pack('<I16sIIQQQIIIHHII', HEADER_SIZE, LINK_CLSID, flags, 0x20,
+                         0, 0, 0, 0, 0, 1, 0, 0, 0, 0)
+    body = header + _link_info(target, unicode_info)
+    if working_dir:
+        body += struct.pack('<H', len(working_dir)) + working_dir.encode('utf-16-le')
+    # TerminalBlock
+    return body + b'\0\0\0\0'
+
+
+def _link_info(target, unicode_info):
+    """构造只包含VolumeID和LocalBasePath的LinkInfo结构"""
+    header_size = 0x24 if unicode_info else 0x1C
+    # VolumeID: 大小、驱动器类型(DRIVE_FIXED)、序列号、卷标偏移，卷标为空
+    volume = struct.pack('<IIII', 17, 3, 0x1234ABCD, 16) + b'\0'
+    ansi = target.encode('ascii', errors='replace') + b'\0'
+    suffix = b'\0'
+
+    volume_offset = header_size
+    base_offset = volume_offset + len(volume)
+    suffix_offset = base_offset + len(ansi)
+    data = volume + ansi + suffix
+    offsets = [volume_offset, base_offset, 0, suffix_offset]
+
+    if unicode_info:
+        # Unicode字符串按2字节对齐
+        if len(data) % 2:
+            data += b'\0'
+        base_offset_unicode = header_size + len(data)
+        data += target.encode('utf-16-le') + b'\0\0'
+        suffix_offset_unicode = header_size + len(data)
+        data += b'\0\0'
+        offsets += [base_offset_unicode, suffix_offset_unicode]
+
+    size = header_size + len(data)
+    return struct.pack('<III', size, header_size, VOLUME_ID_AND_LOCAL_BASE_PATH) + \
+        struct.pack(f'<{len(offsets)}I', *offsets) + data
+
+
+def build_url(url):
+    """
+    构造.url文件内容
+
+    参数:
+        url (str): URL
+
+    返回:
+        str: InternetShortcut格式的文本
+    """
+    return f"[InternetShortcut]\nURL={url}\nIconIndex=0\n"
+
+
+def generate_tree(root, count=10000, depth=3, fanout=4, broken_ratio=0.2,
+                  duplicate_ratio=0.5, url_ratio=0.2, corrupt_ratio=0.01, seed=0):
+    """
+    生成合成快捷方式树
+
+    快捷方式写入root/shortcuts下深度为depth、每层fanout个子目录的树中，
+    .lnk的目标位于root/share下，有效的目标会创建为空文件
+
+    参数:
+        root (str): 输出目录，不存在时创建
+        count (int): 快捷方式总数
+        depth (int): 快捷方式目录树的深度，0表示全部放在一层
+        fanout (int): 每层的子目录数
+        broken_ratio (float): 目标不存在或URL无效的比例
+        duplicate_ratio (float): 复用已有目标的.lnk比例，模拟多个快捷方式指向同一程序
+        url_ratio (float): .url文件的比例
+        corrupt_ratio (float): 无法解析的.lnk文件比例
+        seed (int): 随机种子，相同参数总是生成相同的树
+
+    返回:
+        dict: 清单，包含生成参数、各类数量和预期无效的快捷方式(相对shortcuts的路径)
+    """
+    # 快捷方式中的目标须为绝对路径，相对的root会生成无法解析的目标
+    root = os.path.abspath(root)
+    rng = random.Random(seed)
+    shortcuts_root = os.path.join(root, SHORTCUTS_DIR)
+    share_root = os.path.join(root, SHARE_DIR)
+
+    directories = _make_directories(shortcuts_root, depth, fanout)
+    os.makedirs(share_root, exist_ok=True)
+
+    targets = []          # 已使用的目标: (路径, 是否有效)
+    target_dirs = set()
+    broken = []
+    counts = {'lnk': 0, 'url': 0, 'corrupt': 0, 'unique_targets': 0}
+
+    for i in range(count):
+        directory = directories[i % len(directories)]
+        name = f"{_NAMES[i % len(_NAMES)]}_{i:06d}"
+        is_broken = rng.random() < broken_ratio
+        roll = rng.random()
+
+        if roll < url_ratio:
+            path = os.path.join(directory, name + '.url')
+            if is_broken:
+                # 缺少协议或主机名的URL视为无效
+                url = f"www.example.com/{name}" if i % 2 else "http:///missing-host"
+            else:
+                url = f"https://example.com/{name}"
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(build_url(url))
+            counts['url'] += 1
+        elif roll < url_ratio + corrupt_ratio:
+            path = os.path.join(directory, name + '.lnk')
+            with open(path, 'wb') as f:
+                # 文件头正确但CLSID错误
+                f.write(struct.pack('<I', HEADER_SIZE) + rng.randbytes(HEADER_SIZE))
+            counts['corrupt'] += 1
+            is_broken = True
+        else:
+            path = os.path.join(directory, name + '.lnk')
+            reuse = [t for t in targets[-64:] if t[1] != is_broken]
+            if reuse and rng.random() < duplicate_ratio:
+                target = rng.choice(reuse)[0]
+            else:
+                target = _new_target(share_root, len(targets), is_broken, target_dirs)
+                targets.append((target, not is_broken))
+            with open(path, 'wb') as f:
+                f.write(build_lnk(target, os.path.dirname(target), unicode_info=i % 3 != 0))
+            counts['lnk'] += 1
+
+        if is_broken:
+            broken.append(os.path.relpath(path, shortcuts_root))
+
+    counts['unique_targets'] = len(targets)
+    manifest = {
+        'params': {
+            'count': count, 'depth': depth, 'fanout': fanout, 'broken_ratio': broken_ratio,
+            'duplicate_ratio': duplicate_ratio, 'url_ratio': url_ratio,
+            'corrupt_ratio': corrupt_ratio, 'seed': seed,
+        },
+        'counts': counts,
+        'directories': len(directories),
+        'broken': broken,
+    }
+    with open(os.path.join(root, MANIFEST_NAME), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False)
+    return manifest
+
+
+def load_manifest(root):
+    """
+    读取generate_tree写入的清单
+
+    参数:
+        root (str): generate_tree的输出目录
+
+    返回:
+        dict: 清单
+    """
+    with open(os.path.join(root, MANIFEST_NAME), encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _make_directories(root, depth, fanout):
+    """创建快捷方式目录树，返回所有目录"""
+    directories = [root]
+    level = [root]
+    for d in range(depth):
+        next_level = []
+        for parent in level:
+            for j in range(fanout):
+                next_level.append(os.path.join(parent, f"dir{d}_{j}"))
+        directories.extend(next_level)
+        level = next_level
+    for directory in directories:
+        os.makedirs(directory, exist_ok=True)
+    return directories
+
+
+def _new_target(share_root, index, is_broken, target_dirs):
+    """分配一个新的目标路径，有效的目标创建为空文件"""
+    directory = os.path.join(share_root, f"apps{index // TARGETS_PER_DIR:04d}")
+    if directory not in target_dirs:
+        os.makedirs(directory, exist_ok=True)
+        target_dirs.add(directory)
+    target = os.path.join(directory, f"app_{index:07d}.exe")
+    if not is_broken:
+        open(target, 'wb').close()
+    return target
+
+
+def main():
+    parser = argparse.ArgumentParser(description="生成合成快捷方式树")
+    parser.add_argument("root", help="输出目录")
+    parser.add_argument("-n", "--count", type=int, default=10000)
+    parser.add_argument("--depth", type=int, default=3)
+    parser.add_argument("--fanout", type=int, default=4)
+    parser.add_argument("--broken", type=float, default=0.2, help="无效比例")
+    parser.add_argument("--duplicates", type=float, default=0.5, help="目标重复率")
+    parser.add_argument("--urls", type=float, default=0.2, help=".url文件比例")
+    parser.add_argument("--corrupt", type=float, default=0.01, help="损坏的.lnk比例")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    manifest = generate_tree(args.root, args.count, args.depth, args.fanout, args.broken,
+                             args.duplicates, args.urls, args.corrupt, args.seed)
+    counts = manifest['counts']
+    print(f"已生成 {args.count} 个快捷方式 (.lnk {counts['lnk']}，.url {counts['url']}，"
+          f"损坏 {counts['corrupt']}，不同目标 {counts['unique_targets']})，"
+          f"预期无效 {len(manifest['broken'])} 个")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+取消模块
+提供在界面线程、查找线程和检查线程之间共享的取消/暂停令牌
+"""
+
+import threading
+
+
+class ScanCancelled(Exception):
+    """扫描已被取消"""
+
+
+class CancelToken:
+    """
+    协作式取消/暂停令牌
+
+    检查方在处理每个快捷方式之前调用checkpoint()：暂停时阻塞直到继续或取消，
+    已取消时抛出ScanCancelled。正在进行的系统调用无法打断，
+    等待结果的一方应使用带超时的等待并检查cancelled，以限制取消的响应时间
+    """
+
+    def __init__(self):
+        self._cancelled = threading.Event()
+        # 置位表示运行中，清除表示已暂停
+        self._running = threading.Event()
+        self._running.set()
+
+    def cancel(self):
+        """取消扫描，同时唤醒所有暂停中的等待方"""
+        self._cancelled.set()
+        self._running.set()
+
+    def pause(self):
+        """暂停扫描，已开始检查的快捷方式会继续完成"""
+        if not self._cancelled.is_set():
+            self._running.clear()
+
+    def resume(self):
+        """继续已暂停的扫描"""
+        self._running.set()
+
+    @property
+    def cancelled(self):
+        """是否已取消"""
+        return self._cancelled.is_set()
+
+    @property
+    def paused(self):
+        """是否已暂停"""
+        return not self._running.is_set()
+
+    def checkpoint(self):
+        """
+        暂停时阻塞，直到继续或取消
+
+        异常:
+            ScanCancelled: 扫描已被取消
+        """
+        self._running.wait()
+        if self._cancelled.is_set():
+            raise ScanCancelled()
+
+    def wait(self, timeout):
+        """
+        等待最多timeout秒，期间被取消时立即返回
+
+        参数:
+            timeout (float): 最长等待时间(秒)
+
+        返回:
+            bool: 是否已取消
+        """
+        return self._cancelled.wait(timeout)
@@ -0,0 +1,320 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+CheckInk命令行入口
+无界面地检查一个或多个文件夹，输出机器可读的结果，适合计划任务和部署脚本调用
+
+退出码:
+    0: 所有快捷方式均有效
+    1: 发现无效快捷方式
+    2: 出现错误(参数错误、文件夹不存在等)
+    3: 没有无效快捷方式，但有快捷方式的目标在时限内无法访问
+"""
+
+import os
+import sys
+import time
+import argparse
+
+from scan_result import Verdict
+
+
+EXIT_OK = 0
+EXIT_BROKEN = 1
+EXIT_ERROR = 2
+EXIT_UNREACHABLE = 3
+
+FORMATS = ('text', 'json', 'ndjson', 'csv')
+
+
+def build_parser():
+    """
+    创建命令行参数解析器
+
+    返回:
+        argparse.ArgumentParser: 参数解析器
+    """
+    parser = argparse.ArgumentParser(
+        prog="checkink",
+        description="检查文件夹中的无效快捷方式(.lnk, .url)",
+        epilog="退出码: 0 全部有效, 1 发现无效快捷方式, 2 出现错误, 3 有目标无法访问"
+    )
+    parser.add_argument("folders", nargs="+", metavar="FOLDER", help="要检查的文件夹，可指定多个")
+    parser.add_argument("-r", "--recursive", action="store_true", default=True,
+                        help="同时检查子文件夹(默认)")
+    parser.add_argument("--no-recursive", dest="recursive", action="store_false",
+                        help="只检查文件夹本身，不检查子文件夹")
+    parser.add_argument("-j", "--jobs", type=int, default=0,
+                        help="并行检查的线程数，0表示自动选择(默认)，1表示按顺序检查")
+    parser.add_argument("--processes", action="store_true",
+                        help="使用进程池代替线程池，卡死的快捷方式不会拖住整个扫描")
+    parser.add_argument("-f", "--format", choices=FORMATS, default="text", help="输出格式(默认text)")
+    parser.add_argument("-a", "--all", action="store_true", help="同时输出有效的快捷方式")
+    parser.add_argument("-o", "--output", help="结果输出文件，默认输出到标准输出")
+    parser.add_argument("--db", help="增量扫描数据库路径，重复扫描时只检查变化的部分")
+    parser.add_argument("--verdict-ttl", type=float, default=0.0, metavar="SECONDS",
+                        help="配合--db使用，检查结果在有效期(秒)内直接沿用，0表示每次都重新检查目标(默认)")
+    parser.add_argument("--batch-existence", action="store_true",
+                        help="按父目录批量检查目标是否存在，适合网络共享")
+    parser.add_argument("--timeout", type=float, default=None, metavar="SECONDS",
+                        help="单次存在性检查的时限(秒)，超时的目标报告为无法访问，0表示不限时")
+    parser.add_argument("--profile", action="store_true",
+                        help="在标准错误中输出分阶段的计数和计时")
+    parser.add_argument("--trace", metavar="FILE",
+                        help="把每个快捷方式和每个阶段的时间线写入FILE(Chrome trace-event格式)")
+    parser.add_argument("-q", "--quiet", action="store_true", help="不输出汇总信息")
+    return parser
+
+
+def main(argv=None):
+    """
+    命令行主函数
+
+    参数:
+        argv (list): 命令行参数，默认使用sys.argv[1:]
+
+    返回:
+        int: 退出码
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.db and args.processes:
+        parser.error("--db不能与--processes同时使用")
+
+    # 只在真正需要时才导入检查器，使--help等操作保持轻量
+    from shortcut_checker import ShortcutChecker, DEFAULT_WORKERS
+
+    workers = args.jobs if args.jobs > 0 else DEFAULT_WORKERS
+    scan_db = None
+    if args.db:
+        from scan_db import ScanDatabase
+        scan_db = ScanDatabase(args.db, verdict_ttl=args.verdict_ttl)
+
+    options = {}
+    if args.timeout is not None:
+        options['probe_timeout'] = args.timeout or None
+    tracer = None
+    if args.trace:
+        from tracing import TraceRecorder
+        tracer = TraceRecorder()
+    checker = ShortcutChecker(batch_existence=args.batch_existence, scan_db=scan_db,
+                              collect_stats=args.profile, tracer=tracer, **options)
+    out = open(args.output, 'w', encoding='utf-8', newline='') if args.output else sys.stdout
+    writer = _make_writer(args.format, out)
+
+    errors = 0
+    checked = 0
+    broken = 0
+    unreachable = 0
+    pipe_closed = False
+    tripped_roots = {}
+    profile = None
+    start = time.perf_counter()
+
+    try:
+        for folder in args.folders:
+            if not os.path.isdir(folder):
+                print(f"错误: 文件夹不存在: {folder}", file=sys.stderr)
+                errors += 1
+                continue
+
+            progress = [0, 0]
+            for result in _iter_results(checker, folder, args, workers, progress):
+                status = _status(result)
+                if status == 'unreachable':
+                    unreachable += 1
+                elif status == 'broken':
+                    broken += 1
+                if args.all or status != 'valid':
+                    writer.write(result, status)
+            checked += progress[1]
+            tripped_roots.update(checker.tripped_roots)
+            if checker.stats is not None:
+                if profile is None:
+                    from scan_stats import ScanStats
+                    profile = ScanStats()
+                profile.merge(checker.stats)
+    except KeyboardInterrupt:
+        print("已中断", file=sys.stderr)
+        errors += 1
+    except BrokenPipeError:
+        # 下游(如head)提前关闭了管道，不再输出
+        pipe_closed = True
+    except OSError as e:
+        print(f"错误: {e}", file=sys.stderr)
+        errors += 1
+    finally:
+        try:
+            writer.close()
+            if out is not sys.stdout:
+                out.close()
+        except BrokenPipeError:
+            pipe_closed = True
+        if scan_db is not None:
+            scan_db.close()
+        if tracer is not None:
+            try:
+                tracer.write(args.trace)
+            except OSError as e:
+                print(f"错误: 无法写入时间线: {e}", file=sys.stderr)
+                errors += 1
+
+    if pipe_closed:
+        if out is sys.stdout:
+            _discard_stdout()
+        return EXIT_ERROR
+
+    elapsed = time.perf_counter() - start
+    if not args.quiet:
+        rate = checked / elapsed if elapsed > 0 else 0.0
+        print(f"已检查 {checked} 个快捷方式，无效 {broken} 个，无法访问 {unreachable} 个，"
+              f"错误 {errors} 个，用时 {elapsed:.2f} 秒 ({rate:.0f} 个/秒)", file=sys.stderr)
+        for root, reason in sorted(tripped_roots.items()):
+            print(f"已跳过无法访问的共享或驱动器: {root} ({reason})", file=sys.stderr)
+    if profile is not None:
+        print(profile.format_report(), file=sys.stderr)
+
+    if errors:
+        return EXIT_ERROR
+    if broken:
+        return EXIT_BROKEN
+    return EXIT_UNREACHABLE if unreachable else EXIT_OK
+
+
+def _iter_results(checker, folder, args, workers, progress):
+    """
+    检查单个文件夹
+
+    参数:
+        progress (list): 用于接收[已完成数, 总数]的列表
+
+    返回:
+        generator: ScanResult；进程池模式在全部检查完后才开始产出
+    """
+    def on_progress(info):
+        progress[0] = info.done
+        progress[1] = max(info.total, info.done)
+
+    if args.processes:
+        yield from checker.scan_folder(folder, args.recursive, on_progress,
+                                       workers=workers, executor='process')
+        return
+
+    yield from checker.iter_scan_folder(folder, args.recursive, on_progress, workers=workers)
+
+
+def _discard_stdout():
+    """标准输出的管道已关闭，改为写入空设备，避免退出时刷新缓冲区再次报错"""
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    os.dup2(devnull, sys.stdout.fileno())
+
+
+def _make_writer(fmt, out):
+    """创建对应格式的结果输出器"""
+    if fmt == 'json':
+        return _JsonWriter(out)
+    if fmt == 'ndjson':
+        return _NdjsonWriter(out)
+    if fmt == 'csv':
+        return _CsvWriter(out)
+    return _TextWriter(out)
+
+
+def _status(result):
+    """输出中的状态: valid、broken或unreachable"""
+    if result.verdict is Verdict.UNREACHABLE:
+        return 'unreachable'
+    return 'broken' if result.broken else 'valid'
+
+
+def _record(result, status):
+    # valid字段保持布尔值，无法访问的目标为null，具体状态见status字段，失效原因见reason字段
+    valid = True if status == 'valid' else False if status == 'broken' else None
+    return {"path": result.path, "kind": result.kind, "valid": valid, "status": status,
+            "target": result.target, "reason": result.verdict.value}
+
+
+class _TextWriter:
+    """人类可读的文本输出"""
+
+    MARKS = {'valid': "有效", 'broken': "无效", 'unreachable': "无法访问"}
+
+    def __init__(self, out):
+        self.out = out
+
+    def write(self, result, status):
+        line = f"{self.MARKS[status]}\t{result.path}"
+        if status == 'broken':
+            line += f"\t{result.verdict.label}"
+        self.out.write(line + "\n")
+
+    def close(self):
+        self.out.flush()
+
+
+class _NdjsonWriter:
+    """每行一个JSON对象，边检查边输出"""
+
+    def __init__(self, out):
+        import json
+        self._dumps = json.dumps
+        self.out = out
+
+    def write(self, result, status):
+        self.out.write(self._dumps(_record(result, status), ensure_ascii=False) + "\n")
+
+    def close(self):
+        self.out.flush()
+
+
+class _JsonWriter:
+    """
+    检查结束后输出一个JSON数组
+
+    检查期间结果保存在ResultStore中，结束时逐条输出，大量结果不会以字典的形式常驻内存
+    """
+
+    def __init__(self, out):
+        from result_store import ResultStore
+        self.out = out
+        self.store = ResultStore()
+
+    def write(self, result, status):
+        self.store.append(result.path, result.verdict, result.target)
+
+    def close(self):
+        import json
+        if not self.store:
+            self.out.write("[]\n")
+        else:
+            self.out.write("[\n")
+            for row in range(len(self.store)):
+                result = self.store.result(row)
+                text = json.dumps(_record(result, _status(result)), ensure_ascii=False, indent=2)
+                if row:
+                    self.out.write(",\n")
+                self.out.write("  " + text.replace("\n", "\n  "))
+            self.out.write("\n]\n")
+        self.out.flush()
+
+
+class _CsvWriter:
+    """CSV输出，带表头；valid列有效为1，无效为0，无法访问时为空"""
+
+    def __init__(self, out):
+        import csv
+        self.writer = csv.writer(out)
+        self.writer.writerow(["path", "kind", "valid", "status", "target", "reason"])
+        self.out = out
+
+    def write(self, result, status):
+        valid = '' if status == 'unreachable' else int(status == 'valid')
+        self.writer.writerow([result.path, result.kind, valid, status,
+                              result.target or '', result.verdict.value])
+
+    def close(self):
+        self.out.flush()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
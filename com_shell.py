@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+COM解析模块
+提供可替换的WScript.Shell快捷方式解析后端，pywin32只在第一次回退到COM时才导入
+"""
+
+from importlib.util import find_spec
+
+
+class ComShortcutResolver:
+    """
+    基于WScript.Shell COM对象的快捷方式解析后端
+
+    每次解析都在当前线程上初始化COM并在结束时释放，工作线程退出时不会遗留COM状态；
+    只有内置解析器无法得到目标时才会回退到这里，额外的初始化开销可以忽略
+    """
+
+    def resolve(self, lnk_path):
+        """
+        解析快捷方式的目标路径
+
+        参数:
+            lnk_path (str): .lnk文件路径
+
+        返回:
+            str: 目标路径，无法确定时为空字符串
+        """
+        import pythoncom
+        import win32com.client
+
+        pythoncom.CoInitialize()
+        try:
+            shell = win32com.client.Dispatch("WScript.Shell")
+            return shell.CreateShortCut(lnk_path).TargetPath
+        finally:
+            # Dispatch对象须在释放COM之前销毁
+            shell = None
+            pythoncom.CoUninitialize()
+
+
+class NullShortcutResolver:
+    """没有COM的平台使用的空后端，只依赖内置解析器"""
+
+    def resolve(self, lnk_path):
+        return ''
+
+
+def default_resolver():
+    """
+    获取当前平台的COM解析后端
+
+    只查找pywin32是否已安装而不导入它，导入和COM初始化推迟到第一次解析时
+
+    返回:
+        ComShortcutResolver | NullShortcutResolver: 安装了pywin32时为ComShortcutResolver
+    """
+    try:
+        available = find_spec('win32com') is not None
+    except (ImportError, ValueError):
+        available = False
+    return ComShortcutResolver() if available else NullShortcutResolver()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+批量删除模块
+在后台批量删除快捷方式，可选择移到回收站，最后统一汇总失败的项
+"""
+
+import os
+
+from progress import ProgressThrottle, PHASE_DELETE
+
+
+# 移到回收站时每次调用SHFileOperation处理的文件数
+RECYCLE_BATCH_SIZE = 500
+
+
+def recycle_bin_available():
+    """
+    当前平台是否支持移到回收站
+
+    返回:
+        bool: 仅Windows上为True
+    """
+    return os.name == 'nt'
+
+
+def delete_shortcuts(paths, recycle=False, progress_callback=None):
+    """
+    批量删除快捷方式
+
+    参数:
+        paths (list): 要删除的快捷方式路径
+        recycle (bool): 是否移到回收站而不是永久删除，仅Windows支持
+        progress_callback (callable): 进度回调函数，接收ProgressInfo，阶段为PHASE_DELETE
+
+    返回:
+        tuple: (已删除的路径列表, 失败列表)，失败列表的元素为(路径, 错误信息)
+
+    异常:
+        OSError: 要求移到回收站但当前平台不支持
+    """
+    if recycle and not recycle_bin_available():
+        raise OSError("当前平台不支持回收站")
+
+    throttle = ProgressThrottle(progress_callback)
+    total = len(paths)
+    deleted = []
+    failures = []
+
+    if recycle:
+        for start in range(0, total, RECYCLE_BATCH_SIZE):
+            batch = paths[start:start + RECYCLE_BATCH_SIZE]
+            error = _recycle(batch)
+            for path in batch:
+                # 批量操作不报告单个文件的结果，以文件是否仍然存在为准
+                if os.path.lexists(path):
+                    failures.append((path, error or "无法移到回收站"))
+                else:
+                    deleted.append(path)
+            throttle.update(start + len(batch), total, PHASE_DELETE)
+    else:
+        for done, path in enumerate(paths, 1):
+            try:
+                os.remove(path)
+                deleted.append(path)
+            except FileNotFoundError:
+                # 已被其他程序删除，同样从结果中移除
+                deleted.append(path)
+            except OSError as e:
+                failures.append((path, str(e)))
+            throttle.update(done, total, PHASE_DELETE)
+
+    throttle.finish(total, total)
+    return deleted, failures
+
+
+def _recycle(paths):
+    """
+    使用SHFileOperation把一批文件移到回收站
+
+    返回:
+        str | None: 操作失败时的错误信息
+    """
+    import ctypes
+    from ctypes import wintypes
+
+    class SHFILEOPSTRUCTW(ctypes.Structure):
+        _fields_ = [
+            ("hwnd", wintypes.HWND),
+            ("wFunc", wintypes.UINT),
+            ("pFrom", wintypes.LPCWSTR),
+            ("pTo", wintypes.LPCWSTR),
+            ("fFlags", ctypes.c_ushort),
+            ("fAnyOperationsAborted", wintypes.BOOL),
+            ("hNameMappings", ctypes.c_void_p),
+            ("lpszProgressTitle", wintypes.LPCWSTR),
+        ]
+
+    FO_DELETE = 0x3
+    FOF_SILENT = 0x4
+    FOF_NOCONFIRMATION = 0x10
+    FOF_ALLOWUNDO = 0x40
+    FOF_NOERRORUI = 0x400
+
+    # pFrom是以两个空字符结尾、以空字符分隔的路径列表，必须使用绝对路径
+    buffer = ctypes.create_unicode_buffer('\0'.join(os.path.abspath(p) for p in paths) + '\0')
+    operation = SHFILEOPSTRUCTW(
+        wFunc=FO_DELETE,
+        pFrom=ctypes.cast(buffer, wintypes.LPCWSTR),
+        fFlags=FOF_ALLOWUNDO | FOF_NOCONFIRMATION | FOF_SILENT | FOF_NOERRORUI,
+    )
+    result = ctypes.windll.shell32.SHFileOperationW(ctypes.byref(operation))
+    if result:
+        return f"移到回收站失败 (错误码 0x{result:x})"
+    if operation.fAnyOperationsAborted:
+        return "移到回收站被中止"
+    return None
@@ -0,0 +1,498 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+目标存在性检查模块
+提供扫描内的目标去重、跨扫描的存在性缓存以及带时限的存在性检查
+"""
+
+import os
+import time
+import queue
+import ntpath
+import threading
+from collections import OrderedDict
+from functools import partial
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+
+
+# 父目录不存在时的列举结果
+_MISSING_DIRECTORY = object()
+
+# 默认单次存在性检查的时限(秒)，足够慢速共享应答，只放弃确实卡住的路径
+DEFAULT_PROBE_TIMEOUT = 30.0
+
+# 最多保留的空闲检查线程数
+_MAX_IDLE_PROBE_THREADS = 32
+
+# 最多同时放弃的检查线程数，超过时新的检查直接视为超时
+DEFAULT_MAX_ABANDONED = 64
+
+# 同一根目录下超时多少次后熔断
+DEFAULT_ROOT_FAILURE_THRESHOLD = 2
+
+
+class ProbeTimeout(TimeoutError):
+    """存在性检查超过时限，目标暂时无法访问"""
+
+
+def target_key(path):
+    """
+    生成目标路径的去重键
+
+    参数:
+        path (str): 目标路径
+
+    返回:
+        str: 规范化后的路径，Windows上同时转为小写并统一分隔符
+    """
+    return os.path.normcase(os.path.normpath(path))
+
+
+def volume_root(path):
+    """
+    获取目标所在的卷根
+
+    参数:
+        path (str): 目标路径
+
+    返回:
+        str | None: UNC共享根(\\\\server\\share)或盘符(C:)，统一为小写和反斜杠；
+            其他路径(如相对路径、POSIX路径)以及非Windows平台上的盘符为None
+    """
+    drive = ntpath.splitdrive(path)[0]
+    if not drive or (drive.endswith(':') and os.name != 'nt'):
+        return None
+    return drive.replace('/', '\\').lower()
+
+
+class VerdictMemo:
+    """单次扫描内的目标结果表，相同目标只检查一次"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, compute):
+        """
+        获取目标的检查结果，首次请求时调用compute计算
+
+        其他线程同时请求同一目标时会等待第一次计算的结果，而不是重复检查
+
+        参数:
+            key (str): 目标去重键
+            compute (callable): 计算检查结果的函数
+
+        返回:
+            检查结果
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = Future()
+                self.misses += 1
+                owner = True
+            else:
+                self.hits += 1
+                owner = False
+
+        if owner:
+            try:
+                entry.set_result(compute())
+            except BaseException as e:
+                # 出错的结果不保留，之后的请求重新计算
+                with self._lock:
+                    self._entries.pop(key, None)
+                entry.set_exception(e)
+
+        return entry.result()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class ExistenceCache:
+    """带容量上限和过期时间的路径存在性缓存，可在多次扫描间复用"""
+
+    def __init__(self, maxsize=65536, ttl=300.0):
+        """
+        参数:
+            maxsize (int): 最多缓存的路径数，超出时淘汰最久未使用的路径
+            ttl (float): 缓存结果的有效时间(秒)，None表示不过期
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    def exists(self, path, probe=os.path.exists):
+        """
+        检查路径是否存在，优先使用缓存结果
+
+        参数:
+            path (str): 要检查的路径
+            probe (callable): 缓存未命中时实际执行检查的函数
+
+        返回:
+            bool: 路径是否存在
+        """
+        key = target_key(path)
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (self.ttl is None or now - entry[1] < self.ttl):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+
+        result = probe(path)
+
+        with self._lock:
+            self._entries[key] = (result, now)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+        return result
+
+    def clear(self):
+        """清空缓存和统计"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class DirectoryListingProbe:
+    """
+    按父目录批量回答存在性检查
+
+    每个父目录只用os.scandir列举一次，同一目录下的其他目标直接从列举结果中查找，
+    在网络共享上可以把每个目标一次往返减少为每个目录一次；
+    文件名按平台规则比较(Windows上不区分大小写)，列举中找不到的名称再逐个检查一次，
+    因此只有存在的目标能省去往返
+    """
+
+    def __init__(self, max_entries=4096, probe=os.path.exists):
+        """
+        参数:
+            max_entries (int): 单个目录最多列举的条目数，超过时该目录改为逐个检查
+            probe (callable): 无法使用列举结果时的单个检查函数
+        """
+        self.max_entries = max_entries
+        self.probe = probe
+        self._listings = VerdictMemo()
+        # 逐个检查的次数
+        self.fallbacks = 0
+
+    @property
+    def listings(self):
+        """已列举的目录数"""
+        return self._listings.misses
+
+    def exists(self, path):
+        """
+        检查路径是否存在
+
+        参数:
+            path (str): 要检查的路径
+
+        返回:
+            bool: 路径是否存在
+        """
+        parent, name = os.path.split(os.path.normpath(path))
+        if not parent or not name or name in (os.curdir, os.pardir):
+            return self._fallback(path)
+
+        listing = self._listings.get(target_key(parent), lambda: self._list(parent))
+        if listing is None:
+            return self._fallback(path)
+        if listing is _MISSING_DIRECTORY:
+            return False
+
+        names, links = listing
+        key = os.path.normcase(name)
+        if key in links or key not in names:
+            # 符号链接需要确认其指向是否存在；列举结果中只有长文件名，
+            # 8.3短文件名等别名在列举中找不到，需要逐个确认
+            return self._fallback(path)
+        return True
+
+    def _fallback(self, path):
+        self.fallbacks += 1
+        return self.probe(path)
+
+    def _list(self, directory):
+        """
+        列举目录
+
+        返回:
+            tuple | None: (文件名集合, 符号链接名集合)；目录过大或无法列举时为None，
+                目录不存在时为_MISSING_DIRECTORY
+        """
+        names = set()
+        links = set()
+        try:
+            with os.scandir(directory) as entries:
+                for count, entry in enumerate(entries, 1):
+                    if count > self.max_entries:
+                        return None
+                    try:
+                        is_link = entry.is_symlink()
+                    except OSError:
+                        is_link = True
+                    (links if is_link else names).add(os.path.normcase(entry.name))
+        except (FileNotFoundError, NotADirectoryError):
+            return _MISSING_DIRECTORY
+        except OSError:
+            return None
+        return names, links
+
+
+class ProbeDeadline:
+    """
+    在时限内执行存在性检查
+
+    检查在辅助线程中进行，调用方最多等待timeout秒。系统调用本身无法打断，
+    超时的辅助线程会被放弃，等它自己返回后再回到空闲线程中复用，
+    因此一个卡住的网络路径不会占用其他检查的线程。
+    仍卡住的被放弃线程达到max_abandoned个时不再创建新线程，新的检查直接视为超时
+    """
+
+    def __init__(self, timeout=DEFAULT_PROBE_TIMEOUT, max_abandoned=DEFAULT_MAX_ABANDONED):
+        """
+        参数:
+            timeout (float): 单次检查的时限(秒)
+            max_abandoned (int): 最多同时放弃的检查线程数
+        """
+        self.timeout = timeout
+        self.max_abandoned = max_abandoned
+        self._lock = threading.Lock()
+        self._idle = []
+        # 超时的检查次数，以及仍卡住的被放弃线程数
+        self.timeouts = 0
+        self.abandoned = 0
+
+    def wrap(self, probe):
+        """
+        把检查函数包装为带时限的函数，包装只需创建一次
+
+        参数:
+            probe (callable): 检查函数，接收一个路径
+
+        返回:
+            callable: 接收路径，超时时抛出ProbeTimeout
+        """
+        return partial(self.call, probe)
+
+    def call(self, probe, path):
+        """
+        在时限内调用probe(path)
+
+        参数:
+            probe (callable): 检查函数
+            path (str): 要检查的路径
+
+        返回:
+            probe的返回值
+
+        异常:
+            ProbeTimeout: 超过时限仍未返回，或被放弃的线程已达上限
+        """
+        job = _ProbeJob(probe, path)
+        with self._lock:
+            if self._idle:
+                worker = self._idle.pop()
+            elif self.abandoned >= self.max_abandoned:
+                self.timeouts += 1
+                raise ProbeTimeout(path)
+            else:
+                worker = None
+        if worker is None:
+            worker = _ProbeThread(self)
+        worker.jobs.put(job)
+
+        try:
+            return job.future.result(self.timeout)
+        except FutureTimeout:
+            # 与辅助线程的_release在同一把锁下交接，放弃的线程只计数一次
+            with self._lock:
+                if not job.future.done():
+                    job.abandoned = True
+                    self.abandoned += 1
+                    self.timeouts += 1
+                    raise ProbeTimeout(path) from None
+            return job.future.result()
+
+    def _release(self, worker, job):
+        """辅助线程完成一次检查后回到空闲列表，返回是否继续保留"""
+        with self._lock:
+            if job.abandoned:
+                self.abandoned -= 1
+            if len(self._idle) >= _MAX_IDLE_PROBE_THREADS:
+                return False
+            self._idle.append(worker)
+            return True
+
+
+class _ProbeJob:
+    """交给辅助线程的一次检查"""
+
+    __slots__ = ('probe', 'path', 'future', 'abandoned')
+
+    def __init__(self, probe, path):
+        self.probe = probe
+        self.path = path
+        self.future = Future()
+        # 调用方已超时放弃
+        self.abandoned = False
+
+
+class _ProbeThread(threading.Thread):
+    """ProbeDeadline使用的辅助线程"""
+
+    def __init__(self, owner):
+        super().__init__(name="existence-probe", daemon=True)
+        self.owner = owner
+        self.jobs = queue.SimpleQueue()
+        self.start()
+
+    def run(self):
+        while True:
+            job = self.jobs.get()
+            try:
+                job.future.set_result(job.probe(job.path))
+            except BaseException as e:
+                job.future.set_exception(e)
+            if not self.owner._release(self, job):
+                return
+
+
+class RootBreaker:
+    """
+    按共享根和盘符熔断的存在性检查
+
+    每个根在扫描中第一次出现时只探测一次根本身是否可以访问；
+    根探测超时或出错，或其下的目标多次检查超时后熔断，之后该根下的所有目标
+    不再检查，直接视为无法访问，避免每个目标各自等待一次超时。
+    根明确不存在时只有共享根和网络、可移动、光盘驱动器才熔断；
+    不存在的本地盘符不熔断，其下的目标照常报告为目标不存在
+    """
+
+    def __init__(self, deadline=None, failure_threshold=DEFAULT_ROOT_FAILURE_THRESHOLD,
+                 probe=os.stat, is_remote=None):
+        """
+        参数:
+            deadline (ProbeDeadline): 探测根时使用的时限，None表示不限时
+            failure_threshold (int): 同一根下超时多少次后熔断
+            probe (callable): 探测根的函数，根不存在时抛出FileNotFoundError，
+                无法访问时抛出其他OSError
+            is_remote (callable): 判断根是否为共享根或网络、可移动驱动器的函数，
+                默认按UNC前缀和Windows的驱动器类型判断
+        """
+        self.deadline = deadline
+        self.failure_threshold = failure_threshold
+        self.probe = probe
+        self.is_remote = is_remote if is_remote is not None else is_remote_root
+        self._lock = threading.Lock()
+        self._roots = VerdictMemo()
+        self._failures = {}
+        self._tripped = {}
+        # 因熔断而跳过检查的目标数
+        self.short_circuits = 0
+
+    def allow(self, root):
+        """
+        判断是否应当检查该根下的目标
+
+        参数:
+            root (str): volume_root()返回的卷根
+
+        返回:
+            bool: 根可以访问时为True，已熔断时为False
+        """
+        with self._lock:
+            if root in self._tripped:
+                self.short_circuits += 1
+                return False
+
+        reason = self._roots.get(root, lambda: self._probe_root(root))
+        if reason is None:
+            return True
+
+        with self._lock:
+            self._tripped.setdefault(root, reason)
+            self.short_circuits += 1
+        return False
+
+    def record_timeout(self, root):
+        """
+        记录一次根下的目标检查超时，达到阈值时熔断
+
+        参数:
+            root (str): 卷根
+        """
+        with self._lock:
+            failures = self._failures[root] = self._failures.get(root, 0) + 1
+            if failures >= self.failure_threshold:
+                self._tripped.setdefault(root, "检查超时")
+
+    @property
+    def tripped(self):
+        """
+        返回:
+            dict: 已熔断的根及原因
+        """
+        with self._lock:
+            return dict(self._tripped)
+
+    def _probe_root(self, root):
+        """
+        探测根本身
+
+        返回:
+            str | None: 熔断的原因，根可以访问或不需要熔断时为None
+        """
+        path = root + '\\'
+        try:
+            if self.deadline is not None:
+                self.deadline.call(self.probe, path)
+            else:
+                self.probe(path)
+        except ProbeTimeout:
+            return "检查超时"
+        except FileNotFoundError:
+            return "无法访问" if self.is_remote(root) else None
+        except OSError:
+            return "无法访问"
+        return None
+
+
+# GetDriveTypeW返回的可移动、网络和光盘驱动器类型
+_REMOTE_DRIVE_TYPES = (2, 4, 5)
+
+
+def is_remote_root(root):
+    """
+    判断卷根是否为共享根，或网络、可移动、光盘驱动器的盘符
+
+    参数:
+        root (str): volume_root()返回的卷根
+
+    返回:
+        bool: 为UNC共享根或上述驱动器时为True
+    """
+    if root.startswith('\\\\'):
+        return True
+    if os.name != 'nt':
+        return False
+    import ctypes
+    return ctypes.windll.kernel32.GetDriveTypeW(root + '\\') in _REMOTE_DRIVE_TYPES
@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+图标缓存模块
+按(路径, 尺寸)缓存缩放好的图标，避免每次使用都从磁盘读取并重新缩放
+"""
+
+import os
+import threading
+
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QIcon, QImage, QPixmap, QColor
+
+
+# 图标不存在时占位符的颜色
+PLACEHOLDER_COLOR = '#4a86e8'
+
+
+class IconCache:
+    """
+    图标缓存
+
+    QPixmap只能在界面线程中创建，后台预加载时先解码并缩放为QImage，
+    界面线程第一次使用时再转换为QPixmap
+    """
+
+    def __init__(self, resolve_path):
+        """
+        参数:
+            resolve_path (callable): 把资源相对路径转换为绝对路径的函数
+        """
+        self.resolve_path = resolve_path
+        self._pixmaps = {}
+        self._icons = {}
+        # 后台预加载的图片: {(路径, 尺寸): QImage}
+        self._images = {}
+        self._lock = threading.Lock()
+
+    def pixmap(self, icon_path, size=None):
+        """
+        获取图标
+
+        参数:
+            icon_path (str): 资源相对路径
+            size (tuple): 目标尺寸(宽, 高)，为None时保持原始尺寸
+
+        返回:
+            QPixmap: 缩放后的图标，文件不存在时为纯色占位符
+        """
+        key = (icon_path, size)
+        pixmap = self._pixmaps.get(key)
+        if pixmap is None:
+            with self._lock:
+                image = self._images.pop(key, None)
+            if image is None:
+                image = self._load_image(icon_path, size)
+            if image is None:
+                pixmap = QPixmap(size[0] if size else 24, size[1] if size else 24)
+                pixmap.fill(QColor(PLACEHOLDER_COLOR))
+            else:
+                pixmap = QPixmap.fromImage(image)
+            with self._lock:
+                self._pixmaps[key] = pixmap
+                # 预加载线程可能在上面取出之后才放入同一图标，已不再需要
+                self._images.pop(key, None)
+        return pixmap
+
+    def icon(self, icon_path, size=None):
+        """
+        获取QIcon，同一图标的所有列表项共用一个QIcon对象
+
+        参数:
+            icon_path (str): 资源相对路径
+            size (tuple): 目标尺寸(宽, 高)
+
+        返回:
+            QIcon: 图标
+        """
+        key = (icon_path, size)
+        icon = self._icons.get(key)
+        if icon is None:
+            icon = self._icons[key] = QIcon(self.pixmap(icon_path, size))
+        return icon
+
+    def preload(self, icons):
+        """
+        在后台线程中解码并缩放图标
+
+        参数:
+            icons (iterable): (资源相对路径, 尺寸)列表
+
+        返回:
+            threading.Thread: 预加载线程
+        """
+        icons = list(icons)
+
+        def run():
+            for icon_path, size in icons:
+                key = (icon_path, size)
+                if key in self._pixmaps:
+                    continue
+                image = self._load_image(icon_path, size)
+                if image is not None:
+                    with self._lock:
+                        # 解码期间界面线程可能已经创建了QPixmap
+                        if key not in self._pixmaps:
+                            self._images.setdefault(key, image)
+
+        thread = threading.Thread(target=run, name="icon-preload", daemon=True)
+        thread.start()
+        return thread
+
+    def _load_image(self, icon_path, size):
+        """从磁盘读取并缩放图标，文件不存在或无法解码时返回None"""
+        full_path = self.resolve_path(icon_path)
+        if not os.path.exists(full_path):
+            return None
+        image = QImage(full_path)
+        if image.isNull():
+            return None
+        if size:
+            image = image.scaled(size[0], size[1],
+                                 Qt.AspectRatioMode.KeepAspectRatio,
+                                 Qt.TransformationMode.SmoothTransformation)
+        return image
@@ -0,0 +1,435 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+快捷方式(.lnk)解析模块
+纯Python实现的Shell Link二进制格式(MS-SHLLINK)解析器，无需COM即可读取目标路径
+"""
+
+import os
+import re
+import sys
+import struct
+import locale
+
+
+# 文件头固定大小与CLSID {00021401-0000-0000-C000-000000000046}
+HEADER_SIZE = 0x4C
+LINK_CLSID = b'\x01\x14\x02\x00\x00\x00\x00\x00\xc0\x00\x00\x00\x00\x00\x00\x46'
+
+# LinkFlags
+HAS_LINK_TARGET_ID_LIST = 0x00000001
+HAS_LINK_INFO = 0x00000002
+HAS_NAME = 0x00000004
+HAS_RELATIVE_PATH = 0x00000008
+HAS_WORKING_DIR = 0x00000010
+HAS_ARGUMENTS = 0x00000020
+HAS_ICON_LOCATION = 0x00000040
+IS_UNICODE = 0x00000080
+FORCE_NO_LINK_INFO = 0x00000100
+HAS_EXP_STRING = 0x00000200
+
+# LinkInfoFlags
+VOLUME_ID_AND_LOCAL_BASE_PATH = 0x00000001
+COMMON_NETWORK_RELATIVE_LINK_AND_PATH_SUFFIX = 0x00000002
+
+# ExtraData签名
+ENVIRONMENT_VARIABLE_DATA_BLOCK = 0xA0000001
+
+# 首次读取的字节数，绝大多数快捷方式文件都小于此值
+_INITIAL_READ = 4096
+
+# "此电脑"的CLSID {20D04FE0-3AEA-1069-A2D8-08002B30309D}
+_MY_COMPUTER_CLSID = b'\xe0\x4f\xd0\x20\xea\x3a\x69\x10\xa2\xd8\x08\x00\x2b\x30\x30\x9d'
+
+# ANSI字符串使用的代码页
+if sys.platform == 'win32':
+    ANSI_ENCODING = 'mbcs'
+else:
+    ANSI_ENCODING = locale.getpreferredencoding(False) or 'cp1252'
+
+_ENV_VAR_PATTERN = re.compile(r'%([^%]+)%')
+
+
+class LnkParseError(ValueError):
+    """快捷方式文件格式错误"""
+
+
+class _Truncated(LnkParseError):
+    """数据不完整，需要读取更多字节"""
+
+
+class ShellLink:
+    """解析后的快捷方式信息"""
+
+    __slots__ = ('flags', 'file_attributes', 'id_list_path', 'local_base_path',
+                 'common_path_suffix', 'net_name', 'device_name', 'name',
+                 'relative_path', 'working_dir', 'arguments', 'icon_location',
+                 'env_target', 'size')
+
+    def __init__(self, flags=0, file_attributes=0):
+        self.flags = flags
+        self.file_attributes = file_attributes
+        self.id_list_path = None
+        self.local_base_path = None
+        self.common_path_suffix = None
+        self.net_name = None
+        self.device_name = None
+        self.name = None
+        self.relative_path = None
+        self.working_dir = None
+        self.arguments = None
+        self.icon_location = None
+        self.env_target = None
+        # 解析时读取的字节数
+        self.size = 0
+
+    @property
+    def target_path(self):
+        """
+        快捷方式的目标路径，与WScript.Shell的TargetPath一致
+
+        返回:
+            str: 目标路径，无法从文件中确定时为空字符串
+        """
+        if self.env_target:
+            return expand_env_vars(self.env_target)
+
+        if self.local_base_path:
+            return _join_suffix(self.local_base_path, self.common_path_suffix)
+
+        if self.net_name:
+            return _join_suffix(self.net_name, self.common_path_suffix)
+
+        return self.id_list_path or ''
+
+    def __repr__(self):
+        return f"ShellLink(target_path={self.target_path!r})"
+
+
+def expand_env_vars(value):
+    """
+    展开Windows风格的%VAR%环境变量，变量名不区分大小写
+
+    参数:
+        value (str): 包含环境变量的字符串
+
+    返回:
+        str: 展开后的字符串，未定义的变量保持原样
+    """
+    if '%' not in value:
+        return value
+
+    env = {key.upper(): val for key, val in os.environ.items()}
+
+    def replace(match):
+        return env.get(match.group(1).upper(), match.group(0))
+
+    return _ENV_VAR_PATTERN.sub(replace, value)
+
+
+def parse_lnk(source, ansi_encoding=None):
+    """
+    解析快捷方式文件
+
+    参数:
+        source (str | os.PathLike | bytes | bytearray | memoryview): 文件路径或文件内容
+        ansi_encoding (str): 非Unicode字符串使用的编码，默认使用系统ANSI代码页
+
+    返回:
+        ShellLink: 解析结果
+
+    异常:
+        LnkParseError: 文件格式无效
+        OSError: 无法读取文件
+    """
+    encoding = ansi_encoding or ANSI_ENCODING
+
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return _parse(memoryview(source), encoding)
+
+    with open(source, 'rb') as f:
+        data = f.read(_INITIAL_READ)
+        try:
+            return _parse(memoryview(data), encoding)
+        except _Truncated:
+            # 文件大于首次读取的长度时才补读剩余部分
+            if len(data) < _INITIAL_READ:
+                raise
+            data += f.read()
+    return _parse(memoryview(data), encoding)
+
+
+def read_lnk_target(source, ansi_encoding=None):
+    """
+    读取快捷方式的目标路径
+
+    参数:
+        source (str | os.PathLike | bytes | bytearray | memoryview): 文件路径或文件内容
+        ansi_encoding (str): 非Unicode字符串使用的编码
+
+    返回:
+        str: 目标路径，无法确定时为空字符串
+    """
+    return parse_lnk(source, ansi_encoding).target_path
+
+
+def _join_suffix(base, suffix):
+    """拼接基础路径与公共路径后缀"""
+    if not suffix:
+        return base
+    if base.endswith('\\'):
+        return base + suffix
+    return base + '\\' + suffix
+
+
+def _u16(view, offset):
+    if offset + 2 > len(view):
+        raise _Truncated("数据长度不足")
+    return view[offset] | (view[offset + 1] << 8)
+
+
+def _u32(view, offset):
+    if offset + 4 > len(view):
+        raise _Truncated("数据长度不足")
+    return struct.unpack_from('<I', view, offset)[0]
+
+
+def _read_cstring(view, offset, end, encoding):
+    """读取以NUL结尾的单字节字符串"""
+    if offset >= end:
+        return ''
+    raw = bytes(view[offset:end])
+    nul = raw.find(b'\x00')
+    if nul >= 0:
+        raw = raw[:nul]
+    return raw.decode(encoding, errors='replace')
+
+
+def _read_wstring(view, offset, end):
+    """读取以NUL结尾的UTF-16LE字符串"""
+    pos = offset
+    while pos + 1 < end:
+        if view[pos] == 0 and view[pos + 1] == 0:
+            break
+        pos += 2
+    return bytes(view[offset:pos]).decode('utf-16-le', errors='replace')
+
+
+def _parse(view, encoding):
+    """解析整个快捷方式缓冲区"""
+    if len(view) < HEADER_SIZE:
+        raise _Truncated("文件头不完整")
+
+    if _u32(view, 0) != HEADER_SIZE or bytes(view[4:20]) != LINK_CLSID:
+        raise LnkParseError("不是有效的快捷方式文件")
+
+    flags = _u32(view, 20)
+    link = ShellLink(flags, _u32(view, 24))
+    link.size = len(view)
+    offset = HEADER_SIZE
+
+    # LinkTargetIDList
+    if flags & HAS_LINK_TARGET_ID_LIST:
+        id_list_size = _u16(view, offset)
+        start = offset + 2
+        offset = start + id_list_size
+        if offset > len(view):
+            raise _Truncated("IDList不完整")
+        link.id_list_path = _decode_id_list(view[start:offset], encoding)
+
+    # LinkInfo
+    if flags & HAS_LINK_INFO:
+        link_info_size = _u32(view, offset)
+        if offset + link_info_size > len(view):
+            raise _Truncated("LinkInfo不完整")
+        if not flags & FORCE_NO_LINK_INFO:
+            _parse_link_info(view[offset:offset + link_info_size], link, encoding)
+        offset += link_info_size
+
+    # StringData
+    is_unicode = bool(flags & IS_UNICODE)
+    for flag, attr in ((HAS_NAME, 'name'),
+                       (HAS_RELATIVE_PATH, 'relative_path'),
+                       (HAS_WORKING_DIR, 'working_dir'),
+                       (HAS_ARGUMENTS, 'arguments'),
+                       (HAS_ICON_LOCATION, 'icon_location')):
+        if flags & flag:
+            count = _u16(view, offset)
+            offset += 2
+            size = count * 2 if is_unicode else count
+            if offset + size > len(view):
+                raise _Truncated("StringData不完整")
+            raw = bytes(view[offset:offset + size])
+            if is_unicode:
+                setattr(link, attr, raw.decode('utf-16-le', errors='replace'))
+            else:
+                setattr(link, attr, raw.decode(encoding, errors='replace'))
+            offset += size
+
+    # ExtraData只在需要环境变量目标时解析
+    if flags & HAS_EXP_STRING:
+        link.env_target = _find_env_target(view, offset, encoding)
+
+    return link
+
+
+def _parse_link_info(info, link, encoding):
+    """解析LinkInfo结构"""
+    size = len(info)
+    if size < 0x1C:
+        raise LnkParseError("LinkInfo长度无效")
+
+    header_size = _u32(info, 4)
+    info_flags = _u32(info, 8)
+    local_base_path_offset = _u32(info, 16)
+    network_offset = _u32(info, 20)
+    suffix_offset = _u32(info, 24)
+
+    local_base_path_offset_unicode = 0
+    suffix_offset_unicode = 0
+    if header_size >= 0x24:
+        local_base_path_offset_unicode = _u32(info, 28)
+        suffix_offset_unicode = _u32(info, 32)
+
+    if info_flags & VOLUME_ID_AND_LOCAL_BASE_PATH:
+        if local_base_path_offset_unicode:
+            link.local_base_path = _read_wstring(info, local_base_path_offset_unicode, size)
+        else:
+            link.local_base_path = _read_cstring(info, local_base_path_offset, size, encoding)
+
+    if info_flags & COMMON_NETWORK_RELATIVE_LINK_AND_PATH_SUFFIX and network_offset:
+        _parse_network_link(info[network_offset:], link, encoding)
+
+    if suffix_offset_unicode:
+        link.common_path_suffix = _read_wstring(info, suffix_offset_unicode, size)
+    elif suffix_offset:
+        link.common_path_suffix = _read_cstring(info, suffix_offset, size, encoding)
+
+
+def _parse_network_link(net, link, encoding):
+    """解析CommonNetworkRelativeLink结构"""
+    size = min(_u32(net, 0), len(net))
+    net_name_offset = _u32(net, 8)
+    device_name_offset = _u32(net, 12)
+
+    if net_name_offset > 0x14 and size >= 0x1C:
+        link.net_name = _read_wstring(net, _u32(net, 20), size)
+        device_name_offset_unicode = _u32(net, 24)
+        if device_name_offset_unicode:
+            link.device_name = _read_wstring(net, device_name_offset_unicode, size)
+        return
+
+    link.net_name = _read_cstring(net, net_name_offset, size, encoding)
+    if device_name_offset:
+        link.device_name = _read_cstring(net, device_name_offset, size, encoding)
+
+
+def _find_env_target(view, offset, encoding):
+    """在ExtraData中查找环境变量数据块"""
+    while True:
+        block_size = _u32(view, offset)
+        if block_size < 4:
+            return None
+        if offset + block_size > len(view):
+            raise _Truncated("ExtraData不完整")
+        if block_size >= 8 and _u32(view, offset + 4) == ENVIRONMENT_VARIABLE_DATA_BLOCK:
+            if block_size < 0x314:
+                raise LnkParseError("环境变量数据块长度无效")
+            target = _read_wstring(view, offset + 268, offset + 788)
+            return target or _read_cstring(view, offset + 8, offset + 268, encoding)
+        offset += block_size
+
+
+def _decode_id_list(id_list, encoding):
+    """
+    将IDList中的文件系统项拼接为路径
+
+    参数:
+        id_list (memoryview): IDList数据(不含IDListSize)
+        encoding (str): ANSI字符串编码
+
+    返回:
+        str | None: 路径，包含非文件系统项时返回None
+    """
+    parts = []
+    offset = 0
+    end = len(id_list)
+
+    while offset + 2 <= end:
+        item_size = _u16(id_list, offset)
+        if item_size == 0:
+            break
+        if item_size < 3 or offset + item_size > end:
+            return None
+        item = id_list[offset + 2:offset + item_size]
+        offset += item_size
+
+        class_type = item[0]
+        if class_type == 0x1F:
+            # 根文件夹，只有"此电脑"属于文件系统
+            if bytes(item[2:18]) != _MY_COMPUTER_CLSID:
+                return None
+        elif class_type & 0x70 == 0x20:
+            # 卷(驱动器号)
+            parts = [_read_cstring(item, 1, len(item), 'ascii').rstrip('\\')]
+        elif class_type & 0x70 == 0x30:
+            # 文件或文件夹
+            name = _file_entry_name(item, encoding)
+            if name is None:
+                return None
+            parts.append(name)
+        elif class_type & 0x70 == 0x40:
+            # 网络位置(\\server\share)
+            parts = [_read_cstring(item, 3, len(item), encoding).rstrip('\\')]
+        else:
+            return None
+
+    if not parts:
+        return None
+    if len(parts) == 1 and parts[0].endswith(':'):
+        return parts[0] + '\\'
+    return '\\'.join(parts)
+
+
+def _file_entry_name(item, encoding):
+    """读取文件项的长文件名，缺少扩展块时退回短文件名"""
+    if len(item) < 13:
+        return None
+
+    is_unicode = bool(item[0] & 0x04)
+    if is_unicode:
+        short_name = _read_wstring(item, 12, len(item))
+        name_end = 12 + len(short_name.encode('utf-16-le')) + 2
+    else:
+        raw = bytes(item[12:])
+        nul = raw.find(b'\x00')
+        if nul < 0:
+            return None
+        short_name = raw[:nul].decode(encoding, errors='replace')
+        name_end = 12 + nul + 1
+        if name_end % 2:
+            name_end += 1
+
+    # 查找0xBEEF0004扩展块中的长文件名
+    pos = name_end
+    while pos + 8 <= len(item):
+        block_size = _u16(item, pos)
+        if block_size < 8 or pos + block_size > len(item):
+            break
+        version = _u16(item, pos + 2)
+        if _u32(item, pos + 4) == 0xBEEF0004 and version >= 3:
+            name_offset = 18
+            if version >= 7:
+                name_offset += 18
+            name_offset += 2
+            if version >= 8:
+                name_offset += 4
+            if version >= 9:
+                name_offset += 4
+            long_name = _read_wstring(item, pos + name_offset, pos + block_size)
+            if long_name:
+                return long_name
+            break
+        pos += block_size
+
+    return short_name
@@ -8,16 +8,34 @@ CheckInk - 快捷方式检查工具
 
 import sys
 import os
+import time
+import argparse
+import multiprocessing
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QPushButton, QVBoxLayout, 
-                            QHBoxLayout, QWidget, QListWidget, QLabel, QFileDialog,
-                            QProgressBar, QMessageBox, QListWidgetItem, QFrame,
-                            QSizePolicy)
+                            QHBoxLayout, QWidget, QListView, QLabel, QFileDialog,
+                            QProgressBar, QMessageBox, QFrame, QSizePolicy)
 from PyQt6.QtCore import Qt, QThread, pyqtSignal, QMimeData, QUrl, QSize, QPoint, QRectF
-from PyQt6.QtGui import (QIcon, QDragEnterEvent, QDropEvent, QFont, QPixmap, 
+from PyQt6.QtGui import (QIcon, QDragEnterEvent, QDropEvent, QFont, 
                          QCursor, QColor, QPainter, QBrush, QPainterPath, QPen)
 
-from shortcut_checker import ShortcutChecker
+from shortcut_checker import ShortcutChecker, DEFAULT_WORKERS
+from scan_result import ScanResult, Verdict
+from scan_db import ScanDatabase
+from watcher import FolderWatcher
 from style import AppStyle
+from icon_cache import IconCache
+from result_model import ResultListModel
+from progress import PHASE_DISCOVERY, format_duration
+from cancellation import CancelToken
+from deleter import delete_shortcuts, recycle_bin_available
+from tracing import TraceRecorder
+
+
+# 结果列表中使用的图标，启动时在后台预加载
+RESULT_ICONS = {
+    '.lnk': ("assets/lnk.png", (16, 16)),
+    '.url': ("assets/url.png", (16, 16)),
+}
 
 
 class TitleBar(QWidget):
@@ -223,8 +241,8 @@ class CustomButton(QPushButton):
         self.parent = parent
         
         if icon_path and parent:
-            if hasattr(parent, 'load_icon'):
-                self.setIcon(QIcon(parent.load_icon(icon_path, (18, 18))))
+            if hasattr(parent, 'icon_cache'):
+                self.setIcon(parent.icon_cache.icon(icon_path, (18, 18)))
         
         self.setMinimumHeight(36)
         
@@ -257,10 +275,23 @@ class CustomButton(QPushButton):
 class CheckInkApp(QMainWindow):
     """主应用程序窗口"""
     
-    def __init__(self):
+    def __init__(self, db_path=None, trace_path=None, profile=False):
         super().__init__(None, Qt.WindowType.FramelessWindowHint)
         self.setMinimumSize(800, 600)
         
+        # 增量扫描数据库路径，为None时每次都完整检查
+        self.db_path = db_path
+        
+        # 扫描时间线的输出路径，为None时不记录
+        self.trace_path = trace_path
+        
+        # 是否收集分阶段统计，否则只统计各类结果的数量
+        self.profile = profile
+        
+        # 图标缓存，TitleBar等子控件通过load_icon共用
+        self.icon_cache = IconCache(self.get_resource_path)
+        self.icon_cache.preload(RESULT_ICONS.values())
+        
         # 设置应用程序图标
         app_icon = self.load_icon("assets/icon.png")
         if app_icon:
@@ -269,12 +300,17 @@ class CheckInkApp(QMainWindow):
         # 当前检查的文件夹路径
         self.current_folder = ""
         
-        # 无效的快捷方式列表
-        self.invalid_shortcuts = []
-        
         # 检查器实例
         self.checker = None
         
+        # 监视线程，以及已停止但尚未结束的监视线程
+        self.watcher = None
+        self.stopping_watchers = set()
+        self.closing = False
+        
+        # 删除线程
+        self.deleter = None
+        
         # 为了圆角而设置透明背景
         self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
         
@@ -309,22 +345,8 @@ class CheckInkApp(QMainWindow):
         return os.path.join(base_path, relative_path)
     
     def load_icon(self, icon_path, size=None):
-        """加载图标并处理可能的错误"""
-        full_path = self.get_resource_path(icon_path)
-        pixmap = None
-        
-        if os.path.exists(full_path):
-            pixmap = QPixmap(full_path)
-            if size:
-                pixmap = pixmap.scaled(size[0], size[1], 
-                                      Qt.AspectRatioMode.KeepAspectRatio, 
-                                      Qt.TransformationMode.SmoothTransformation)
-        else:
-            # 图标不存在时，创建一个彩色占位符
-            pixmap = QPixmap(size[0] if size else 24, size[1] if size else 24)
-            pixmap.fill(QColor('#4a86e8'))
-        
-        return pixmap
+        """加载图标，相同路径和尺寸的图标只读取和缩放一次，图标不存在时返回彩色占位符"""
+        return self.icon_cache.pixmap(icon_path, size)
     
     def init_ui(self):
         """初始化用户界面"""
@@ -442,33 +464,37 @@ class CheckInkApp(QMainWindow):
         
         content_layout.addLayout(result_layout)
         
-        # 结果列表
-        self.result_list = QListWidget()
-        self.result_list.setSelectionMode(QListWidget.SelectionMode.MultiSelection)
+        # 结果列表，只绘制可见的行
+        self.result_model = ResultListModel(self.result_icon, self)
+        self.result_list = QListView()
+        self.result_list.setModel(self.result_model)
+        self.result_list.setUniformItemSizes(True)
+        self.result_list.setLayoutMode(QListView.LayoutMode.Batched)
+        self.result_list.setSelectionMode(QListView.SelectionMode.MultiSelection)
         self.result_list.setStyleSheet("""
-            QListWidget {
+            QListView {
                 border: 1px solid #c0c0c0;
                 border-radius: 3px;
                 background-color: white;
                 padding: 5px;
             }
             
-            QListWidget::item {
+            QListView::item {
                 padding: 5px;
                 border-bottom: 1px solid #e0e0e0;
             }
             
-            QListWidget::item:hover {
+            QListView::item:hover {
                 background-color: #e9f1fd;
             }
             
-            QListWidget::item:selected {
+            QListView::item:selected {
                 background-color: #d5e5fb;
                 color: #333;
             }
         """)
         # 连接点击事件，使点击整行时切换选择状态
-        self.result_list.itemClicked.connect(self.toggle_item_check)
+        self.result_list.clicked.connect(self.toggle_item_check)
         # 禁用默认按键事件
         self.result_list.keyPressEvent = self.list_key_press_event
         content_layout.addWidget(self.result_list)
@@ -483,6 +509,24 @@ class CheckInkApp(QMainWindow):
         self.check_btn.clicked.connect(self.start_check)
         btn_layout.addWidget(self.check_btn)
         
+        self.watch_btn = CustomButton("监视变化", "assets/folder.png", self)
+        self.watch_btn.setCheckable(True)
+        self.watch_btn.setEnabled(False)
+        self.watch_btn.toggled.connect(self.toggle_watch)
+        btn_layout.addWidget(self.watch_btn)
+        
+        # 检查过程中才显示的暂停和停止按钮
+        self.pause_btn = CustomButton("暂停", None, self)
+        self.pause_btn.setCheckable(True)
+        self.pause_btn.setVisible(False)
+        self.pause_btn.toggled.connect(self.toggle_pause)
+        btn_layout.addWidget(self.pause_btn)
+        
+        self.stop_btn = CustomButton("停止", None, self)
+        self.stop_btn.setVisible(False)
+        self.stop_btn.clicked.connect(self.stop_check)
+        btn_layout.addWidget(self.stop_btn)
+        
         self.select_all_btn = CustomButton("全选/反选", "assets/select_all.png", self)
         self.select_all_btn.setEnabled(False)
         self.select_all_btn.clicked.connect(self.select_all_items)
@@ -526,6 +570,7 @@ class CheckInkApp(QMainWindow):
         self.current_folder = folder_path
         self.folder_label.setText(folder_path)
         self.check_btn.setEnabled(True)
+        self.watch_btn.setEnabled(True)
         self.status_label.setText(f"已选择文件夹: {folder_path}")
     
     def start_check(self):
@@ -534,136 +579,308 @@ class CheckInkApp(QMainWindow):
             return
         
         # 清空结果列表
-        self.result_list.clear()
-        self.invalid_shortcuts = []
+        self.result_model.clear()
         
         # 禁用按钮
         self.check_btn.setEnabled(False)
+        self.watch_btn.setEnabled(False)
         self.delete_btn.setEnabled(False)
         self.select_all_btn.setEnabled(False)
         
-        # 显示进度条
+        # 显示进度条和暂停、停止按钮
         self.progress_bar.setVisible(True)
         self.progress_bar.setValue(0)
+        self.pause_btn.setChecked(False)
+        self.pause_btn.setVisible(True)
+        self.stop_btn.setEnabled(True)
+        self.stop_btn.setVisible(True)
         
         # 创建并启动检查线程
-        self.checker = ShortcutCheckerThread(self.current_folder)
+        self.checker = ShortcutCheckerThread(self.current_folder, self.db_path, self.trace_path,
+                                             self.profile)
         self.checker.progress_signal.connect(self.update_progress)
-        self.checker.result_signal.connect(self.show_results)
+        self.checker.batch_signal.connect(self.append_records)
         self.checker.finished.connect(self.check_finished)
         self.checker.start()
         
         self.status_label.setText("正在检查快捷方式...")
+        self.status_label.setToolTip("")
+    
+    def toggle_pause(self, paused):
+        """暂停或继续检查"""
+        if not self.checker or not self.checker.isRunning():
+            return
+        if paused:
+            self.checker.cancel_token.pause()
+            self.pause_btn.setText("继续")
+            self.status_label.setText("已暂停")
+        else:
+            self.checker.cancel_token.resume()
+            self.pause_btn.setText("暂停")
+            self.status_label.setText("正在检查快捷方式...")
     
-    def update_progress(self, current, total):
-        """更新进度条"""
-        self.progress_bar.setValue(int(current / total * 100))
+    def stop_check(self):
+        """停止检查，保留已得出的结果"""
+        if self.checker and self.checker.isRunning():
+            self.checker.cancel_token.cancel()
+            self.stop_btn.setEnabled(False)
+            self.pause_btn.setEnabled(False)
+            self.status_label.setText("正在停止...")
     
-    def show_results(self, invalid_shortcuts):
-        """显示检查结果"""
-        self.invalid_shortcuts = invalid_shortcuts
+    def update_progress(self, info):
+        """更新进度条和速度、剩余时间"""
+        if self.checker and self.checker.cancel_token.cancelled:
+            return
+        rate = f"{info.rate:.0f} 个/秒"
+        if info.total <= 0:
+            # 总数未知时显示忙碌状态
+            self.progress_bar.setRange(0, 0)
+            if info.phase == PHASE_DISCOVERY:
+                self.status_label.setText(f"正在查找并检查快捷方式... 已检查 {info.done} 个 ({rate})")
+            return
+        self.progress_bar.setRange(0, 100)
+        self.progress_bar.setValue(int(info.done / info.total * 100))
         
-        if not invalid_shortcuts:
-            item = QListWidgetItem("没有发现无效的快捷方式")
-            item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            item.setForeground(QColor("#4a86e8"))
-            self.result_list.addItem(item)
+        text = f"正在检查快捷方式... {info.done}/{info.total} ({rate}"
+        if info.eta is not None:
+            text += f"，剩余约 {format_duration(info.eta)}"
+        self.status_label.setText(text + ")")
+    
+    def append_results(self, invalid_shortcuts):
+        """追加一批无效快捷方式的路径"""
+        self.result_model.append(invalid_shortcuts)
+    
+    def append_records(self, results):
+        """追加一批检查记录，列表中可以查看失效原因和目标"""
+        self.result_model.append([result.path for result in results], results)
+    
+    def result_icon(self, ext):
+        """结果列表中快捷方式的图标"""
+        icon = RESULT_ICONS.get(ext)
+        return self.icon_cache.icon(*icon) if icon else None
+    
+    def toggle_watch(self, checked):
+        """开始或停止监视当前文件夹"""
+        if not checked:
+            if self.watcher:
+                self.stop_watcher()
+            self.check_btn.setEnabled(True)
+            self.select_btn.setEnabled(True)
+            self.status_label.setText("已停止监视")
             return
         
-        # 添加无效快捷方式到列表
-        for shortcut in invalid_shortcuts:
-            item = QListWidgetItem()
-            item.setText(shortcut)
-            item.setFlags(item.flags() | Qt.ItemFlag.ItemIsUserCheckable)
-            item.setCheckState(Qt.CheckState.Unchecked)
-            
-            # 添加图标
-            if shortcut.lower().endswith('.lnk'):
-                item.setIcon(QIcon(self.load_icon("assets/lnk.png", (16, 16))))
-            elif shortcut.lower().endswith('.url'):
-                item.setIcon(QIcon(self.load_icon("assets/url.png", (16, 16))))
-            
-            self.result_list.addItem(item)
+        if not self.current_folder:
+            self.watch_btn.setChecked(False)
+            return
+        
+        # 清空结果列表，监视开始时会完整检查一次
+        self.result_model.clear()
+        self.check_btn.setEnabled(False)
+        self.select_btn.setEnabled(False)
+        
+        self.watcher = WatchThread(self.current_folder)
+        self.watcher.changed_signal.connect(self.watch_update)
+        self.watcher.start()
+        
+        self.status_label.setText(f"正在监视: {self.current_folder}")
+    
+    def stop_watcher(self):
+        """
+        停止监视线程但不等待它结束
+
+        监视线程可能正卡在不可达目标的存在性检查上，最长要等到检查时限，
+        在界面线程中等待会使窗口无响应，因此只保留引用直到线程结束
+        """
+        watcher, self.watcher = self.watcher, None
+        watcher.changed_signal.disconnect(self.watch_update)
+        watcher.stop()
+        if watcher.isRunning():
+            self.stopping_watchers.add(watcher)
+            watcher.finished.connect(lambda: self.watcher_finished(watcher))
+    
+    def watcher_finished(self, watcher):
+        """已停止的监视线程结束，关闭窗口时等待的最后一个结束后完成关闭"""
+        self.stopping_watchers.discard(watcher)
+        watcher.deleteLater()
+        if self.closing and not self.stopping_watchers:
+            # 窗口已隐藏，关闭它不会触发最后一个窗口关闭后的退出
+            self.close()
+            QApplication.quit()
+    
+    def watch_update(self, shortcut_path, valid):
+        """监视中某个快捷方式的状态发生变化"""
+        unreachable = valid == Verdict.UNREACHABLE
+        if shortcut_path in self.result_model and (
+                valid is not False and not unreachable
+                or self.result_model.is_unreachable(shortcut_path) != unreachable):
+            # 已恢复有效、已被删除，或在无效与无法访问之间变化
+            self.result_model.remove_paths([shortcut_path])
+        if shortcut_path not in self.result_model:
+            if unreachable:
+                kind = os.path.splitext(shortcut_path)[1].lower().lstrip('.')
+                self.append_records([ScanResult(shortcut_path, kind, None, Verdict.UNREACHABLE)])
+            elif valid is False:
+                self.append_results([shortcut_path])
+        
+        has_items = self.broken_count() > 0
+        self.select_all_btn.setEnabled(has_items)
+        self.delete_btn.setEnabled(has_items)
+        self.status_label.setText(
+            f"正在监视: {self.current_folder}，当前 {self.broken_count()} 个无效快捷方式"
+            + self._unreachable_note(self.result_model.unreachable_count()))
+    
+    def broken_count(self):
+        """结果列表中无效快捷方式的数量，不含目标无法访问的行"""
+        return len(self.result_model) - self.result_model.unreachable_count()
+    
+    def closeEvent(self, event):
+        """关闭窗口时停止检查和监视"""
+        if self.checker and self.checker.isRunning():
+            self.checker.cancel_token.cancel()
+            self.checker.wait()
+        if self.watcher:
+            self.stop_watcher()
+        if self.deleter:
+            # 删除不能中途放弃，等待当前批次完成
+            self.deleter.wait()
+        if self.stopping_watchers:
+            # 先隐藏窗口，监视线程全部结束后再关闭
+            self.closing = True
+            self.hide()
+            event.ignore()
+            return
+        super().closeEvent(event)
     
     def check_finished(self):
         """检查完成后的操作"""
         self.progress_bar.setVisible(False)
+        self.pause_btn.setVisible(False)
+        self.pause_btn.setEnabled(True)
+        self.pause_btn.setText("暂停")
+        self.stop_btn.setVisible(False)
         self.check_btn.setEnabled(True)
-        
-        if self.invalid_shortcuts:
+        self.watch_btn.setEnabled(True)
+        
+        broken = self.broken_count()
+        note = self._unreachable_note(self.checker.unreachable, self.checker.tripped_roots)
+        if self.checker.cancel_token.cancelled:
+            # 停止时保留已得出的结果
+            self.select_all_btn.setEnabled(broken > 0)
+            self.delete_btn.setEnabled(broken > 0)
+            self.status_label.setText(f"已停止，已发现 {broken} 个无效快捷方式" + note)
+        elif broken:
             self.select_all_btn.setEnabled(True)
             self.delete_btn.setEnabled(True)
-            self.status_label.setText(f"检查完成，发现 {len(self.invalid_shortcuts)} 个无效快捷方式")
+            self.status_label.setText(f"检查完成，发现 {broken} 个无效快捷方式" + note)
+        elif self.checker.unreachable:
+            self.status_label.setText("检查完成，没有发现无效的快捷方式" + note)
         else:
+            self.result_model.set_placeholder("没有发现无效的快捷方式")
             self.status_label.setText("检查完成，所有快捷方式均有效")
+        
+        # 收集了分阶段统计时状态栏附带摘要，完整报告显示在提示中；否则提示各类结果的数量
+        stats = self.checker.stats
+        if stats is not None:
+            self.status_label.setText(f"{self.status_label.text()} | {stats.summary()}")
+            self.status_label.setToolTip(stats.format_report())
+        else:
+            self.status_label.setToolTip("\n".join(
+                f"{verdict.label}: {count}" for verdict, count in self.checker.verdict_counts.items()))
+    
+    def _unreachable_note(self, count, tripped_roots=None):
+        """目标无法访问的快捷方式以灰色列在结果中，状态栏提示数量和熔断的根"""
+        if not count:
+            return ""
+        note = f"，另有 {count} 个快捷方式的目标暂时无法访问(灰色)"
+        if tripped_roots:
+            note += f" (无法访问: {', '.join(sorted(tripped_roots))})"
+        return note
     
     def select_all_items(self):
         """全选/反选列表项"""
-        # 检查是否所有项目都已选中
-        all_checked = True
-        for i in range(self.result_list.count()):
-            item = self.result_list.item(i)
-            if item.flags() & Qt.ItemFlag.ItemIsUserCheckable:
-                if item.checkState() != Qt.CheckState.Checked:
-                    all_checked = False
-                    break
-        
         # 如果全部已选中，则取消选中；否则全选
-        new_state = Qt.CheckState.Unchecked if all_checked else Qt.CheckState.Checked
-        
-        for i in range(self.result_list.count()):
-            item = self.result_list.item(i)
-            if item.flags() & Qt.ItemFlag.ItemIsUserCheckable:
-                item.setCheckState(new_state)
+        self.result_model.set_all_checked(not self.result_model.all_checked())
     
     def delete_selected(self):
         """删除选中的快捷方式"""
-        selected_items = []
-        
         # 收集选中的项
-        for i in range(self.result_list.count()):
-            item = self.result_list.item(i)
-            if item.flags() & Qt.ItemFlag.ItemIsUserCheckable and item.checkState() == Qt.CheckState.Checked:
-                selected_items.append((i, item.text()))
+        selected_paths = self.result_model.checked_paths()
         
-        if not selected_items:
+        if not selected_paths:
             QMessageBox.information(self, "提示", "请先选择要删除的快捷方式")
             return
         
-        # 确认删除
-        reply = QMessageBox.question(
-            self, 
-            "确认删除", 
-            f"确定要删除选中的 {len(selected_items)} 个快捷方式吗？",
-            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
-        )
+        # 确认删除，支持回收站时默认移到回收站
+        box = QMessageBox(self)
+        box.setIcon(QMessageBox.Icon.Question)
+        box.setWindowTitle("确认删除")
+        box.setText(f"确定要删除选中的 {len(selected_paths)} 个快捷方式吗？")
+        recycle_btn = None
+        if recycle_bin_available():
+            recycle_btn = box.addButton("移到回收站", QMessageBox.ButtonRole.AcceptRole)
+            delete_btn = box.addButton("永久删除", QMessageBox.ButtonRole.DestructiveRole)
+            box.setDefaultButton(recycle_btn)
+        else:
+            delete_btn = box.addButton("删除", QMessageBox.ButtonRole.AcceptRole)
+        box.addButton("取消", QMessageBox.ButtonRole.RejectRole)
+        box.exec()
         
-        if reply == QMessageBox.StandardButton.Yes:
-            # 从后往前删除，避免索引变化
-            deleted_count = 0
-            for i, shortcut_path in reversed(selected_items):
-                try:
-                    os.remove(shortcut_path)
-                    self.result_list.takeItem(i)
-                    deleted_count += 1
-                except Exception as e:
-                    QMessageBox.warning(self, "删除失败", f"无法删除 {shortcut_path}\n错误: {str(e)}")
-            
-            self.status_label.setText(f"已删除 {deleted_count} 个无效快捷方式")
-            
-            # 如果列表为空，禁用按钮
-            if self.result_list.count() == 0:
-                self.select_all_btn.setEnabled(False)
-                self.delete_btn.setEnabled(False)
-    
-    def toggle_item_check(self, item):
-        """点击项目时切换选中状态"""
-        if item.flags() & Qt.ItemFlag.ItemIsUserCheckable:
-            # 切换选中状态
-            if item.checkState() == Qt.CheckState.Checked:
-                item.setCheckState(Qt.CheckState.Unchecked)
-            else:
-                item.setCheckState(Qt.CheckState.Checked)
+        clicked = box.clickedButton()
+        if clicked is not recycle_btn and clicked is not delete_btn:
+            return
+        
+        # 在后台线程中删除，完成后一次性更新列表
+        self.set_busy(True)
+        self.progress_bar.setVisible(True)
+        self.progress_bar.setRange(0, 100)
+        self.progress_bar.setValue(0)
+        self.status_label.setText(f"正在删除 {len(selected_paths)} 个快捷方式...")
+        
+        self.deleter = DeleteThread(selected_paths, recycle=clicked is recycle_btn)
+        self.deleter.progress_signal.connect(self.update_delete_progress)
+        self.deleter.finished.connect(self.delete_finished)
+        self.deleter.start()
+    
+    def update_delete_progress(self, info):
+        """更新删除进度"""
+        if info.total > 0:
+            self.progress_bar.setValue(int(info.done / info.total * 100))
+            self.status_label.setText(f"正在删除... {info.done}/{info.total}")
+    
+    def delete_finished(self):
+        """删除完成后一次性移除已删除的项，并汇总失败的项"""
+        deleted, failures = self.deleter.deleted, self.deleter.failures
+        action = "移到回收站" if self.deleter.recycle else "删除"
+        self.deleter = None
+        
+        self.result_model.remove_paths(deleted)
+        self.progress_bar.setVisible(False)
+        self.set_busy(False)
+        
+        self.status_label.setText(f"已{action} {len(deleted)} 个无效快捷方式"
+                                  + (f"，{len(failures)} 个失败" if failures else ""))
+        
+        if failures:
+            # 失败较多时只列出前几个
+            details = "\n".join(f"{path}\n错误: {error}" for path, error in failures[:10])
+            if len(failures) > 10:
+                details += f"\n... 共 {len(failures)} 个"
+            QMessageBox.warning(self, "删除失败", f"无法删除以下快捷方式:\n{details}")
+    
+    def set_busy(self, busy):
+        """删除过程中禁用会修改结果列表的按钮，结束后按是否正在监视恢复"""
+        has_items = self.broken_count() > 0
+        watching = self.watcher is not None
+        self.check_btn.setEnabled(not busy and bool(self.current_folder) and not watching)
+        self.select_btn.setEnabled(not busy and not watching)
+        # 监视中仍然可以停止监视
+        self.watch_btn.setEnabled(not busy and bool(self.current_folder))
+        self.select_all_btn.setEnabled(not busy and has_items)
+        self.delete_btn.setEnabled(not busy and has_items)
+    
+    def toggle_item_check(self, index):
+        """点击项目时切换选中状态，提示行不响应"""
+        self.result_model.toggle(index.row())
     
     def list_key_press_event(self, event):
         """自定义列表的按键事件，禁用Ctrl+A全选"""
@@ -671,37 +888,145 @@ class CheckInkApp(QMainWindow):
         if event.key() == Qt.Key.Key_A and event.modifiers() == Qt.KeyboardModifier.ControlModifier:
             return
         # 其他按键事件交给默认处理
-        QListWidget.keyPressEvent(self.result_list, event)
+        QListView.keyPressEvent(self.result_list, event)
 
 
 class ShortcutCheckerThread(QThread):
     """快捷方式检查线程"""
-    progress_signal = pyqtSignal(int, int)
-    result_signal = pyqtSignal(list)
+    progress_signal = pyqtSignal(object)
+    batch_signal = pyqtSignal(list)
     
-    def __init__(self, folder_path):
+    # 每批结果的最大条数和最长间隔(秒)
+    BATCH_SIZE = 200
+    BATCH_INTERVAL = 0.2
+    
+    def __init__(self, folder_path, db_path=None, trace_path=None, profile=False):
         super().__init__()
         self.folder_path = folder_path
+        self.db_path = db_path
+        # 检查结束后把时间线写入此文件
+        self.trace_path = trace_path
+        # 是否收集分阶段统计
+        self.profile = profile
+        # 界面线程通过它暂停或停止检查
+        self.cancel_token = CancelToken()
+        # 目标无法访问的快捷方式数量，这些快捷方式以灰色列出，不算无效
+        self.unreachable = 0
+        # 检查中熔断的共享根和盘符
+        self.tripped_roots = {}
+        # 本次检查的分阶段统计，未收集时为None；各类结果的数量总会统计
+        self.stats = None
+        self.verdict_counts = {}
         
     def run(self):
-        """执行检查操作"""
-        checker = ShortcutChecker()
-        invalid_shortcuts = checker.check_folder(
+        """执行检查操作，边检查边分批发送无效和目标无法访问的快捷方式"""
+        scan_db = ScanDatabase(self.db_path) if self.db_path else None
+        tracer = TraceRecorder() if self.trace_path else None
+        try:
+            self._run(ShortcutChecker(scan_db=scan_db, collect_stats=self.profile, tracer=tracer))
+        finally:
+            if scan_db is not None:
+                scan_db.close()
+            if tracer is not None:
+                try:
+                    tracer.write(self.trace_path)
+                except OSError:
+                    pass
+    
+    def _run(self, checker):
+        batch = []
+        counts = self.verdict_counts
+        last_emit = time.monotonic()
+        
+        for result in checker.iter_scan_folder(
             self.folder_path, 
             recursive=False,  # 不递归搜索子文件夹
-            progress_callback=self.progress_signal.emit
+            progress_callback=self.progress_signal.emit,
+            workers=DEFAULT_WORKERS,  # 并行检查，网络路径上可显著缩短耗时
+            cancel_token=self.cancel_token
+        ):
+            counts[result.verdict] = counts.get(result.verdict, 0) + 1
+            if result.verdict is Verdict.UNREACHABLE:
+                self.unreachable += 1
+                batch.append(result)
+            elif result.broken:
+                batch.append(result)
+            
+            now = time.monotonic()
+            if batch and (len(batch) >= self.BATCH_SIZE or now - last_emit >= self.BATCH_INTERVAL):
+                self.batch_signal.emit(batch)
+                batch = []
+                last_emit = now
+        
+        if batch:
+            self.batch_signal.emit(batch)
+        self.tripped_roots = checker.tripped_roots
+        self.stats = checker.stats
+
+
+class DeleteThread(QThread):
+    """批量删除线程"""
+    progress_signal = pyqtSignal(object)
+    
+    def __init__(self, paths, recycle=False):
+        super().__init__()
+        self.paths = paths
+        self.recycle = recycle
+        # 删除结果，线程结束后由界面线程读取
+        self.deleted = []
+        self.failures = []
+    
+    def run(self):
+        """执行删除"""
+        try:
+            self.deleted, self.failures = delete_shortcuts(
+                self.paths, self.recycle, self.progress_signal.emit)
+        except OSError as e:
+            self.failures = [(path, str(e)) for path in self.paths]
+
+
+class WatchThread(QThread):
+    """文件夹监视线程"""
+    changed_signal = pyqtSignal(str, object)
+    
+    def __init__(self, folder_path):
+        super().__init__()
+        self.watcher = FolderWatcher(
+            ShortcutChecker(),
+            [folder_path],
+            self.changed_signal.emit,
+            recursive=False  # 与检查一致，不监视子文件夹
         )
-        self.result_signal.emit(invalid_shortcuts)
+    
+    def run(self):
+        """执行监视，直到stop()被调用"""
+        self.watcher.run()
+    
+    def stop(self):
+        """停止监视"""
+        self.watcher.stop()
 
 
 if __name__ == "__main__":
-    app = QApplication(sys.argv)
+    # 打包后的程序使用进程池时需要
+    multiprocessing.freeze_support()
+    
+    # 可选的增量扫描数据库: main.py --db <路径>
+    # 可选的扫描时间线: main.py --trace <路径>
+    # 可选的分阶段统计: main.py --profile
+    arg_parser = argparse.ArgumentParser(add_help=False)
+    arg_parser.add_argument("--db")
+    arg_parser.add_argument("--trace")
+    arg_parser.add_argument("--profile", action="store_true")
+    args, qt_args = arg_parser.parse_known_args()
+    
+    app = QApplication(sys.argv[:1] + qt_args)
     
     # 应用样式
     AppStyle.apply_style(app, "light")  # 使用浅色主题
     
     # 创建并显示主窗口
-    window = CheckInkApp()
+    window = CheckInkApp(db_path=args.db, trace_path=args.trace, profile=args.profile)
     window.show()
     
     sys.exit(app.exec()) 
\ No newline at end of file
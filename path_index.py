@@ -0,0 +1,208 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+PATH可执行文件索引模块
+一次性列举PATH中各目录的可执行文件，之后的查找只需一次字典查询
+"""
+
+import os
+import threading
+
+from registry import HKEY_CURRENT_USER, HKEY_LOCAL_MACHINE, default_registry
+
+
+# 未设置PATHEXT时使用的默认值
+DEFAULT_PATHEXT = '.COM;.EXE;.BAT;.CMD;.VBS;.VBE;.JS;.JSE;.WSF;.WSH;.MSC'
+
+# App Paths注册表项
+APP_PATHS_KEY = r"Software\Microsoft\Windows\CurrentVersion\App Paths"
+
+
+class PathIndex:
+    """PATH中可执行文件的索引，按需构建，PATH或目录修改时间变化后自动失效"""
+
+    def __init__(self, registry=None, call=None):
+        """
+        参数:
+            registry: 读取App Paths使用的注册表后端，默认使用当前平台的注册表
+            call (callable): 执行文件系统调用的函数，接收(函数, 路径)，返回函数的结果；
+                检查器传入ShortcutChecker.call_guarded，使PATH中无法访问的网络目录
+                受存在性检查的时限和根熔断约束。默认直接调用
+        """
+        self.registry = registry if registry is not None else default_registry()
+        self.call = call if call is not None else _call_directly
+        self._lock = threading.Lock()
+        self._path_env = None
+        # [(目录, 修改时间, {规范化文件名: 完整路径})]
+        self._dirs = []
+        self._index = None
+        self._app_paths = None
+        # 列举目录的次数
+        self.builds = 0
+
+    def find(self, name):
+        """
+        在PATH和App Paths中查找可执行文件
+
+        参数:
+            name (str): 可执行文件名，如notepad.exe
+
+        返回:
+            str | None: 找到时返回完整路径
+        """
+        index = self._index
+        if index is None or self._path_env != os.environ.get('PATH', ''):
+            index = self._build()
+
+        key = os.path.normcase(name)
+        path = index.get(key)
+        if path is not None:
+            return path
+
+        registered = self._app_paths.get(key)
+        if registered and self._exists(registered):
+            return registered
+        return None
+
+    def validate(self):
+        """
+        检查PATH目录的修改时间，只重新列举发生变化的目录
+
+        每次扫描开始时调用一次，开销为每个PATH目录一次stat
+        """
+        with self._lock:
+            if self._index is None or self._path_env != os.environ.get('PATH', ''):
+                self._index = None
+                return
+
+            changed = False
+            for i, (directory, mtime, names) in enumerate(self._dirs):
+                current = self._mtime(directory)
+                if current != mtime:
+                    self._dirs[i] = (directory, current, self._list(directory))
+                    changed = True
+
+            if changed:
+                self._index = self._merge()
+
+    def invalidate(self):
+        """丢弃索引，下次查找时重新构建"""
+        with self._lock:
+            self._index = None
+
+    def _build(self):
+        with self._lock:
+            path_env = os.environ.get('PATH', '')
+            if self._index is not None and self._path_env == path_env:
+                return self._index
+
+            self._dirs = []
+            seen = set()
+            for directory in path_env.split(os.pathsep):
+                directory = directory.strip().strip('"')
+                key = os.path.normcase(directory)
+                if not directory or key in seen:
+                    continue
+                seen.add(key)
+                self._dirs.append((directory, self._mtime(directory), self._list(directory)))
+
+            if self._app_paths is None:
+                self._app_paths = _read_app_paths(self.registry)
+
+            self._path_env = path_env
+            self._index = self._merge()
+            return self._index
+
+    def _merge(self):
+        # 与PATH查找顺序一致，靠前的目录优先
+        index = {}
+        for _, _, names in reversed(self._dirs):
+            index.update(names)
+        return index
+
+    def _list(self, directory):
+        self.builds += 1
+        try:
+            return self.call(_list_executables, directory)
+        except OSError:
+            # 包括超时和所在的根已熔断
+            return {}
+
+    def _mtime(self, directory):
+        # 无法访问时为None，之后目录恢复访问时修改时间会不同，从而重新列举
+        try:
+            return self.call(_mtime, directory)
+        except OSError:
+            return None
+
+    def _exists(self, path):
+        try:
+            return self.call(os.path.exists, path)
+        except OSError:
+            return False
+
+
+def _call_directly(function, path):
+    return function(path)
+
+
+def _list_executables(directory):
+    """
+    列举目录中扩展名在PATHEXT中的文件
+
+    返回:
+        dict: 规范化文件名到完整路径的映射，目录无法列举时为空
+    """
+    exts = _pathext()
+    names = {}
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                name = entry.name
+                _, ext = os.path.splitext(name)
+                if ext.lower() in exts:
+                    names[os.path.normcase(name)] = entry.path
+    except OSError:
+        pass
+    return names
+
+
+def _pathext():
+    """PATHEXT中的扩展名集合(小写)"""
+    value = os.environ.get('PATHEXT') or DEFAULT_PATHEXT
+    return {ext.strip().lower() for ext in value.split(';') if ext.strip()}
+
+
+def _mtime(directory):
+    try:
+        return os.stat(directory).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _read_app_paths(registry):
+    """
+    读取App Paths中登记的程序
+
+    参数:
+        registry: 注册表后端
+
+    返回:
+        dict: 规范化文件名到程序路径的映射
+    """
+    app_paths = {}
+    for hive in (HKEY_CURRENT_USER, HKEY_LOCAL_MACHINE):
+        try:
+            names = registry.enum_subkeys(hive, APP_PATHS_KEY)
+        except OSError:
+            continue
+        for name in names:
+            try:
+                value = registry.query_default(hive, APP_PATHS_KEY + '\\' + name)
+            except OSError:
+                continue
+            if value:
+                # HKCU优先于HKLM
+                app_paths.setdefault(os.path.normcase(name),
+                                     os.path.expandvars(value.strip('"')))
+    return app_paths
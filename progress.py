@@ -0,0 +1,140 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+进度报告模块
+在源头合并进度通知，并附带当前阶段、速度和预计剩余时间
+"""
+
+import time
+
+
+# 扫描阶段
+PHASE_DISCOVERY = 'discovery'  # 仍在查找快捷方式，检查同时进行，总数未知
+PHASE_CHECK = 'check'          # 查找已结束，正在解析和检查剩余的快捷方式
+PHASE_DONE = 'done'            # 全部完成
+PHASE_CANCELLED = 'cancelled'  # 已取消，只完成了一部分
+PHASE_DELETE = 'delete'        # 正在删除选中的快捷方式
+
+# 默认两次进度通知之间的最短间隔(秒)
+DEFAULT_PROGRESS_INTERVAL = 0.1
+
+# 速度的平滑系数，越大越偏向最近的速度
+_RATE_SMOOTHING = 0.3
+
+
+class ProgressInfo:
+    """一次进度通知"""
+
+    __slots__ = ('phase', 'done', 'total', 'elapsed', 'rate', 'eta')
+
+    def __init__(self, phase, done, total, elapsed, rate, eta):
+        """
+        参数:
+            phase (str): 当前阶段，PHASE_DISCOVERY、PHASE_CHECK、PHASE_DONE、PHASE_CANCELLED
+                或PHASE_DELETE
+            done (int): 已完成数(查找阶段的进程池模式下为已找到数)
+            total (int): 总数，未知时为0
+            elapsed (float): 已用时间(秒)
+            rate (float): 平滑后的速度(个/秒)
+            eta (float | None): 预计剩余时间(秒)，总数未知时为None
+        """
+        self.phase = phase
+        self.done = done
+        self.total = total
+        self.elapsed = elapsed
+        self.rate = rate
+        self.eta = eta
+
+    def __repr__(self):
+        return (f"ProgressInfo(phase={self.phase!r}, done={self.done}, total={self.total}, "
+                f"rate={self.rate:.1f}, eta={self.eta})")
+
+
+class ProgressThrottle:
+    """
+    进度通知节流器
+
+    每次完成都可以调用update()，但只有距上次通知超过interval或阶段发生变化时
+    才真正调用回调，使跨线程的进度信号数量与快捷方式总数无关
+    """
+
+    def __init__(self, callback, interval=DEFAULT_PROGRESS_INTERVAL):
+        """
+        参数:
+            callback (callable): 进度回调函数，接收ProgressInfo，为None时不通知
+            interval (float): 两次通知之间的最短间隔(秒)
+        """
+        self.callback = callback
+        self.interval = interval
+        self.start = time.monotonic()
+        self.rate = 0.0
+        self._last_time = self.start
+        self._last_done = 0
+        self._last_phase = None
+
+    def update(self, done, total, phase):
+        """
+        报告进度，必要时通知回调
+
+        参数:
+            done (int): 已完成数
+            total (int): 总数，未知时为0
+            phase (str): 当前阶段
+        """
+        if self.callback is None:
+            return
+        now = time.monotonic()
+        if phase == self._last_phase and now - self._last_time < self.interval:
+            return
+        self._emit(now, done, total, phase)
+
+    def finish(self, done, total, phase=PHASE_DONE):
+        """无论距上次通知多久，都发出最终的通知"""
+        if self.callback is not None:
+            self._emit(time.monotonic(), done, total, phase)
+
+    def _emit(self, now, done, total, phase):
+        span = now - self._last_time
+        if done < self._last_done:
+            # 新阶段重新计数(如进程池模式从查找转入检查)，速度重新计算
+            self.rate = 0.0
+        elif span > 0:
+            current = (done - self._last_done) / span
+            # 第一次取整体平均速度，之后做指数平滑
+            if self._last_phase is None or self.rate == 0.0:
+                self.rate = current
+            else:
+                self.rate += _RATE_SMOOTHING * (current - self.rate)
+
+        eta = None
+        if phase == PHASE_DONE:
+            eta = 0.0
+        elif phase == PHASE_CANCELLED:
+            eta = None
+        elif total > 0 and self.rate > 0:
+            eta = max(total - done, 0) / self.rate
+
+        self._last_time = now
+        self._last_done = done
+        self._last_phase = phase
+        self.callback(ProgressInfo(phase, done, total, now - self.start, self.rate, eta))
+
+
+def format_duration(seconds):
+    """
+    把秒数格式化为简短的中文时长
+
+    参数:
+        seconds (float): 秒数
+
+    返回:
+        str: 如"45秒"、"3分05秒"、"1小时02分"
+    """
+    seconds = int(round(seconds))
+    if seconds < 60:
+        return f"{seconds}秒"
+    minutes, seconds = divmod(seconds, 60)
+    if minutes < 60:
+        return f"{minutes}分{seconds:02d}秒"
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}小时{minutes:02d}分"
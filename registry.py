@@ -0,0 +1,133 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+注册表访问模块
+提供可替换的注册表后端，使依赖注册表的检查逻辑可以在非Windows平台上测试
+"""
+
+# 注册表根键
+HKEY_CURRENT_USER = 'HKCU'
+HKEY_LOCAL_MACHINE = 'HKLM'
+
+
+class WinRegistry:
+    """基于winreg的Windows注册表后端"""
+
+    def __init__(self):
+        import winreg
+        self._winreg = winreg
+        self._hives = {
+            HKEY_CURRENT_USER: winreg.HKEY_CURRENT_USER,
+            HKEY_LOCAL_MACHINE: winreg.HKEY_LOCAL_MACHINE,
+        }
+
+    def enum_subkeys(self, hive, key_path):
+        """
+        列举子项名称
+
+        参数:
+            hive (str): 根键，HKEY_CURRENT_USER或HKEY_LOCAL_MACHINE
+            key_path (str): 注册表项路径
+
+        返回:
+            list: 子项名称列表
+
+        异常:
+            OSError: 注册表项不存在或无法打开
+        """
+        winreg = self._winreg
+        names = []
+        with winreg.OpenKey(self._hives[hive], key_path) as key:
+            i = 0
+            while True:
+                try:
+                    names.append(winreg.EnumKey(key, i))
+                except OSError:
+                    break
+                i += 1
+        return names
+
+    def query_default(self, hive, key_path):
+        """
+        读取注册表项的默认值
+
+        参数:
+            hive (str): 根键
+            key_path (str): 注册表项路径
+
+        返回:
+            str: 默认值
+
+        异常:
+            OSError: 注册表项不存在或无法打开
+        """
+        return self._winreg.QueryValue(self._hives[hive], key_path)
+
+
+class FakeRegistry:
+    """内存中的注册表后端，用于测试和基准测试"""
+
+    def __init__(self, keys=None):
+        """
+        参数:
+            keys (dict): {(根键, 注册表项路径): 默认值}，路径中的子项会自动创建
+        """
+        self._values = {}
+        self._children = {}
+        # 调用次数，用于观察缓存效果
+        self.calls = 0
+        for (hive, key_path), value in (keys or {}).items():
+            self.set_key(hive, key_path, value)
+
+    def set_key(self, hive, key_path, value=''):
+        """创建注册表项并设置默认值"""
+        parts = key_path.split('\\')
+        for depth in range(1, len(parts) + 1):
+            path = _normalize('\\'.join(parts[:depth]))
+            self._children.setdefault((hive, path), {})
+            if depth > 1:
+                parent = _normalize('\\'.join(parts[:depth - 1]))
+                self._children[(hive, parent)].setdefault(parts[depth - 1].lower(), parts[depth - 1])
+        self._values[(hive, _normalize(key_path))] = value
+
+    def enum_subkeys(self, hive, key_path):
+        self.calls += 1
+        children = self._children.get((hive, _normalize(key_path)))
+        if children is None:
+            raise FileNotFoundError(key_path)
+        return list(children.values())
+
+    def query_default(self, hive, key_path):
+        self.calls += 1
+        key = (hive, _normalize(key_path))
+        if key not in self._children:
+            raise FileNotFoundError(key_path)
+        return self._values.get(key, '')
+
+
+class NullRegistry:
+    """没有注册表的平台使用的空后端"""
+
+    def enum_subkeys(self, hive, key_path):
+        raise FileNotFoundError(key_path)
+
+    def query_default(self, hive, key_path):
+        raise FileNotFoundError(key_path)
+
+
+def default_registry():
+    """
+    获取当前平台的注册表后端
+
+    返回:
+        WinRegistry | NullRegistry: Windows上为WinRegistry，其他平台为NullRegistry
+    """
+    try:
+        return WinRegistry()
+    except ImportError:
+        return NullRegistry()
+
+
+def _normalize(key_path):
+    # 注册表路径不区分大小写
+    return key_path.strip('\\').lower()
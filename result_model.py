@@ -0,0 +1,241 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+结果列表模型模块
+以紧凑的数组保存检查结果，供QListView按需绘制可见的行
+"""
+
+import os
+from itertools import compress
+
+from PyQt6.QtCore import Qt, QAbstractListModel, QModelIndex
+from PyQt6.QtGui import QColor
+
+from result_store import ResultStore
+from scan_result import Verdict
+
+
+class ResultListModel(QAbstractListModel):
+    """
+    无效快捷方式列表模型
+
+    结果保存在ResultStore中，勾选状态保存在bytearray中，不为每一行创建对象，
+    路径只在绘制可见的行时拼接；全选、追加和删除都只发出一次模型信号。
+    追加时附带的检查记录(ScanResult)用于在提示中显示失效原因和目标；
+    目标无法访问的行以灰色显示，不能勾选，也不会被删除
+    """
+
+    # 提示行(如"没有发现无效的快捷方式")的文字颜色
+    PLACEHOLDER_COLOR = "#4a86e8"
+
+    # 目标无法访问的行的文字颜色
+    UNREACHABLE_COLOR = "#999999"
+
+    # 不超过这么多相邻的行时逐行移除，保留视图的滚动位置和选中状态
+    SMALL_REMOVAL = 64
+
+    def __init__(self, icon_for=None, parent=None):
+        """
+        参数:
+            icon_for (callable): 根据扩展名(小写，带点)返回QIcon的函数，没有图标时返回None
+            parent (QObject): 父对象
+        """
+        super().__init__(parent)
+        self.icon_for = icon_for
+        self._store = ResultStore()
+        self._checked = bytearray()
+        self._placeholder = None
+
+    # ---- Qt模型接口 ----
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        if not self._store and self._placeholder:
+            return 1
+        return len(self._store)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row = index.row()
+
+        if not self._store:
+            # 提示行
+            if role == Qt.ItemDataRole.DisplayRole:
+                return self._placeholder
+            if role == Qt.ItemDataRole.TextAlignmentRole:
+                return Qt.AlignmentFlag.AlignCenter
+            if role == Qt.ItemDataRole.ForegroundRole:
+                return QColor(self.PLACEHOLDER_COLOR)
+            return None
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self._store.path(row)
+        if role == Qt.ItemDataRole.CheckStateRole:
+            if self._is_unreachable(row):
+                return None
+            return Qt.CheckState.Checked if self._checked[row] else Qt.CheckState.Unchecked
+        if role == Qt.ItemDataRole.ForegroundRole and self._is_unreachable(row):
+            return QColor(self.UNREACHABLE_COLOR)
+        if role == Qt.ItemDataRole.DecorationRole and self.icon_for is not None:
+            return self.icon_for(os.path.splitext(self._store.path(row))[1].lower())
+        if role == Qt.ItemDataRole.ToolTipRole:
+            result = self._store.result(row)
+            if result is not None:
+                return f"{result.verdict.label}\n目标: {result.target or '无'}"
+        return None
+
+    def flags(self, index):
+        if not index.isValid() or not self._store:
+            return Qt.ItemFlag.ItemIsEnabled
+        # 不设置ItemIsUserCheckable，勾选状态只由点击整行切换，避免点中复选框时切换两次
+        return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        if role != Qt.ItemDataRole.CheckStateRole or not index.isValid() or not self._store:
+            return False
+        if self._is_unreachable(index.row()):
+            return False
+        self._checked[index.row()] = Qt.CheckState(value) == Qt.CheckState.Checked
+        self.dataChanged.emit(index, index, [Qt.ItemDataRole.CheckStateRole])
+        return True
+
+    # ---- 批量操作 ----
+
+    def append(self, paths, details=None):
+        """
+        追加一批结果，只插入一次行
+
+        参数:
+            paths (list): 快捷方式路径列表
+            details (list): 可选的与paths对应的检查记录(ScanResult)
+        """
+        if not paths:
+            return
+        if not self._store and self._placeholder:
+            self.set_placeholder(None)
+
+        start = len(self._store)
+        self.beginInsertRows(QModelIndex(), start, start + len(paths) - 1)
+        if details is not None:
+            self._store.extend(details)
+        else:
+            for path in paths:
+                self._store.append(path)
+        self._checked.extend(bytes(len(paths)))
+        self.endInsertRows()
+
+    def clear(self):
+        """清空所有结果和提示行"""
+        self.beginResetModel()
+        self._store = ResultStore()
+        self._checked = bytearray()
+        self._placeholder = None
+        self.endResetModel()
+
+    def set_placeholder(self, text):
+        """
+        设置没有结果时显示的提示行
+
+        参数:
+            text (str | None): 提示文字，为None时不显示
+        """
+        self.beginResetModel()
+        self._placeholder = text
+        self.endResetModel()
+
+    def toggle(self, row):
+        """切换某一行的勾选状态，目标无法访问的行不能勾选"""
+        if 0 <= row < len(self._store) and not self._is_unreachable(row):
+            index = self.index(row)
+            self._checked[row] = not self._checked[row]
+            self.dataChanged.emit(index, index, [Qt.ItemDataRole.CheckStateRole])
+
+    def all_checked(self):
+        """是否所有可以勾选的结果都已勾选"""
+        checkable = len(self._store) - self.unreachable_count()
+        return checkable > 0 and self._checked.count(1) == checkable
+
+    def set_all_checked(self, checked):
+        """
+        勾选或取消勾选所有结果，只发出一次dataChanged
+
+        参数:
+            checked (bool): 是否勾选
+        """
+        if not self._store:
+            return
+        if checked:
+            self._checked = bytearray(b'\x01' * len(self._store))
+            for row in self._store.rows(Verdict.UNREACHABLE):
+                self._checked[row] = 0
+        else:
+            self._checked = bytearray(len(self._store))
+        self.dataChanged.emit(self.index(0), self.index(len(self._store) - 1),
+                              [Qt.ItemDataRole.CheckStateRole])
+
+    def checked_paths(self):
+        """
+        返回:
+            list: 已勾选的快捷方式路径
+        """
+        return list(compress(self._store, self._checked))
+
+    def remove_paths(self, paths):
+        """
+        移除一批结果；单行或少量相邻的行逐行移除，否则重置模型
+
+        参数:
+            paths (iterable): 要移除的快捷方式路径
+        """
+        removed = sorted(self._store.find_all(paths))
+        if not removed:
+            return
+        first, last = removed[0], removed[-1]
+        if last - first + 1 == len(removed) <= self.SMALL_REMOVAL:
+            self.beginRemoveRows(QModelIndex(), first, last)
+            for row in reversed(removed):
+                self._store.remove(row)
+            del self._checked[first:last + 1]
+            self.endRemoveRows()
+            return
+
+        keep = bytearray(b'\x01' * len(self._store))
+        for row in removed:
+            keep[row] = 0
+        self.beginResetModel()
+        self._store.retain(keep)
+        self._checked = bytearray(compress(self._checked, keep))
+        self.endResetModel()
+
+    def unreachable_count(self):
+        """
+        返回:
+            int: 目标无法访问的行数
+        """
+        return self._store.count(Verdict.UNREACHABLE)
+
+    def is_unreachable(self, path):
+        """
+        返回:
+            bool: 该路径是否作为目标无法访问的行列出
+        """
+        row = self._store.find(path)
+        return row is not None and self._is_unreachable(row)
+
+    def _is_unreachable(self, row):
+        return self._store.verdict(row) is Verdict.UNREACHABLE
+
+    def paths(self):
+        """
+        返回:
+            list: 所有结果路径
+        """
+        return list(self._store)
+
+    def __contains__(self, path):
+        return path in self._store
+
+    def __len__(self):
+        return len(self._store)
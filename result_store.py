@@ -0,0 +1,405 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+紧凑结果存储模块
+以前缀表和数组保存大量检查结果，完整路径只在访问时拼接，
+适合百万级快捷方式的扫描结果常驻内存
+"""
+
+import os
+from array import array
+from bisect import bisect_left
+
+from scan_result import ScanResult, Verdict
+
+
+# 检查结果与编码的对应关系
+_VERDICTS = tuple(Verdict)
+_CODES = {verdict: code for code, verdict in enumerate(_VERDICTS)}
+
+# 没有记录检查结果的行
+_NO_VERDICT = 0xFF
+
+# 已删除、等待压缩的槽位
+_DELETED = 0xFE
+
+# 没有目标的行的前缀编号
+_NO_TARGET = 0xFFFFFFFF
+
+# 路径索引中的空位和已删除的位置，其余位置保存槽位号加一
+_EMPTY = 0
+_DUMMY = -1
+
+# 路径索引的初始大小，须为2的幂
+_MIN_TABLE_SIZE = 8
+
+
+def _split(path):
+    """把路径拆为(目录前缀, 名称)，前缀包含末尾的分隔符，两者相接即为原路径"""
+    cut = max(path.rfind('/'), path.rfind('\\')) + 1
+    return path[:cut], path[cut:]
+
+
+def _encode(text):
+    return text.encode('utf-8', 'surrogatepass')
+
+
+def _decode(data):
+    return data.decode('utf-8', 'surrogatepass')
+
+
+def _hash(path):
+    return hash(path) & 0xFFFFFFFF
+
+
+class ResultStore:
+    """
+    紧凑的检查结果存储
+
+    快捷方式和目标的目录前缀在前缀表中只保存一次，每行只记录前缀编号和
+    UTF-8编码的名称；检查结果以一个字节的编码保存，用时保存为单精度浮点数。
+    按路径查找使用开放寻址的数组哈希表，只保存槽位号和32位哈希值，不保存路径字符串。
+
+    各列按追加顺序(槽位)保存，删除单行时只把槽位标记为已删除并从行号表中移除，
+    已删除的槽位超过现存行数时再一次性压缩
+    """
+
+    def __init__(self, results=None):
+        """
+        参数:
+            results (iterable): 可选的初始检查记录(ScanResult)
+        """
+        self.clear()
+        if results is not None:
+            self.extend(results)
+
+    def _intern(self, prefix):
+        """返回前缀的编号，首次出现时加入前缀表"""
+        prefix_id = self._prefix_ids.get(prefix)
+        if prefix_id is None:
+            prefix_id = self._prefix_ids[prefix] = len(self._prefixes)
+            self._prefixes.append(prefix)
+        return prefix_id
+
+    def append(self, path, verdict=None, target=None, elapsed=0.0):
+        """
+        追加一行
+
+        参数:
+            path (str): 快捷方式路径；路径重复时按路径只能找到最先追加的一行
+            verdict (Verdict | None): 检查结果，None表示只记录路径
+            target (str | None): 解析出的目标
+            elapsed (float): 检查用时(秒)
+        """
+        slot = len(self._verdicts)
+        prefix, name = _split(path)
+        self._dirs.append(self._intern(prefix))
+        self._names += _encode(name)
+        self._name_ends.append(len(self._names))
+        self._verdicts.append(_NO_VERDICT if verdict is None else _CODES[verdict])
+
+        if target is None:
+            self._target_dirs.append(_NO_TARGET)
+        else:
+            prefix, name = _split(target)
+            self._target_dirs.append(self._intern(prefix))
+            self._target_names += _encode(name)
+        self._target_ends.append(len(self._target_names))
+        self._elapsed.append(elapsed)
+
+        h = _hash(path)
+        self._hashes.append(h)
+        if self._order is not None:
+            self._order.append(slot)
+        position, found = self._lookup(path, h)
+        if found is None:
+            self._insert(position, slot)
+
+    def extend(self, results):
+        """
+        追加一批检查记录
+
+        参数:
+            results (iterable): ScanResult，可以是iter_scan_folder返回的迭代器，
+                结果边检查边写入，不需要先保存完整列表
+        """
+        for result in results:
+            self.append(result.path, result.verdict, result.target, result.elapsed)
+
+    # ---- 路径索引 ----
+
+    def _lookup(self, path, h):
+        """
+        在路径索引中查找
+
+        返回:
+            tuple: (位置, 槽位)；找不到时槽位为None，位置为可以插入的位置
+        """
+        table = self._table
+        mask = len(table) - 1
+        hashes = self._hashes
+        i = h & mask
+        perturb = h
+        free = None
+        while True:
+            entry = table[i]
+            if entry == _EMPTY:
+                return (i if free is None else free), None
+            if entry == _DUMMY:
+                if free is None:
+                    free = i
+            elif hashes[entry - 1] == h and self._slot_path(entry - 1) == path:
+                return i, entry - 1
+            perturb >>= 5
+            i = (i * 5 + perturb + 1) & mask
+
+    def _insert(self, position, slot):
+        """把槽位写入索引中的位置，填充过多时扩大索引"""
+        if self._table[position] == _EMPTY:
+            self._fill += 1
+        self._table[position] = slot + 1
+        if self._fill * 3 >= len(self._table) * 2:
+            self._rebuild_index()
+
+    def _rebuild_index(self):
+        """按现存的槽位重建路径索引，同时清除已删除的位置"""
+        live = len(self) + 1
+        size = _MIN_TABLE_SIZE
+        while size < live * 2:
+            size <<= 1
+        table = array('i', bytes(4 * size))
+        mask = size - 1
+        hashes = self._hashes
+        verdicts = self._verdicts
+        for slot in range(len(verdicts)):
+            if verdicts[slot] == _DELETED:
+                continue
+            h = hashes[slot]
+            i = h & mask
+            perturb = h
+            while table[i] != _EMPTY:
+                perturb >>= 5
+                i = (i * 5 + perturb + 1) & mask
+            table[i] = slot + 1
+        self._table = table
+        self._fill = len(self)
+
+    def _slot(self, row):
+        """行号对应的槽位"""
+        return row if self._order is None else self._order[row]
+
+    def _slot_path(self, slot):
+        start = self._name_ends[slot - 1] if slot else 0
+        return self._prefixes[self._dirs[slot]] + _decode(self._names[start:self._name_ends[slot]])
+
+    # ---- 按行访问 ----
+
+    def path(self, row):
+        """
+        返回:
+            str: 第row行的快捷方式路径
+        """
+        return self._slot_path(self._slot(row))
+
+    def target(self, row):
+        """
+        返回:
+            str | None: 第row行的目标
+        """
+        slot = self._slot(row)
+        prefix_id = self._target_dirs[slot]
+        if prefix_id == _NO_TARGET:
+            return None
+        start = self._target_ends[slot - 1] if slot else 0
+        return self._prefixes[prefix_id] + _decode(self._target_names[start:self._target_ends[slot]])
+
+    def verdict(self, row):
+        """
+        返回:
+            Verdict | None: 第row行的检查结果，只记录了路径时为None
+        """
+        code = self._verdicts[self._slot(row)]
+        return None if code == _NO_VERDICT else _VERDICTS[code]
+
+    def result(self, row):
+        """
+        返回:
+            ScanResult | None: 第row行的检查记录，只记录了路径时为None
+        """
+        verdict = self.verdict(row)
+        if verdict is None:
+            return None
+        path = self.path(row)
+        kind = os.path.splitext(path)[1].lower().lstrip('.')
+        return ScanResult(path, kind, self.target(row), verdict, self._elapsed[self._slot(row)])
+
+    # ---- 查询 ----
+
+    def find(self, path):
+        """
+        按路径查找行号，平均只比较一两个槽位
+
+        参数:
+            path (str): 快捷方式路径，须与追加时完全一致
+
+        返回:
+            int | None: 行号，不存在时为None
+        """
+        _, slot = self._lookup(path, _hash(path))
+        if slot is None or self._order is None:
+            return slot
+        # 行号表按槽位递增，二分查找即可得到行号
+        return bisect_left(self._order, slot)
+
+    def find_all(self, paths):
+        """
+        批量按路径查找行号
+
+        参数:
+            paths (iterable): 快捷方式路径
+
+        返回:
+            set: 找到的行号
+        """
+        found = set()
+        for path in paths:
+            row = self.find(path)
+            if row is not None:
+                found.add(row)
+        return found
+
+    def rows(self, *verdicts):
+        """
+        按检查结果筛选行号
+
+        参数:
+            verdicts (Verdict): 要保留的检查结果，不指定时返回所有有检查结果的行
+
+        返回:
+            list: 行号列表
+        """
+        if verdicts:
+            codes = {_CODES[verdict] for verdict in verdicts}
+        else:
+            codes = set(range(len(_VERDICTS)))
+        if self._order is None:
+            return [row for row, code in enumerate(self._verdicts) if code in codes]
+        verdict_codes = self._verdicts
+        return [row for row, slot in enumerate(self._order) if verdict_codes[slot] in codes]
+
+    def results(self, *verdicts):
+        """
+        按检查结果筛选检查记录
+
+        参数:
+            verdicts (Verdict): 要保留的检查结果，不指定时返回所有检查记录
+
+        返回:
+            generator: 逐个生成的ScanResult
+        """
+        return (self.result(row) for row in self.rows(*verdicts))
+
+    def broken(self):
+        """
+        返回:
+            generator: 所有无效快捷方式的检查记录
+        """
+        return self.results(*(verdict for verdict in _VERDICTS if verdict.broken))
+
+    def count(self, verdict):
+        """
+        返回:
+            int: 检查结果为verdict的行数
+        """
+        return self._verdicts.count(_CODES[verdict])
+
+    # ---- 修改 ----
+
+    def remove(self, row):
+        """
+        删除一行，之后的行号减一；只移动行号表，不移动各列的数据
+
+        参数:
+            row (int): 行号
+        """
+        slot = self._slot(row)
+        if self._order is None:
+            self._order = array('I', range(len(self._verdicts)))
+        del self._order[row]
+
+        position, found = self._lookup(self._slot_path(slot), self._hashes[slot])
+        if found == slot:
+            self._table[position] = _DUMMY
+        self._verdicts[slot] = _DELETED
+
+        if len(self._verdicts) - len(self._order) > len(self._order):
+            self.retain(b'\x01' * len(self._order))
+
+    def retain(self, keep):
+        """
+        只保留部分行，其余行删除，行号随之重排；同时清除已删除的槽位，前缀表保持不变
+
+        参数:
+            keep (iterable): 与各行对应的布尔值，为真的行保留
+        """
+        names, name_ends = bytearray(), array('Q')
+        target_names, target_ends = bytearray(), array('Q')
+        dirs, target_dirs = array('I'), array('I')
+        verdicts, elapsed, hashes = bytearray(), array('f'), array('I')
+        for row, flag in enumerate(keep):
+            if not flag:
+                continue
+            slot = self._slot(row)
+            start = self._name_ends[slot - 1] if slot else 0
+            names += self._names[start:self._name_ends[slot]]
+            name_ends.append(len(names))
+            start = self._target_ends[slot - 1] if slot else 0
+            target_names += self._target_names[start:self._target_ends[slot]]
+            target_ends.append(len(target_names))
+            dirs.append(self._dirs[slot])
+            target_dirs.append(self._target_dirs[slot])
+            verdicts.append(self._verdicts[slot])
+            elapsed.append(self._elapsed[slot])
+            hashes.append(self._hashes[slot])
+
+        self._names, self._name_ends = names, name_ends
+        self._target_names, self._target_ends = target_names, target_ends
+        self._dirs, self._target_dirs = dirs, target_dirs
+        self._verdicts, self._elapsed = verdicts, elapsed
+        self._hashes = hashes
+        self._order = None
+        self._rebuild_index()
+
+    def clear(self):
+        """删除所有行和前缀"""
+        self._prefixes = []
+        self._prefix_ids = {}
+        self._dirs = array('I')
+        self._names = bytearray()
+        self._name_ends = array('Q')
+        self._verdicts = bytearray()
+        self._target_dirs = array('I')
+        self._target_names = bytearray()
+        self._target_ends = array('Q')
+        self._elapsed = array('f')
+        # 路径索引: 每个槽位的哈希值，以及保存槽位号加一的开放寻址表
+        self._hashes = array('I')
+        self._table = array('i', bytes(4 * _MIN_TABLE_SIZE))
+        self._fill = 0
+        # 行号到槽位的映射，没有删除过单行时行号即槽位，为None
+        self._order = None
+
+    def __len__(self):
+        if self._order is None:
+            return len(self._verdicts)
+        return len(self._order)
+
+    def __iter__(self):
+        """按顺序生成所有快捷方式路径"""
+        return (self.path(row) for row in range(len(self)))
+
+    def __contains__(self, path):
+        return self._lookup(path, _hash(path))[1] is not None
+
+    def __repr__(self):
+        return f"ResultStore(rows={len(self)}, prefixes={len(self._prefixes)})"
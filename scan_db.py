@@ -0,0 +1,241 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+增量扫描数据库模块
+在SQLite中保存快捷方式的修改时间、解析出的目标和上次的检查结果，
+重复扫描时只重新解析新增或修改过的快捷方式
+"""
+
+import os
+import time
+import sqlite3
+import threading
+
+
+# 默认检查结果的有效期(秒)，0表示每次扫描都重新检查目标是否存在
+DEFAULT_VERDICT_TTL = 0.0
+
+# 检查结果攒够这么多条再批量写入
+_FLUSH_SIZE = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS directories (
+    path TEXT PRIMARY KEY,
+    parent TEXT,
+    mtime_ns INTEGER
+);
+CREATE INDEX IF NOT EXISTS directories_parent ON directories(parent);
+CREATE TABLE IF NOT EXISTS shortcuts (
+    path TEXT PRIMARY KEY,
+    dir TEXT NOT NULL,
+    mtime_ns INTEGER,
+    size INTEGER,
+    target TEXT,
+    valid INTEGER,
+    checked_at REAL
+);
+CREATE INDEX IF NOT EXISTS shortcuts_dir ON shortcuts(dir);
+"""
+
+
+class ScanDatabase:
+    """
+    增量扫描数据库
+
+    每个目录都重新列举，按目录项的修改时间和大小判断快捷方式是否新增或修改过，
+    未修改的沿用上次解析出的目标；Windows上列举目录时已得到这些信息，不需要逐个stat。
+    原地修改快捷方式内容不会改变目录的修改时间，因此不能只比较目录
+
+    目标被删除或恢复不会改变快捷方式的修改时间，检查结果在verdict_ttl内直接沿用，
+    过期后重新检查目标是否存在；默认有效期为0，每次都重新检查
+
+    关闭后所有读写都变为空操作: 取消扫描后被放弃的查找线程可能在关闭之后才从
+    缓慢的文件系统调用中返回
+    """
+
+    def __init__(self, path, verdict_ttl=DEFAULT_VERDICT_TTL):
+        """
+        参数:
+            path (str): 数据库文件路径，':memory:'表示只在内存中保存
+            verdict_ttl (float): 检查结果的有效期(秒)，0表示每次都重新检查目标
+        """
+        self.path = path
+        self.verdict_ttl = verdict_ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+        self._pending = []
+        self._closed = False
+        # 最近一次扫描中没有任何变化的目录数和列举的目录数
+        self.skipped_dirs = 0
+        self.listed_dirs = 0
+
+    def iter_items(self, folder_path, recursive, list_directory):
+        """
+        逐个产出待检查的快捷方式
+
+        参数:
+            folder_path (str): 要检查的文件夹路径
+            recursive (bool): 是否递归检查子文件夹
+            list_directory (callable): 列举目录的函数，接收目录路径，
+                返回(快捷方式目录项列表, 子目录路径列表)，失败时抛出OSError
+
+        返回:
+            generator: (快捷方式路径, 缓存)元组，缓存为(目标, 是否有效, 检查时间)，
+                需要重新解析时为None
+        """
+        self.skipped_dirs = 0
+        self.listed_dirs = 0
+        pending = [(folder_path, None)]
+
+        while pending:
+            directory, parent = pending.pop()
+            try:
+                mtime = os.stat(directory).st_mtime_ns
+            except OSError:
+                self._forget_directory(directory)
+                continue
+
+            try:
+                entries, subdirs = list_directory(directory)
+            except OSError:
+                continue
+            self.listed_dirs += 1
+            yield from self._reconcile(directory, parent, mtime, entries, subdirs)
+
+            if recursive:
+                pending.extend((subdir, directory) for subdir in reversed(subdirs))
+
+    def _reconcile(self, directory, parent, mtime, entries, subdirs):
+        """用新的列举结果更新库中的目录记录，没有任何变化时不写入"""
+        items = []
+        with self._lock:
+            if self._closed:
+                return items
+            conn = self._conn
+            dir_row = conn.execute(
+                "SELECT mtime_ns FROM directories WHERE path = ?", (directory,)).fetchone()
+            known = {
+                path: (mtime_ns, size, target, valid, checked_at)
+                for path, mtime_ns, size, target, valid, checked_at in conn.execute(
+                    "SELECT path, mtime_ns, size, target, valid, checked_at "
+                    "FROM shortcuts WHERE dir = ?", (directory,))
+            }
+
+            changed = []
+            for entry in entries:
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    items.append((entry.path, None))
+                    continue
+                row = known.pop(entry.path, None)
+                if row is not None and row[0] == stat.st_mtime_ns and row[1] == stat.st_size:
+                    items.append((entry.path, row[2:]))
+                else:
+                    # 新增或修改过的快捷方式需要重新解析
+                    changed.append((entry.path, directory, stat.st_mtime_ns, stat.st_size))
+                    items.append((entry.path, None))
+
+            if not changed and not known and dir_row is not None and dir_row[0] == mtime:
+                # 目录的增删和快捷方式内容都没有变化，库中的子目录列表仍然有效
+                self.skipped_dirs += 1
+                return items
+
+            conn.executemany(
+                "INSERT OR REPLACE INTO shortcuts (path, dir, mtime_ns, size) VALUES (?, ?, ?, ?)",
+                changed)
+            if known:
+                conn.executemany("DELETE FROM shortcuts WHERE path = ?", [(path,) for path in known])
+
+            # 更新子目录列表，已删除的子目录连同其下的记录一并移除
+            old_subdirs = {r[0] for r in conn.execute(
+                "SELECT path FROM directories WHERE parent = ?", (directory,))}
+            for subdir in old_subdirs.difference(subdirs):
+                self._forget_directory_locked(subdir)
+            conn.executemany(
+                "INSERT OR IGNORE INTO directories (path, parent, mtime_ns) VALUES (?, ?, NULL)",
+                [(subdir, directory) for subdir in subdirs])
+
+            conn.execute(
+                "INSERT INTO directories (path, parent, mtime_ns) VALUES (?, ?, ?) "
+                "ON CONFLICT(path) DO UPDATE SET mtime_ns = excluded.mtime_ns",
+                (directory, parent, mtime))
+            conn.commit()
+
+        return items
+
+    def is_fresh(self, checked_at):
+        """
+        检查结果是否仍在有效期内
+
+        参数:
+            checked_at (float): 检查时间戳，没有保存检查结果时为None
+
+        返回:
+            bool: 是否可以直接沿用，有效期为0时总是False
+        """
+        return (self.verdict_ttl > 0 and checked_at is not None
+                and time.time() - checked_at < self.verdict_ttl)
+
+    def record(self, shortcut_path, target, valid):
+        """
+        记录快捷方式的解析结果和检查结果，攒够一批后写入
+
+        参数:
+            shortcut_path (str): 快捷方式路径
+            target (str | None): 解析出的目标，解析失败时为None
+            valid (bool | None): 检查结果，None表示没有可保存的结果(如目标暂时无法访问)，
+                下次扫描时重新检查
+        """
+        checked_at = None if valid is None else time.time()
+        with self._lock:
+            if self._closed:
+                return
+            self._pending.append((target, None if valid is None else int(valid), checked_at,
+                                  shortcut_path))
+            if len(self._pending) >= _FLUSH_SIZE:
+                self._flush_locked()
+
+    def flush(self):
+        """写入所有未保存的检查结果"""
+        with self._lock:
+            if not self._closed:
+                self._flush_locked()
+
+    def close(self):
+        """保存并关闭数据库，重复关闭时不做任何事"""
+        with self._lock:
+            if self._closed:
+                return
+            self._flush_locked()
+            self._closed = True
+            self._conn.close()
+
+    def _flush_locked(self):
+        if self._pending:
+            self._conn.executemany(
+                "UPDATE shortcuts SET target = ?, valid = ?, checked_at = ? WHERE path = ?",
+                self._pending)
+            self._pending = []
+        self._conn.commit()
+
+    def _forget_directory(self, directory):
+        with self._lock:
+            if self._closed:
+                return
+            self._forget_directory_locked(directory)
+            self._conn.commit()
+
+    def _forget_directory_locked(self, directory):
+        # 删除目录及其所有子目录下的记录
+        pattern = directory.rstrip('\\/').replace('!', '!!').replace('%', '!%').replace('_', '!_')
+        pattern += os.sep + '%'
+        conn = self._conn
+        conn.execute("DELETE FROM shortcuts WHERE dir = ? OR dir LIKE ? ESCAPE '!'",
+                     (directory, pattern))
+        conn.execute("DELETE FROM directories WHERE path = ? OR path LIKE ? ESCAPE '!'",
+                     (directory, pattern))
@@ -0,0 +1,291 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+进程池扫描模块
+将快捷方式列表分块交给多个工作进程检查，并监控卡死或崩溃的进程
+"""
+
+import os
+import time
+import multiprocessing
+from collections import deque
+from multiprocessing.connection import wait
+
+from scan_result import ScanResult, Verdict
+
+
+# 默认每块包含的快捷方式数量
+DEFAULT_CHUNK_SIZE = 64
+
+# 默认单个快捷方式的最长检查时间(秒)，超时的工作进程会被终止并重启；
+# 存在性检查有时限时至少为hang_timeout_for()的结果
+DEFAULT_HANG_TIMEOUT = 30.0
+
+# 看门狗在两次存在性检查时限之外额外等待的时间(秒)
+_HANG_MARGIN = 5.0
+
+# 父进程轮询工作进程的间隔(秒)
+_POLL_INTERVAL = 0.5
+
+
+def hang_timeout_for(probe_timeout):
+    """
+    根据存在性检查的时限得出工作进程看门狗的时限
+
+    一个快捷方式最多依次等待根探测和目标检查两次时限，看门狗须比这更长，
+    否则会在检查本该超时返回时杀死工作进程，连同其中的根熔断状态一起丢掉
+
+    参数:
+        probe_timeout (float | None): 单次存在性检查的时限(秒)，None表示不限时
+
+    返回:
+        float: 单个快捷方式的最长检查时间(秒)
+    """
+    if not probe_timeout:
+        return DEFAULT_HANG_TIMEOUT
+    return max(DEFAULT_HANG_TIMEOUT, 2 * probe_timeout + _HANG_MARGIN)
+
+
+def _worker_main(conn, checker_options):
+    """
+    工作进程入口
+
+    参数:
+        conn (Connection): 与父进程通信的管道，接收(序号, 路径)列表，
+            每检查完一个快捷方式回传(序号, ScanResult, 熔断的根)，收到None时退出；
+            熔断的根只在有新的根熔断时为{根: 原因}，否则为None
+        checker_options (dict): 创建ShortcutChecker的关键字参数
+    """
+    from shortcut_checker import ShortcutChecker
+
+    checker = ShortcutChecker(**checker_options)
+    reported = 0
+    try:
+        with checker.session():
+            while True:
+                chunk = conn.recv()
+                if chunk is None:
+                    break
+                for index, shortcut_path in chunk:
+                    result = checker.inspect_shortcut(shortcut_path)
+                    tripped = checker.scan_tripped_roots()
+                    if len(tripped) == reported:
+                        tripped = None
+                    else:
+                        reported = len(tripped)
+                    conn.send((index, result, tripped))
+    except (EOFError, OSError, KeyboardInterrupt):
+        pass
+    finally:
+        conn.close()
+
+
+class _Worker:
+    """父进程中对单个工作进程的记录"""
+
+    __slots__ = ('process', 'conn', 'chunk', 'position', 'last_seen')
+
+    def __init__(self, context, checker_options):
+        parent_conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child_conn, checker_options),
+                                       daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.conn = parent_conn
+        self.chunk = None
+        self.position = 0
+        self.last_seen = time.monotonic()
+
+    def assign(self, chunk):
+        """分配一个新的检查块"""
+        self.chunk = chunk
+        self.position = 0
+        self.last_seen = time.monotonic()
+        self.conn.send(chunk)
+
+    def current(self):
+        """正在检查的(序号, 路径)"""
+        return self.chunk[self.position]
+
+    def kill(self):
+        """强制结束工作进程"""
+        try:
+            self.conn.close()
+        finally:
+            if self.process.is_alive():
+                self.process.terminate()
+            self.process.join(1)
+
+    def stop(self):
+        """通知工作进程正常退出"""
+        try:
+            self.conn.send(None)
+        except OSError:
+            pass
+        self.conn.close()
+
+
+class ProcessPoolScanner:
+    """进程池快捷方式扫描器"""
+
+    def __init__(self, workers, chunk_size=DEFAULT_CHUNK_SIZE, hang_timeout=None,
+                 checker_options=None):
+        """
+        参数:
+            workers (int): 工作进程数
+            chunk_size (int): 每次分配给工作进程的快捷方式数量
+            hang_timeout (float): 单个快捷方式的最长检查时间(秒)，
+                None表示按checker_options中的probe_timeout由hang_timeout_for()得出
+            checker_options (dict): 工作进程创建ShortcutChecker时的关键字参数，须可以pickle
+
+        异常:
+            ValueError: hang_timeout不大于存在性检查的时限
+        """
+        self.workers = max(1, workers)
+        self.chunk_size = max(1, chunk_size)
+        self.checker_options = dict(checker_options or {})
+        probe_timeout = self.checker_options.get('probe_timeout')
+        if hang_timeout is None:
+            hang_timeout = hang_timeout_for(probe_timeout)
+        elif hang_timeout and probe_timeout and hang_timeout <= probe_timeout:
+            raise ValueError("hang_timeout须大于存在性检查的时限probe_timeout")
+        self.hang_timeout = hang_timeout
+        # 最近一次扫描中因卡死或崩溃而无法检查的快捷方式
+        self.unresolvable = []
+        # 最近一次扫描中各工作进程熔断的共享根和盘符: {根: 原因}
+        self.tripped_roots = {}
+
+    def check(self, shortcuts, progress_callback=None, cancel_token=None):
+        """
+        检查快捷方式列表
+
+        参数:
+            shortcuts (list): 快捷方式路径列表
+            progress_callback (callable): 进度回调函数，在调用进程中执行，接收已完成数和总数
+            cancel_token (CancelToken): 可选的取消/暂停令牌。取消时终止所有工作进程并返回；
+                暂停时不再分配新的检查块，已分配的块会继续完成
+
+        返回:
+            list: 与shortcuts顺序一致的ScanResult，卡死或崩溃而无法检查的快捷方式
+                结果为UNREACHABLE(结果未知，不算无效)，取消时未检查的快捷方式为None
+        """
+        total = len(shortcuts)
+        results = [None] * total
+        self.unresolvable = []
+        self.tripped_roots = {}
+
+        if progress_callback:
+            progress_callback(0, total)
+        if not total:
+            return results
+
+        pending = deque(
+            list(enumerate(shortcuts[start:start + self.chunk_size], start))
+            for start in range(0, total, self.chunk_size)
+        )
+        context = multiprocessing.get_context()
+        busy = []
+        # 暂停期间完成当前块、等待分配的工作进程
+        idle = []
+        started = []
+        done = 0
+
+        def record(index, result):
+            nonlocal done
+            results[index] = result
+            done += 1
+            if progress_callback and done < total:
+                progress_callback(done, total)
+
+        def advance(worker):
+            # 当前块处理完后分配下一块，没有剩余任务时让进程退出
+            worker.position += 1
+            if worker.position < len(worker.chunk):
+                return
+            busy.remove(worker)
+            if pending and cancel_token is not None and cancel_token.paused:
+                idle.append(worker)
+            elif pending:
+                worker.assign(pending.popleft())
+                busy.append(worker)
+            else:
+                worker.stop()
+
+        def replace(worker):
+            # 卡住或崩溃时无法确定结果(通常是目标检查卡在网络路径上)，记为无法访问，
+            # 剩余部分交给新进程；暂停期间新进程先空闲等待
+            index, shortcut_path = worker.current()
+            self.unresolvable.append(shortcut_path)
+            kind = os.path.splitext(shortcut_path)[1].lower().lstrip('.')
+            record(index, ScanResult(shortcut_path, kind, None, Verdict.UNREACHABLE))
+            remaining = worker.chunk[worker.position + 1:]
+            busy.remove(worker)
+            worker.kill()
+            if remaining:
+                pending.appendleft(remaining)
+            if not pending:
+                return
+            if cancel_token is not None and cancel_token.paused:
+                idle.append(new_worker())
+            else:
+                start_worker()
+
+        def new_worker():
+            worker = _Worker(context, self.checker_options)
+            started.append(worker)
+            return worker
+
+        def start_worker():
+            worker = new_worker()
+            worker.assign(pending.popleft())
+            busy.append(worker)
+
+        try:
+            for _ in range(min(self.workers, len(pending))):
+                start_worker()
+
+            while busy or idle:
+                if cancel_token is not None:
+                    if cancel_token.cancelled:
+                        break
+                    if idle and not cancel_token.paused:
+                        for worker in idle:
+                            if pending:
+                                worker.assign(pending.popleft())
+                                busy.append(worker)
+                            else:
+                                worker.stop()
+                        idle.clear()
+                    if not busy:
+                        cancel_token.wait(_POLL_INTERVAL)
+                        continue
+
+                by_conn = {worker.conn: worker for worker in busy}
+                for conn in wait(list(by_conn), _POLL_INTERVAL):
+                    worker = by_conn[conn]
+                    try:
+                        index, result, tripped = conn.recv()
+                    except (EOFError, OSError):
+                        replace(worker)
+                        continue
+                    worker.last_seen = time.monotonic()
+                    if tripped:
+                        for root, reason in tripped.items():
+                            self.tripped_roots.setdefault(root, reason)
+                    record(index, result)
+                    advance(worker)
+
+                if self.hang_timeout:
+                    now = time.monotonic()
+                    for worker in list(busy):
+                        if now - worker.last_seen > self.hang_timeout:
+                            replace(worker)
+        finally:
+            for worker in busy + idle:
+                worker.kill()
+            for worker in started:
+                worker.process.join(1)
+                if worker.process.is_alive():
+                    worker.process.terminate()
+
+        return results
@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+扫描结果模块
+定义单个快捷方式的检查记录及其结果类别，记录中带有解析出的目标，
+显示、导出或修复时无需再次读取快捷方式文件
+"""
+
+from enum import Enum
+
+
+class Verdict(str, Enum):
+    """
+    检查结果类别
+
+    继承str，值可以直接写入JSON或数据库，并且与字符串常量比较，
+    如Verdict.UNREACHABLE == 'unreachable'
+    """
+
+    VALID = 'valid'                    # 有效
+    MISSING_TARGET = 'missing_target'  # 目标不存在
+    EMPTY_TARGET = 'empty_target'      # 快捷方式中没有目标
+    PARSE_ERROR = 'parse_error'        # 文件无法读取或解析
+    UNREACHABLE = 'unreachable'        # 目标在时限内无法访问，既不算有效也不算无效
+    BAD_URL = 'bad_url'                # URL缺少协议或主机名
+
+    @property
+    def broken(self):
+        """是否为无效的快捷方式"""
+        return self is not Verdict.VALID and self is not Verdict.UNREACHABLE
+
+    @property
+    def label(self):
+        """中文说明"""
+        return _LABELS[self]
+
+
+_LABELS = {
+    Verdict.VALID: "有效",
+    Verdict.MISSING_TARGET: "目标不存在",
+    Verdict.EMPTY_TARGET: "没有目标",
+    Verdict.PARSE_ERROR: "无法解析",
+    Verdict.UNREACHABLE: "无法访问",
+    Verdict.BAD_URL: "URL无效",
+}
+
+
+class ScanResult:
+    """单个快捷方式的检查记录"""
+
+    __slots__ = ('path', 'kind', 'target', 'verdict', 'elapsed')
+
+    def __init__(self, path, kind, target, verdict, elapsed=0.0):
+        """
+        参数:
+            path (str): 快捷方式文件路径
+            kind (str): 类型，为小写且不带点的扩展名，如'lnk'或'url'
+            target (str | None): 解析出的目标，.lnk为路径，.url为URL，文件无法读取或解析时为None
+            verdict (Verdict): 检查结果
+            elapsed (float): 检查这个快捷方式的用时(秒)
+        """
+        self.path = path
+        self.kind = kind
+        self.target = target
+        self.verdict = verdict
+        self.elapsed = elapsed
+
+    @property
+    def valid(self):
+        """
+        与旧接口一致的检查结果
+
+        返回:
+            bool | str: 是否有效，目标无法访问时为'unreachable'
+        """
+        if self.verdict is Verdict.VALID:
+            return True
+        if self.verdict is Verdict.UNREACHABLE:
+            return Verdict.UNREACHABLE.value
+        return False
+
+    @property
+    def broken(self):
+        """是否为无效的快捷方式"""
+        return self.verdict.broken
+
+    def as_dict(self):
+        """
+        返回:
+            dict: 可序列化为JSON的记录
+        """
+        return {
+            'path': self.path,
+            'kind': self.kind,
+            'target': self.target,
+            'verdict': self.verdict.value,
+            'elapsed': self.elapsed,
+        }
+
+    def __repr__(self):
+        return f"ScanResult(path={self.path!r}, verdict={self.verdict.value}, target={self.target!r})"
@@ -0,0 +1,225 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+扫描统计模块
+按阶段和检查结果收集轻量的计数与计时，用于定位扫描中耗时的环节
+"""
+
+import time
+import threading
+
+from scan_result import Verdict
+
+
+# 计时的阶段
+PHASE_TIMERS = (
+    'discovery',    # 列举目录
+    'parse',        # 解析.lnk(含COM回退)和读取.url
+    'exists',       # 目标存在性检查(含缓存)
+    'path_lookup',  # 在PATH和App Paths中查找
+    'uwp',          # UWP包查询(含首次读取注册表)
+)
+
+# 计数项
+COUNTERS = (
+    'directories',     # 列举的目录数
+    'files_seen',      # 找到的快捷方式数
+    'lnk_parses',      # 解析的.lnk文件数
+    'url_reads',       # 读取的.url文件数
+    'com_fallbacks',   # 回退到COM解析的次数
+    'bytes_read',      # 读取的快捷方式文件字节数
+    'stat_calls',      # 实际执行的存在性检查次数(不含缓存命中)
+    'exists_checks',   # 请求的存在性检查次数
+    'path_lookups',    # PATH查找次数
+    'uwp_lookups',     # UWP包查询次数
+)
+
+# 检查结果的类别，即Verdict的值
+VERDICTS = tuple(verdict.value for verdict in Verdict)
+
+# 报告中各项的中文名称
+_LABELS = {
+    'discovery': '列举目录',
+    'parse': '解析',
+    'exists': '存在性检查',
+    'path_lookup': 'PATH查找',
+    'uwp': 'UWP查询',
+    'directories': '目录',
+    'files_seen': '快捷方式',
+    'lnk_parses': '.lnk解析',
+    'url_reads': '.url读取',
+    'com_fallbacks': 'COM回退',
+    'bytes_read': '读取字节',
+    'stat_calls': '实际stat',
+    'exists_checks': '存在性请求',
+    'path_lookups': 'PATH查找',
+    'uwp_lookups': 'UWP查询',
+}
+_LABELS.update((verdict.value, verdict.label) for verdict in Verdict)
+
+
+class ScanStats:
+    """
+    一次扫描的统计结果
+
+    阶段计时是各线程的累计时间，并行检查时总和可能超过实际用时
+    """
+
+    def __init__(self):
+        self.counters = dict.fromkeys(COUNTERS, 0)
+        self.timers = dict.fromkeys(PHASE_TIMERS, 0.0)
+        self.verdicts = dict.fromkeys(VERDICTS, 0)
+        # 各类结果的累计检查时间(秒)
+        self.verdict_times = dict.fromkeys(VERDICTS, 0.0)
+        # 扫描内目标去重命中次数和存在性缓存命中次数
+        self.target_memo_hits = 0
+        self.exists_cache_hits = 0
+        self.registry_calls = 0
+        self.elapsed = 0.0
+
+    def count(self, name, amount=1):
+        """增加计数"""
+        self.counters[name] += amount
+
+    def add_time(self, phase, seconds):
+        """累加阶段用时"""
+        self.timers[phase] += seconds
+
+    def add_verdict(self, verdict, seconds):
+        """记录一个快捷方式的检查结果及其用时"""
+        self.verdicts[verdict] += 1
+        self.verdict_times[verdict] += seconds
+
+    def merge(self, other):
+        """把另一份统计累加到本统计中"""
+        for name, value in other.counters.items():
+            self.counters[name] += value
+        for name, value in other.timers.items():
+            self.timers[name] += value
+        for name, value in other.verdicts.items():
+            self.verdicts[name] += value
+        for name, value in other.verdict_times.items():
+            self.verdict_times[name] += value
+        self.target_memo_hits += other.target_memo_hits
+        self.exists_cache_hits += other.exists_cache_hits
+        self.registry_calls += other.registry_calls
+        self.elapsed += other.elapsed
+
+    def summary(self):
+        """
+        返回:
+            str: 适合状态栏显示的一行摘要
+        """
+        slowest = max(self.timers, key=self.timers.get)
+        return (f"{self.counters['files_seen']} 个快捷方式，"
+                f"stat {self.counters['stat_calls']} 次，"
+                f"去重命中 {self.target_memo_hits} 次，"
+                f"耗时最多: {_LABELS[slowest]} {self.timers[slowest]:.2f}秒")
+
+    def format_report(self):
+        """
+        返回:
+            str: 多行的统计报告
+        """
+        lines = [f"扫描统计 (用时 {self.elapsed:.2f}秒，阶段时间为各线程累计)"]
+        lines.append("  阶段用时:")
+        for phase in PHASE_TIMERS:
+            lines.append(f"    {_LABELS[phase]}: {self.timers[phase]:.3f}秒")
+        lines.append("  计数:")
+        for name in COUNTERS:
+            lines.append(f"    {_LABELS[name]}: {self.counters[name]}")
+        lines.append(f"    目标去重命中: {self.target_memo_hits}")
+        lines.append(f"    存在性缓存命中: {self.exists_cache_hits}")
+        lines.append(f"    注册表调用: {self.registry_calls}")
+        lines.append("  检查结果:")
+        for verdict in VERDICTS:
+            count = self.verdicts[verdict]
+            average = self.verdict_times[verdict] / count * 1000 if count else 0.0
+            lines.append(f"    {_LABELS[verdict]}: {count} (平均 {average:.2f}毫秒)")
+        return "\n".join(lines)
+
+    def as_dict(self):
+        """
+        返回:
+            dict: 可序列化为JSON的统计数据
+        """
+        return {
+            'elapsed': self.elapsed,
+            'timers': dict(self.timers),
+            'counters': dict(self.counters),
+            'verdicts': dict(self.verdicts),
+            'verdict_times': dict(self.verdict_times),
+            'target_memo_hits': self.target_memo_hits,
+            'exists_cache_hits': self.exists_cache_hits,
+            'registry_calls': self.registry_calls,
+        }
+
+    def __repr__(self):
+        return (f"ScanStats(files_seen={self.counters['files_seen']}, "
+                f"verdicts={self.verdicts}, elapsed={self.elapsed:.3f})")
+
+
+class StatsCollector:
+    """
+    扫描期间的统计收集器
+
+    每个线程写入自己的ScanStats分片，记录时不需要加锁，扫描结束时再合并
+    """
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._shards = []
+
+    def shard(self):
+        """
+        返回:
+            ScanStats: 当前线程的统计分片
+        """
+        try:
+            return self._local.stats
+        except AttributeError:
+            stats = self._local.stats = ScanStats()
+            with self._lock:
+                self._shards.append(stats)
+            return stats
+
+    def collect(self):
+        """
+        合并所有线程的分片
+
+        返回:
+            ScanStats: 合并后的统计，elapsed为从开始收集到现在的时间
+        """
+        stats = ScanStats()
+        with self._lock:
+            shards = list(self._shards)
+        for shard in shards:
+            stats.merge(shard)
+        stats.elapsed = time.perf_counter() - self.start
+        return stats
+
+
+class CountingRegistry:
+    """记录调用次数的注册表后端包装"""
+
+    def __init__(self, registry):
+        """
+        参数:
+            registry: 被包装的注册表后端
+        """
+        self.registry = registry
+        self.calls = 0
+        # 检查线程并发调用，计数须加锁
+        self._lock = threading.Lock()
+
+    def enum_subkeys(self, hive, key_path):
+        with self._lock:
+            self.calls += 1
+        return self.registry.enum_subkeys(hive, key_path)
+
+    def query_default(self, hive, key_path):
+        with self._lock:
+            self.calls += 1
+        return self.registry.query_default(hive, key_path)
@@ -7,63 +7,608 @@
 
 import os
 import sys
-import winreg
-import subprocess
+import time
+import queue
+import threading
+from collections import deque
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from contextlib import contextmanager
+from itertools import product
 from urllib.parse import urlparse
-import win32com.client
+
+from lnk_parser import parse_lnk, LnkParseError
+from existence import (VerdictMemo, DirectoryListingProbe, ProbeDeadline, ProbeTimeout,
+                       RootBreaker, DEFAULT_PROBE_TIMEOUT, target_key, volume_root)
+from path_index import PathIndex
+from registry import default_registry
+from uwp_index import PackageIndex
+from com_shell import default_resolver
+from progress import (ProgressThrottle, DEFAULT_PROGRESS_INTERVAL,
+                      PHASE_DISCOVERY, PHASE_CHECK, PHASE_CANCELLED)
+from cancellation import ScanCancelled
+from scan_stats import StatsCollector, CountingRegistry
+from scan_result import ScanResult, Verdict
+
+
+# 并行检查时的默认线程数，检查以I/O等待为主，因此可以多于CPU核数
+DEFAULT_WORKERS = min(32, (os.cpu_count() or 1) + 4)
+
+# 查找与检查之间队列的最大长度
+DISCOVERY_QUEUE_SIZE = 1024
+
+# 等待结果时检查是否已取消的间隔(秒)，决定了取消的最长响应时间
+CANCEL_POLL_INTERVAL = 0.1
+
+# 目标在时限内无法访问时的检查结果，既不算有效也不算无效
+UNREACHABLE = Verdict.UNREACHABLE.value
 
 
 class ShortcutChecker:
     """快捷方式检查器类"""
     
-    def __init__(self):
+    def __init__(self, existence_cache=None, batch_existence=False, registry=None, scan_db=None,
+                 com_resolver=None, probe_timeout=DEFAULT_PROBE_TIMEOUT, circuit_breaker=True,
+                 collect_stats=False, tracer=None):
+        """
+        参数:
+            existence_cache (ExistenceCache): 可选的存在性缓存，在同一进程的多次扫描间复用
+            batch_existence (bool): 是否按父目录批量检查目标是否存在，
+                适合大量目标集中在少数网络目录中的情况
+            registry: 注册表后端，默认使用当前平台的注册表，测试时可传入FakeRegistry
+            scan_db (ScanDatabase): 可选的增量扫描数据库，重复扫描时只重新检查变化的部分
+            com_resolver: 内置解析器无法得到目标时使用的COM解析后端，见com_shell模块，
+                默认在安装了pywin32时使用WScript.Shell
+            probe_timeout (float): 单次存在性检查的时限(秒)，超时的目标结果为UNREACHABLE，
+                None表示不限时
+            circuit_breaker (bool): 是否按共享根和盘符熔断，某个根无法访问时
+                其下的目标不再逐个检查，直接视为UNREACHABLE
+            collect_stats (bool): 是否按阶段收集计数和计时，结果保存在stats中；
+                关闭时只多一次属性判断
+            tracer (TraceRecorder): 可选的时间线记录器(见tracing模块)，记录每个快捷方式
+                和每个阶段的区间；进程池模式下只记录查找和整体检查
+        """
         # 快捷方式文件扩展名
         self.shortcut_exts = ['.lnk', '.url']
+        
+        # 跨扫描的存在性缓存
+        self.existence_cache = existence_cache
+        
+        # 按父目录批量检查
+        self.batch_existence = batch_existence
+        
+        # 增量扫描数据库
+        self.scan_db = scan_db
+        
+        # 注册表后端，收集统计时记录调用次数
+        self.registry = registry if registry is not None else default_registry()
+        self.collect_stats = collect_stats
+        if collect_stats:
+            self.registry = CountingRegistry(self.registry)
+        
+        # PATH可执行文件索引，在多次扫描间共享；列举PATH目录同样受时限和根熔断约束
+        self.path_index = PathIndex(self.registry, self.call_guarded)
+        
+        # 当前扫描的UWP包快照，首次查询时创建
+        self._uwp_index = None
+        self._uwp_lock = threading.Lock()
+        
+        # 当前扫描的目标结果表和批量检查器，扫描之外为None
+        self._verdicts = None
+        self._probe = None
+        self._last_verdicts = VerdictMemo()
+        
+        # 最近一次扫描中因卡死或崩溃而无法检查的快捷方式(仅进程池模式)
+        self.unresolvable_shortcuts = []
+        
+        # 存在性检查的时限，以及最近一次check_folder中目标无法访问的快捷方式
+        self.deadline = ProbeDeadline(probe_timeout) if probe_timeout else None
+        self.unreachable_shortcuts = []
+        
+        # 当前的存在性检查函数，已按时限包装；按父目录批量检查时在扫描开始时替换
+        self._exists_probe = self._within_deadline(os.path.exists)
+        
+        # 当前扫描的根熔断器，以及最近一次扫描中熔断的根: {根: 原因}
+        self.circuit_breaker = circuit_breaker
+        self._breaker = None
+        self.tripped_roots = {}
+        
+        # COM解析后端，pywin32在第一次回退时才导入
+        self.com_resolver = com_resolver if com_resolver is not None else default_resolver()
+        
+        # 两次进度通知之间的最短间隔(秒)
+        self.progress_interval = DEFAULT_PROGRESS_INTERVAL
+        
+        # 当前扫描的统计收集器，以及最近一次扫描的统计(ScanStats)，未收集时为None
+        self._stats = None
+        self._stats_baseline = (0, 0)
+        self.stats = None
+        
+        # 时间线记录器，以及当前扫描的开始时间
+        self.tracer = tracer
+        self._scan_start = 0.0
     
-    def check_folder(self, folder_path, recursive=True, progress_callback=None):
+    def check_folder(self, folder_path, recursive=True, progress_callback=None, workers=1,
+                     executor='thread', hang_timeout=None, cancel_token=None):
         """
         检查文件夹中的所有快捷方式
         
+        需要失效原因或解析出的目标时使用scan_folder
+        
         参数:
             folder_path (str): 要检查的文件夹路径
             recursive (bool): 是否递归检查子文件夹
-            progress_callback (callable): 进度回调函数，接收当前进度和总数
+            progress_callback (callable): 进度回调函数，接收ProgressInfo(见progress模块)，
+                最多每progress_interval秒调用一次，结束时总会以PHASE_DONE调用一次
+            workers (int): 并行检查的线程或进程数，为1时按顺序检查
+            executor (str): 并行方式，'thread'使用线程池，'process'使用进程池(不支持scan_db)
+            hang_timeout (float): 进程池模式下单个快捷方式的最长检查时间(秒)，
+                超时的快捷方式记入unresolvable_shortcuts，结果为UNREACHABLE；
+                None表示由存在性检查的时限得出(见scan_pool.hang_timeout_for)，指定时须大于该时限
+            cancel_token (CancelToken): 可选的取消/暂停令牌，取消后尽快返回已得出的结果
+            
+        返回:
+            list: 无效快捷方式的路径列表，取消时只包含已检查的部分；
+                目标无法访问的快捷方式不在其中，而是记入unreachable_shortcuts；
+                开启collect_stats时统计记入stats(进程池模式下只有查找和结果数)
             
+        异常:
+            ValueError: 使用增量扫描数据库时指定了进程池模式，或hang_timeout不大于存在性检查的时限
+        """
+        return [result.path for result in self._scan_folder(
+            folder_path, recursive, progress_callback, workers, executor, hang_timeout,
+            cancel_token) if result.broken]
+    
+    def scan_folder(self, folder_path, recursive=True, progress_callback=None, workers=1,
+                    executor='thread', hang_timeout=None, cancel_token=None):
+        """
+        检查文件夹中的所有快捷方式，返回每个快捷方式的检查记录
+        
+        参数与check_folder相同
+        
+        返回:
+            list: ScanResult列表，包括有效的快捷方式，顺序与发现顺序一致，
+                取消时只包含已检查的部分；目标无法访问的快捷方式同时记入unreachable_shortcuts
+        """
+        return list(self._scan_folder(folder_path, recursive, progress_callback, workers,
+                                      executor, hang_timeout, cancel_token))
+    
+    def _scan_folder(self, folder_path, recursive, progress_callback, workers, executor,
+                     hang_timeout, cancel_token):
+        """check_folder和scan_folder共用的实现，逐个产出ScanResult"""
+        self.unresolvable_shortcuts = []
+        self.unreachable_shortcuts = []
+        self.tripped_roots = {}
+        
+        if executor == 'process':
+            if self.scan_db is not None:
+                raise ValueError("进程池模式不支持增量扫描数据库")
+            results = self._scan_processes(folder_path, recursive, progress_callback, workers,
+                                           hang_timeout, cancel_token)
+        else:
+            # 最终的完成通知由iter_scan_folder发出
+            results = self.iter_scan_folder(folder_path, recursive, progress_callback, workers,
+                                            cancel_token)
+        
+        for result in results:
+            if result.verdict is Verdict.UNREACHABLE:
+                self.unreachable_shortcuts.append(result.path)
+            yield result
+    
+    def _scan_processes(self, folder_path, recursive, progress_callback, workers, hang_timeout,
+                        cancel_token):
+        """
+        使用进程池检查文件夹
+        
         返回:
-            list: 无效快捷方式的路径列表
+            generator: 已检查的快捷方式的ScanResult，取消时跳过未检查的部分
         """
-        invalid_shortcuts = []
+        # 进程池需要先收集所有快捷方式再分块，查找阶段报告已找到的数量
+        throttle = ProgressThrottle(progress_callback, self.progress_interval)
         all_shortcuts = []
+        self._stats = StatsCollector() if self.collect_stats else None
+        try:
+            for shortcut_path in self.iter_shortcuts(folder_path, recursive):
+                if cancel_token is not None:
+                    cancel_token.checkpoint()
+                all_shortcuts.append(shortcut_path)
+                throttle.update(len(all_shortcuts), 0, PHASE_DISCOVERY)
+        except ScanCancelled:
+            throttle.finish(0, 0, PHASE_CANCELLED)
+            self._finish_process_stats([])
+            return
+        
+        total = len(all_shortcuts)
+        done = [0]
+        
+        def on_progress(count, total):
+            done[0] = count
+            throttle.update(count, total, PHASE_CHECK)
+        
+        if self.tracer is not None:
+            with self.tracer.span('process_pool', 'scan', {'shortcuts': total}):
+                results = self._check_processes(all_shortcuts, on_progress, workers,
+                                                hang_timeout, cancel_token)
+        else:
+            results = self._check_processes(all_shortcuts, on_progress, workers, hang_timeout,
+                                            cancel_token)
+        self._finish_process_stats(results)
+        if cancel_token is not None and cancel_token.cancelled:
+            throttle.finish(done[0], total, PHASE_CANCELLED)
+        else:
+            throttle.finish(total, total)
+        
+        for result in results:
+            if result is not None:
+                yield result
+    
+    def iter_shortcuts(self, folder_path, recursive=True):
+        """
+        逐个产出文件夹中的快捷方式路径
         
-        # 收集所有快捷方式
-        for root, _, files in os.walk(folder_path):
-            for file in files:
-                file_path = os.path.join(root, file)
-                _, ext = os.path.splitext(file_path)
-                
-                if ext.lower() in self.shortcut_exts:
-                    all_shortcuts.append(file_path)
+        参数:
+            folder_path (str): 要检查的文件夹路径
+            recursive (bool): 是否递归检查子文件夹
             
-            # 如果不递归，则只处理顶层文件夹
-            if not recursive:
-                break
+        返回:
+            generator: 快捷方式路径
+        """
+        for entry in self.iter_shortcut_entries(folder_path, recursive):
+            yield entry.path
+    
+    def iter_shortcut_entries(self, folder_path, recursive=True):
+        """
+        使用os.scandir逐个产出快捷方式的目录项
         
-        # 检查每个快捷方式
-        total = len(all_shortcuts)
-        for i, shortcut_path in enumerate(all_shortcuts):
-            # 回调进度信息
-            if progress_callback:
-                progress_callback(i, total)
+        目录项自带文件类型信息(Windows上还包括大小和修改时间)，无需额外的stat调用；
+        扩展名用预先展开的大小写组合直接匹配，不为每个文件创建新字符串
+        
+        参数:
+            folder_path (str): 要检查的文件夹路径
+            recursive (bool): 是否递归检查子文件夹
+            
+        返回:
+            generator: os.DirEntry对象，顺序与os.walk自顶向下遍历一致
+        """
+        suffixes = _case_variants(self.shortcut_exts)
+        pending = [folder_path]
+        
+        while pending:
+            stats = self._stats
+            directory = pending.pop()
+            try:
+                if stats is None and self.tracer is None:
+                    entries, subdirs = _list_directory(directory, suffixes)
+                else:
+                    entries, subdirs = self._timed('discovery', _list_directory,
+                                                   directory, suffixes)
+            except OSError:
+                # 无权限或已被删除的目录直接跳过
+                continue
+            
+            if stats is not None:
+                shard = stats.shard()
+                shard.count('directories')
+                shard.count('files_seen', len(entries))
+            yield from entries
+            if recursive:
+                pending.extend(reversed(subdirs))
+    
+    def list_directory(self, directory):
+        """
+        列举一个目录中的快捷方式和子目录
+        
+        参数:
+            directory (str): 目录路径
+            
+        返回:
+            tuple: (快捷方式的os.DirEntry列表, 子目录路径列表)
+            
+        异常:
+            OSError: 目录无法列举
+        """
+        return _list_directory(directory, _case_variants(self.shortcut_exts))
+    
+    def iter_check_folder(self, folder_path, recursive=True, progress_callback=None, workers=1,
+                          cancel_token=None):
+        """
+        边查找边检查文件夹中的快捷方式，每得出一个结果就立即产出
+        
+        参数与iter_scan_folder相同，需要失效原因或解析出的目标时直接使用iter_scan_folder
+        
+        返回:
+            generator: (快捷方式路径, 是否有效)元组，目标无法访问时是否有效为UNREACHABLE
+        """
+        for result in self.iter_scan_folder(folder_path, recursive, progress_callback, workers,
+                                            cancel_token):
+            yield result.path, result.valid
+    
+    def iter_scan_folder(self, folder_path, recursive=True, progress_callback=None, workers=1,
+                         cancel_token=None):
+        """
+        边查找边检查文件夹中的快捷方式，每得出一个检查记录就立即产出
+        
+        查找在后台线程中进行，通过有界队列交给检查方，因此遍历目录与检查同时进行；
+        结果按发现顺序产出，内存占用只与队列和并行窗口大小有关，与快捷方式总数无关
+        
+        参数:
+            folder_path (str): 要检查的文件夹路径
+            recursive (bool): 是否递归检查子文件夹
+            progress_callback (callable): 进度回调函数，接收ProgressInfo(见progress模块)，
+                查找尚未结束时阶段为PHASE_DISCOVERY、总数为0；通知在此合并，
+                最多每progress_interval秒调用一次，迭代结束时总会以PHASE_DONE
+                (取消时为PHASE_CANCELLED)调用一次
+            workers (int): 并行检查的线程数，为1时按顺序检查
+            cancel_token (CancelToken): 可选的取消/暂停令牌。取消后最多约CANCEL_POLL_INTERVAL秒
+                停止产出，即使某个检查线程仍卡在缓慢的文件系统调用中；
+                暂停时查找和检查都在处理下一个快捷方式之前等待。
+                被放弃的检查线程是守护线程，不会阻止进程退出；增量扫描数据库只在产出结果的
+                线程中写入，这些线程返回后不会再改动数据库
             
-            # 检查快捷方式是否有效
-            if not self.is_shortcut_valid(shortcut_path):
-                invalid_shortcuts.append(shortcut_path)
+        返回:
+            generator: ScanResult
+        """
+        self._begin_scan()
+        scan_db = self.scan_db
         
-        # 确保最终进度达到100%
-        if progress_callback and total > 0:
-            progress_callback(total, total)
+        if scan_db is not None:
+            # 增量扫描：产出(路径, 缓存)，只重新解析新增或修改过的快捷方式
+            items = self.scan_db.iter_items(folder_path, recursive, self.list_directory)
+            check = self._inspect_incremental
+        else:
+            items = self.iter_shortcuts(folder_path, recursive)
+            check = self.inspect_shortcut
+        
+        discovery = _BackgroundDiscovery(items, cancel_token=cancel_token)
+        
+        if self._stats is not None:
+            check = _timed_verdicts(check, self._stats)
+        if self.tracer is not None:
+            check = _traced(check, self.tracer)
+        
+        if cancel_token is not None:
+            check = _checkpointed(check, cancel_token)
+        
+        if workers > 1 or cancel_token is not None:
+            # 可取消的扫描即使只有一个线程也在线程池中检查，使等待方不会卡在系统调用中
+            results = self._iter_parallel(discovery, workers, check, cancel_token)
+        else:
+            results = ((item, check(item)) for item in discovery)
+        
+        throttle = ProgressThrottle(progress_callback, self.progress_interval)
+        done = 0
+        
+        try:
+            try:
+                for _, result in results:
+                    done += 1
+                    if discovery.finished:
+                        throttle.update(done, discovery.count, PHASE_CHECK)
+                    else:
+                        throttle.update(done, 0, PHASE_DISCOVERY)
+                    if scan_db is not None:
+                        # 无法访问的结果不保存，下次扫描重新检查
+                        verdict = result.verdict
+                        scan_db.record(result.path, result.target,
+                                       None if verdict is Verdict.UNREACHABLE
+                                       else verdict is Verdict.VALID)
+                    yield result
+            except ScanCancelled:
+                throttle.finish(done, discovery.count if discovery.finished else 0, PHASE_CANCELLED)
+            else:
+                throttle.finish(done, done)
+        finally:
+            discovery.close()
+            if scan_db is not None:
+                scan_db.flush()
+            self._end_scan()
+    
+    def watch(self, folders, callback, recursive=True, **options):
+        """
+        持续监视文件夹，先完整检查一次，之后只重新检查发生变化的快捷方式
+        
+        此方法会一直阻塞，直到返回的监视器被停止；通常在单独的线程中调用，
+        或使用watcher.FolderWatcher自行控制
+        
+        参数:
+            folders (list): 要监视的文件夹
+            callback (callable): 结果回调，接收(快捷方式路径, 是否有效)，
+                快捷方式被删除时是否有效为None
+            recursive (bool): 是否监视子文件夹
+            **options: 传给FolderWatcher的其他参数，如interval
+        """
+        from watcher import FolderWatcher
+        
+        FolderWatcher(self, folders, callback, recursive, **options).run()
+    
+    @contextmanager
+    def session(self):
+        """
+        把一组单独的检查当作一次扫描: 相同目标只检查一次，共用根熔断器和UWP快照
+        
+        监视模式的每轮处理和进程池的工作进程使用它包围各自的检查
+        
+        返回:
+            上下文管理器，进入时返回检查器本身
+        """
+        self._begin_scan()
+        try:
+            yield self
+        finally:
+            self._end_scan()
+    
+    def scan_tripped_roots(self):
+        """
+        返回:
+            dict: 当前扫描中已熔断的根及原因，扫描之外为最近一次扫描的结果
+        """
+        breaker = self._breaker
+        if breaker is not None:
+            return breaker.tripped
+        return dict(self.tripped_roots)
+    
+    def _begin_scan(self):
+        """开始一次扫描，相同目标在本次扫描中只检查一次"""
+        self._scan_start = time.perf_counter()
+        if self.collect_stats:
+            self._stats = StatsCollector()
+            self._stats_baseline = (self.registry.calls,
+                                    self.existence_cache.hits if self.existence_cache else 0)
+        self._verdicts = VerdictMemo()
+        self._uwp_index = None
+        if self.circuit_breaker:
+            self._breaker = RootBreaker(self.deadline)
+        self.path_index.validate()
+        if self.batch_existence:
+            self._probe = DirectoryListingProbe()
+            self._exists_probe = self._within_deadline(self._probe.exists)
+    
+    def _end_scan(self):
+        """结束扫描，保留目标去重的统计"""
+        if self._verdicts is not None:
+            self._last_verdicts = self._verdicts
+        self._verdicts = None
+        if self._probe is not None:
+            self._probe = None
+            self._exists_probe = self._within_deadline(os.path.exists)
+        self._uwp_index = None
+        if self._breaker is not None:
+            self.tripped_roots = self._breaker.tripped
+            self._breaker = None
+        if self._stats is not None:
+            stats = self._stats.collect()
+            registry_calls, exists_hits = self._stats_baseline
+            stats.target_memo_hits = self._last_verdicts.hits
+            stats.registry_calls = self.registry.calls - registry_calls
+            if self.existence_cache is not None:
+                stats.exists_cache_hits = self.existence_cache.hits - exists_hits
+            self.stats = stats
+            self._stats = None
+        if self.tracer is not None:
+            self.tracer.complete('scan', 'scan', self._scan_start, time.perf_counter())
+    
+    def _timed(self, phase, function, *args):
+        """
+        调用function，开启统计或追踪时把用时计入phase
+        
+        参数:
+            phase (str): 阶段名，见scan_stats.PHASE_TIMERS
+            function (callable): 要调用的函数，第一个参数作为区间的说明
+        """
+        start = time.perf_counter()
+        try:
+            return function(*args)
+        finally:
+            self._record(phase, start, args[0])
+    
+    def _record(self, phase, start, subject):
+        """把从start到现在的用时计入统计和时间线"""
+        end = time.perf_counter()
+        stats = self._stats
+        if stats is not None:
+            stats.shard().add_time(phase, end - start)
+        if self.tracer is not None:
+            self.tracer.complete(phase, 'phase', start, end, {'path': subject})
+    
+    def _finish_process_stats(self, results):
+        """进程池模式结束时生成统计，检查在工作进程中进行，只能记录结果和用时"""
+        if self._stats is None:
+            return
+        stats = self._stats.collect()
+        for result in results:
+            if result is not None:
+                stats.add_verdict(result.verdict.value, result.elapsed)
+        self.stats = stats
+        self._stats = None
+    
+    def cache_info(self):
+        """
+        获取最近一次扫描的缓存命中情况
+        
+        返回:
+            dict: target_hits/target_misses为扫描内目标去重的命中/未命中次数，
+                exists_hits/exists_misses为存在性缓存的命中/未命中次数
+        """
+        memo = self._verdicts or self._last_verdicts
+        cache = self.existence_cache
+        return {
+            'target_hits': memo.hits,
+            'target_misses': memo.misses,
+            'exists_hits': cache.hits if cache else 0,
+            'exists_misses': cache.misses if cache else 0,
+        }
+    
+    def _iter_parallel(self, items, workers, check, cancel_token=None):
+        """
+        使用守护线程池检查快捷方式，最多同时保留workers * 4个未产出的任务
+        
+        参数:
+            items (iterable): 待检查的快捷方式
+            workers (int): 线程数
+            check (callable): 检查单个快捷方式的函数
+            cancel_token (CancelToken): 可选的取消令牌
+            
+        返回:
+            generator: 按输入顺序产出的(快捷方式, 是否有效)元组
+            
+        异常:
+            ScanCancelled: 扫描已被取消
+        """
+        window = deque()
+        limit = workers * 4
+        executor = _DaemonPool(workers, 'shortcut-check')
+        cancelled = False
+        
+        try:
+            for item in items:
+                window.append((item, executor.submit(check, item)))
+                if len(window) >= limit:
+                    item, future = window.popleft()
+                    yield item, _result(future, cancel_token)
+            
+            while window:
+                item, future = window.popleft()
+                yield item, _result(future, cancel_token)
+        except ScanCancelled:
+            cancelled = True
+            raise
+        finally:
+            # 调用方提前结束迭代时取消尚未开始的任务；
+            # 扫描被取消时不等待卡在系统调用中的线程
+            for _, future in window:
+                future.cancel()
+            executor.shutdown(wait=not cancelled)
+    
+    def _check_processes(self, shortcuts, progress_callback, workers, hang_timeout,
+                         cancel_token=None):
+        """
+        使用进程池分块检查快捷方式，卡死或崩溃的工作进程会被重启
+        
+        参数:
+            shortcuts (list): 快捷方式路径列表
+            progress_callback (callable): 进度回调函数，在调用进程中执行，接收已完成数和总数
+            workers (int): 进程数
+            hang_timeout (float): 单个快捷方式的最长检查时间(秒)，None表示由存在性检查的时限得出
+            cancel_token (CancelToken): 可选的取消/暂停令牌
             
-        return invalid_shortcuts
+        返回:
+            list: 与shortcuts顺序一致的ScanResult，取消时未检查的部分为None
+        """
+        from scan_pool import ProcessPoolScanner
+        
+        scanner = ProcessPoolScanner(
+            workers,
+            # 未指定时由存在性检查的时限得出，看门狗不会抢在检查超时之前杀死工作进程
+            hang_timeout=hang_timeout,
+            # 工作进程使用与本检查器相同的存在性检查设置
+            checker_options={
+                'batch_existence': self.batch_existence,
+                'probe_timeout': self.deadline.timeout if self.deadline is not None else None,
+            }
+        )
+        results = scanner.check(shortcuts, progress_callback, cancel_token)
+        self.unresolvable_shortcuts = scanner.unresolvable
+        self.tripped_roots = scanner.tripped_roots
+        return results
     
     def is_shortcut_valid(self, shortcut_path):
         """
@@ -73,105 +618,346 @@ class ShortcutChecker:
             shortcut_path (str): 快捷方式文件路径
             
         返回:
-            bool: 快捷方式是否有效
+            bool | str: 快捷方式是否有效，目标在时限内无法访问时为UNREACHABLE
+        """
+        return self.inspect_shortcut(shortcut_path).valid
+    
+    def inspect_shortcut(self, shortcut_path):
+        """
+        解析并检查快捷方式，返回带有目标和失效原因的检查记录
+        
+        参数:
+            shortcut_path (str): 快捷方式文件路径
+            
+        返回:
+            ScanResult: 检查记录，不支持的文件类型视为有效
         """
-        _, ext = os.path.splitext(shortcut_path)
+        start = time.perf_counter()
+        kind = _kind(shortcut_path)
         
-        if ext.lower() == '.lnk':
-            return self._check_lnk_file(shortcut_path)
-        elif ext.lower() == '.url':
-            return self._check_url_file(shortcut_path)
+        if kind == 'lnk':
+            try:
+                target, parsed = self._resolve_lnk(shortcut_path)
+            except Exception:
+                target, verdict = None, Verdict.PARSE_ERROR
+            else:
+                if target or parsed:
+                    verdict = self._target_verdict(kind, target)
+                else:
+                    # 内置解析器和COM都无法读出目标
+                    target, verdict = None, Verdict.PARSE_ERROR
+        elif kind == 'url':
+            try:
+                target = self._read_url(shortcut_path)
+            except Exception:
+                target, verdict = None, Verdict.PARSE_ERROR
+            else:
+                verdict = self._target_verdict(kind, target)
         else:
             # 不支持的文件类型
-            return True
+            target, verdict = None, Verdict.VALID
+        
+        return ScanResult(shortcut_path, kind, target, verdict, time.perf_counter() - start)
+    
+    def _inspect_incremental(self, item):
+        """
+        结合增量扫描数据库检查快捷方式，结果由调用方写回数据库
+        
+        快捷方式未修改时沿用库中解析出的目标；检查结果在数据库的有效期内时直接沿用，
+        否则重新检查目标，目标被删除或恢复时不会错过
+        
+        参数:
+            item (tuple): (快捷方式路径, 缓存)，缓存为(目标, 是否有效, 检查时间)或None
+            
+        返回:
+            ScanResult: 检查记录
+        """
+        shortcut_path, cached = item
+        target, valid, checked_at = cached or (None, None, None)
+        kind = _kind(shortcut_path)
+        
+        if target is not None and valid is not None and self.scan_db.is_fresh(checked_at):
+            return ScanResult(shortcut_path, kind, target, _cached_verdict(kind, target, valid))
+        if target is None:
+            return self.inspect_shortcut(shortcut_path)
+        start = time.perf_counter()
+        return ScanResult(shortcut_path, kind, target, self._target_verdict(kind, target),
+                          time.perf_counter() - start)
     
-    def _check_lnk_file(self, lnk_path):
+    def check_shortcut(self, shortcut_path):
         """
-        检查.lnk文件是否有效
+        解析并检查快捷方式，同时返回解析出的目标
         
         参数:
-            lnk_path (str): .lnk文件路径
+            shortcut_path (str): 快捷方式文件路径
             
         返回:
-            bool: 快捷方式是否有效
+            tuple: (目标, 是否有效)，.lnk的目标为路径，.url的目标为URL，
+                文件无法读取或解析时目标为None
         """
+        result = self.inspect_shortcut(shortcut_path)
+        return result.target, result.valid
+    
+    def _target_verdict(self, kind, target):
+        """
+        按快捷方式类型检查已解析出的目标
+        
+        参数:
+            kind (str): 'lnk'或'url'
+            target (str): 目标路径或URL
+            
+        返回:
+            Verdict: 检查结果
+        """
+        if not target:
+            return Verdict.EMPTY_TARGET
         try:
-            # 使用Windows Shell COM对象解析.lnk文件
-            shell = win32com.client.Dispatch("WScript.Shell")
-            shortcut = shell.CreateShortCut(lnk_path)
-            
-            target_path = shortcut.TargetPath
-            
-            # 检查目标是否存在
-            if not target_path:
-                return False
-                
-            # 如果目标是文件或目录，直接检查是否存在
-            if os.path.exists(target_path):
+            if kind == 'lnk':
+                return _verdict_of(self._check_lnk_target(target))
+            return self._url_verdict(target)
+        except Exception:
+            return Verdict.MISSING_TARGET
+    
+    def _check_lnk_target(self, target_path):
+        """
+        检查.lnk文件解析出的目标是否有效
+        
+        参数:
+            target_path (str): 目标路径
+            
+        返回:
+            bool | str: 目标是否有效，无法访问时为UNREACHABLE
+        """
+        # 检查目标是否存在
+        if not target_path:
+            return False
+        
+        # 扫描中相同的目标只检查一次；扫描结束后仍在运行的线程读到None，不再写入
+        memo = self._verdicts
+        if memo is not None:
+            return memo.get(target_key(target_path), lambda: self._check_target(target_path))
+        return self._check_target(target_path)
+    
+    def _check_target(self, target_path):
+        """
+        检查快捷方式目标是否存在
+        
+        参数:
+            target_path (str): 目标路径
+            
+        返回:
+            bool | str: 目标是否存在，无法访问时为UNREACHABLE
+        """
+        # 如果目标是文件或目录，直接检查是否存在
+        exists = self._probe_target(target_path)
+        if exists == UNREACHABLE:
+            return UNREACHABLE
+        if exists:
+            return True
+            
+        stats = self._stats
+        timed = stats is not None or self.tracer is not None
+        
+        # 检查是否为特殊的Windows应用
+        if target_path.lower().endswith('.exe'):
+            # 尝试在PATH和App Paths中查找
+            name = os.path.basename(target_path)
+            if not timed:
+                found = self.path_index.find(name)
+            else:
+                if stats is not None:
+                    stats.shard().count('path_lookups')
+                found = self._timed('path_lookup', self.path_index.find, name)
+            if found is not None:
                 return True
-                
-            # 检查是否为特殊的Windows应用
-            if target_path.lower().endswith('.exe'):
-                # 尝试在PATH中查找
-                for path in os.environ["PATH"].split(os.pathsep):
-                    exe_path = os.path.join(path, os.path.basename(target_path))
-                    if os.path.exists(exe_path):
-                        return True
-            
-            # 检查是否为UWP应用
-            if ":" not in target_path and "\\" not in target_path:
+        
+        # 检查是否为UWP应用
+        if ":" not in target_path and "\\" not in target_path:
+            if not timed:
                 return self._check_uwp_app(target_path)
-                
-            return False
+            if stats is not None:
+                stats.shard().count('uwp_lookups')
+            return self._timed('uwp', self._check_uwp_app, target_path)
             
-        except Exception as e:
-            # 解析错误，视为无效
-            return False
+        return False
     
-    def _check_url_file(self, url_path):
+    def _probe_target(self, path):
         """
-        检查.url文件是否有效
+        在时限内检查目标是否存在，所在的共享根或盘符已熔断时不再检查
+        
+        返回:
+            bool | str: 目标是否存在，无法访问时为UNREACHABLE
+        """
+        breaker = self._breaker
+        root = volume_root(path) if breaker is not None else None
+        if root is not None and not breaker.allow(root):
+            return UNREACHABLE
+        try:
+            return self._exists(path)
+        except ProbeTimeout:
+            if root is not None:
+                breaker.record_timeout(root)
+            return UNREACHABLE
+    
+    def call_guarded(self, function, path):
+        """
+        在存在性检查的时限和根熔断下调用function(path)
+        
+        用于扫描中其他可能卡在网络路径上的文件系统调用，如列举PATH目录；
+        超时同样计入所在根的熔断
         
         参数:
-            url_path (str): .url文件路径
+            function (callable): 文件系统调用，接收一个路径
+            path (str): 路径
             
         返回:
-            bool: URL是否有效
+            function的返回值
+            
+        异常:
+            ProbeTimeout: 超过时限，或所在的共享根或盘符已熔断
         """
+        breaker = self._breaker
+        root = volume_root(path) if breaker is not None else None
+        if root is not None and not breaker.allow(root):
+            raise ProbeTimeout(path)
         try:
-            # 读取.url文件内容
-            with open(url_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
-            
-            # 提取URL
-            url = None
-            for line in content.splitlines():
-                if line.startswith('URL='):
-                    url = line[4:].strip()
-                    break
+            if self.deadline is not None:
+                return self.deadline.call(function, path)
+            return function(path)
+        except ProbeTimeout:
+            if root is not None:
+                breaker.record_timeout(root)
+            raise
+    
+    def _exists(self, path):
+        """
+        检查路径是否存在，配置了存在性缓存时优先使用缓存
+        
+        异常:
+            ProbeTimeout: 超过存在性检查的时限
+        """
+        probe = self._exists_probe
+        
+        stats = self._stats
+        if stats is None and self.tracer is None:
+            if self.existence_cache is not None:
+                return self.existence_cache.exists(path, probe)
+            return probe(path)
+        
+        if stats is not None:
+            stats.shard().count('exists_checks')
+            probe = _counted(probe, stats)
+        start = time.perf_counter()
+        try:
+            if self.existence_cache is not None:
+                return self.existence_cache.exists(path, probe)
+            return probe(path)
+        finally:
+            self._record('exists', start, path)
+    
+    def _within_deadline(self, probe):
+        """把存在性检查包装为带时限的检查，没有时限时原样返回"""
+        if self.deadline is None:
+            return probe
+        return self.deadline.wrap(probe)
+    
+    def _resolve_lnk(self, lnk_path):
+        """
+        解析.lnk文件的目标路径
+        
+        优先使用内置的二进制解析器，无法得到目标时(如解析失败或目标为
+        非文件系统项)回退到WScript.Shell COM对象
+        
+        参数:
+            lnk_path (str): .lnk文件路径
             
-            if not url:
-                return False
-            
-            # 解析URL
-            parsed_url = urlparse(url)
-            
-            # 检查URL格式是否有效
-            if not parsed_url.scheme or not parsed_url.netloc:
-                return False
-                
-            # 对于本地文件URL，检查文件是否存在
-            if parsed_url.scheme.lower() == 'file':
-                file_path = parsed_url.path.replace('/', '\\').lstrip('\\')
-                return os.path.exists(file_path)
-                
-            # 对于网络URL，我们不进行实际连接检查，因为这可能会很慢
-            # 只检查URL格式是否正确
-            return True
+        返回:
+            tuple: (目标路径, 内置解析器是否解析成功)，无法确定目标时目标路径为空字符串
             
-        except Exception as e:
-            # 解析错误，视为无效
-            return False
+        异常:
+            OSError: 文件无法读取
+        """
+        stats = self._stats
+        timed = stats is not None or self.tracer is not None
+        start = time.perf_counter() if timed else 0.0
+        try:
+            link = parse_lnk(lnk_path)
+            target_path = link.target_path
+        except LnkParseError:
+            link = None
+            target_path = ''
+        
+        if not target_path:
+            target_path = self.com_resolver.resolve(lnk_path)
+        
+        if stats is not None:
+            shard = stats.shard()
+            shard.count('lnk_parses')
+            if link is not None:
+                shard.count('bytes_read', link.size)
+            if link is None or not link.target_path:
+                shard.count('com_fallbacks')
+        if timed:
+            self._record('parse', start, lnk_path)
+        return target_path, link is not None
+    
+    def _read_url(self, url_path):
+        """
+        读取.url文件中的URL
+        
+        参数:
+            url_path (str): .url文件路径
+            
+        返回:
+            str: URL，文件中没有URL时为空字符串
+        """
+        # 读取.url文件内容
+        stats = self._stats
+        timed = stats is not None or self.tracer is not None
+        start = time.perf_counter() if timed else 0.0
+        with open(url_path, 'r', encoding='utf-8', errors='ignore') as f:
+            content = f.read()
+            if stats is not None:
+                shard = stats.shard()
+                shard.count('url_reads')
+                shard.count('bytes_read', f.tell())
+        if timed:
+            self._record('parse', start, url_path)
+        
+        # 提取URL
+        for line in content.splitlines():
+            if line.startswith('URL='):
+                return line[4:].strip()
+        return ''
+    
+    def _url_verdict(self, url):
+        """
+        检查URL是否有效
+        
+        参数:
+            url (str): .url文件中的URL
+            
+        返回:
+            Verdict: 检查结果，本地文件无法访问时为UNREACHABLE
+        """
+        if not url:
+            return Verdict.EMPTY_TARGET
+        
+        # 解析URL
+        parsed_url = urlparse(url)
+        
+        # 检查URL格式是否有效
+        if not parsed_url.scheme or not parsed_url.netloc:
+            return Verdict.BAD_URL
+            
+        # 对于本地文件URL，检查文件是否存在
+        if parsed_url.scheme.lower() == 'file':
+            file_path = parsed_url.path.replace('/', '\\').lstrip('\\')
+            return _verdict_of(self._probe_target(file_path))
+            
+        # 对于网络URL，我们不进行实际连接检查，因为这可能会很慢
+        # 只检查URL格式是否正确
+        return Verdict.VALID
     
     def _check_uwp_app(self, app_id):
         """
@@ -183,34 +969,294 @@ class ShortcutChecker:
         返回:
             bool: 应用是否已安装
         """
+        return self._get_uwp_index().contains(app_id)
+    
+    def _get_uwp_index(self):
+        """
+        获取UWP包快照，扫描中只读取一次注册表
+        
+        返回:
+            PackageIndex: 已安装UWP包的索引
+        """
+        index = self._uwp_index
+        if index is not None:
+            return index
+        
+        with self._uwp_lock:
+            if self._uwp_index is not None:
+                return self._uwp_index
+            index = PackageIndex.from_registry(self.registry)
+            # 扫描之外不保留快照，避免使用过期的数据
+            if self._verdicts is not None:
+                self._uwp_index = index
+            return index
+
+
+def _case_variants(exts):
+    """
+    展开扩展名的所有大小写组合，供str.endswith直接匹配
+    
+    参数:
+        exts (list): 小写扩展名列表，如['.lnk', '.url']
+        
+    返回:
+        tuple: 所有大小写组合
+    """
+    variants = set()
+    for ext in exts:
+        for chars in product(*((c.lower(), c.upper()) for c in ext)):
+            variants.add(''.join(chars))
+    return tuple(sorted(variants))
+
+
+def _list_directory(directory, suffixes):
+    """
+    列举一个目录中的快捷方式和子目录
+    
+    参数:
+        directory (str): 目录路径
+        suffixes (tuple): 快捷方式扩展名的所有大小写组合
+        
+    返回:
+        tuple: (快捷方式的os.DirEntry列表, 子目录路径列表)
+        
+    异常:
+        OSError: 目录无法列举
+    """
+    shortcuts = []
+    subdirs = []
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if _is_dir(entry):
+                # 与os.walk一致，不进入符号链接指向的目录
+                if not entry.is_symlink():
+                    subdirs.append(entry.path)
+            elif entry.name.endswith(suffixes):
+                shortcuts.append(entry)
+    return shortcuts, subdirs
+
+
+def _is_dir(entry):
+    """判断目录项是否为目录，出错时视为文件(与os.walk一致)"""
+    try:
+        return entry.is_dir()
+    except OSError:
+        return False
+
+
+def _counted(probe, stats):
+    """包装存在性检查函数，记录实际执行的次数"""
+    def counted(path):
+        stats.shard().count('stat_calls')
+        return probe(path)
+    return counted
+
+
+def _kind(shortcut_path):
+    """快捷方式的类型，为小写且不带点的扩展名"""
+    return os.path.splitext(shortcut_path)[1].lower().lstrip('.')
+
+
+def _verdict_of(valid):
+    """把存在性检查的结果转换为Verdict"""
+    if valid == UNREACHABLE:
+        return Verdict.UNREACHABLE
+    return Verdict.VALID if valid else Verdict.MISSING_TARGET
+
+
+def _cached_verdict(kind, target, valid):
+    """由增量扫描数据库中保存的目标和是否有效推断检查结果"""
+    if valid:
+        return Verdict.VALID
+    if not target:
+        return Verdict.EMPTY_TARGET
+    if kind == 'url':
+        parsed_url = urlparse(target)
+        if not parsed_url.scheme or not parsed_url.netloc:
+            return Verdict.BAD_URL
+    return Verdict.MISSING_TARGET
+
+
+def _timed_verdicts(check, stats):
+    """包装检查函数，按检查结果记录数量和用时"""
+    def timed(item):
+        start = time.perf_counter()
+        result = check(item)
+        stats.shard().add_verdict(result.verdict.value, time.perf_counter() - start)
+        return result
+    return timed
+
+
+def _traced(check, tracer):
+    """包装检查函数，为每个快捷方式记录一个区间，名称为文件名"""
+    def traced(item):
+        start = time.perf_counter()
+        result = check(item)
+        tracer.complete(os.path.basename(result.path), 'shortcut', start, time.perf_counter(),
+                        {'path': result.path, 'target': result.target,
+                         'verdict': result.verdict.value})
+        return result
+    return traced
+
+
+def _checkpointed(check, cancel_token):
+    """在检查每个快捷方式之前响应暂停和取消"""
+    def checkpointed(item):
+        cancel_token.checkpoint()
+        return check(item)
+    return checkpointed
+
+
+def _result(future, cancel_token):
+    """等待任务结果，等待期间定期检查是否已取消"""
+    if cancel_token is None:
+        return future.result()
+    
+    while True:
+        if cancel_token.cancelled:
+            raise ScanCancelled()
         try:
-            # 尝试通过注册表检查UWP应用
-            key_path = r"Software\Classes\Extensions\ContractId\Windows.Launch\PackageId"
-            with winreg.OpenKey(winreg.HKEY_CURRENT_USER, key_path) as key:
-                # 遍历注册表项
-                i = 0
-                while True:
-                    try:
-                        subkey_name = winreg.EnumKey(key, i)
-                        if app_id.lower() in subkey_name.lower():
-                            return True
-                        i += 1
-                    except WindowsError:
-                        break
-            return False
-        except Exception:
-            return False
+            return future.result(timeout=CANCEL_POLL_INTERVAL)
+        except FutureTimeoutError:
+            pass
+
+
+class _DaemonPool:
+    """
+    由守护线程组成的线程池，线程按需启动
+
+    ThreadPoolExecutor的线程在解释器退出时会被等待，取消扫描后仍卡在缓慢的
+    文件系统调用中的线程会拖住关闭窗口或进程退出；这里的线程不会
+    """
+    
+    def __init__(self, workers, name):
+        """
+        参数:
+            workers (int): 最多的线程数
+            name (str): 线程名前缀
+        """
+        self.workers = workers
+        self.name = name
+        self._tasks = queue.SimpleQueue()
+        self._threads = []
+    
+    def submit(self, function, item):
+        """
+        提交一个任务
+
+        返回:
+            concurrent.futures.Future: 任务结果
+        """
+        future = Future()
+        self._tasks.put((future, function, item))
+        if len(self._threads) < self.workers:
+            thread = threading.Thread(target=self._run, daemon=True,
+                                      name=f"{self.name}_{len(self._threads)}")
+            thread.start()
+            self._threads.append(thread)
+        return future
+    
+    def _run(self):
+        while True:
+            task = self._tasks.get()
+            if task is None:
+                return
+            future, function, item = task
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(function(item))
+            except BaseException as e:
+                future.set_exception(e)
+    
+    def shutdown(self, wait=True):
+        """
+        让所有线程在完成当前任务后退出
+
+        参数:
+            wait (bool): 是否等待线程退出
+        """
+        for _ in self._threads:
+            self._tasks.put(None)
+        if wait:
+            for thread in self._threads:
+                thread.join()
+
+
+class _BackgroundDiscovery:
+    """在后台线程中查找快捷方式，通过有界队列逐个交给使用方"""
+    
+    _END = object()
+    
+    def __init__(self, iterable, maxsize=DISCOVERY_QUEUE_SIZE, cancel_token=None):
+        self._queue = queue.Queue(maxsize)
+        self._cancel_token = cancel_token
+        self._stop = threading.Event()
+        self._error = None
+        # 已查找到的数量以及查找是否已结束
+        self.count = 0
+        self.finished = False
+        self._thread = threading.Thread(target=self._run, args=(iterable,),
+                                        name="shortcut-discovery", daemon=True)
+        self._thread.start()
+    
+    def _run(self, iterable):
+        try:
+            for item in iterable:
+                if self._cancel_token is not None:
+                    self._cancel_token.checkpoint()
+                if not self._put(item):
+                    return
+                self.count += 1
+        except ScanCancelled:
+            pass
+        except Exception as e:
+            self._error = e
+        finally:
+            self.finished = True
+            self._put(self._END)
+    
+    def _put(self, item):
+        # 使用方已停止时不再阻塞在满队列上
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+    
+    def __iter__(self):
+        return self
+    
+    def __next__(self):
+        if self._cancel_token is None:
+            item = self._queue.get()
+        else:
+            # 查找线程可能卡在缓慢的目录列举中，定期检查是否已取消
+            while True:
+                if self._cancel_token.cancelled:
+                    raise ScanCancelled()
+                try:
+                    item = self._queue.get(timeout=CANCEL_POLL_INTERVAL)
+                    break
+                except queue.Empty:
+                    pass
+        if item is self._END:
+            self._queue.put(self._END)
+            if self._cancel_token is not None and self._cancel_token.cancelled:
+                raise ScanCancelled()
+            if self._error is not None:
+                raise self._error
+            raise StopIteration
+        return item
+    
+    def close(self):
+        """停止后台查找"""
+        self._stop.set()
 
 
 if __name__ == "__main__":
-    # 简单测试
-    if len(sys.argv) > 1:
-        folder_path = sys.argv[1]
-        checker = ShortcutChecker()
-        invalid_shortcuts = checker.check_folder(folder_path)
-        
-        print(f"发现 {len(invalid_shortcuts)} 个无效快捷方式:")
-        for shortcut in invalid_shortcuts:
-            print(f"  - {shortcut}")
-    else:
-        print("用法: python shortcut_checker.py <文件夹路径>") 
\ No newline at end of file
+    # 命令行用法见cli.py
+    from cli import main
+    sys.exit(main())
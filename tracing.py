@@ -0,0 +1,127 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+扫描时间线追踪模块
+记录每个快捷方式和每个阶段的起止时间及所在线程，输出为Chrome trace-event格式，
+可在chrome://tracing或Perfetto等查看器中按线程查看时间线，找出拖慢扫描的个别目标
+"""
+
+import os
+import json
+import time
+import threading
+
+
+class TraceRecorder:
+    """
+    时间线记录器
+
+    事件先以元组保存，写出时才转换为JSON对象；多个线程可以同时记录，
+    每个线程在时间线中显示为一行，行名为线程名
+    """
+
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self.pid = os.getpid()
+        # (名称, 类别, 开始时间, 持续时间, 线程号, 参数)，时间为perf_counter秒数
+        self.events = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        # {线程号: 线程名}
+        self._threads = {}
+
+    def complete(self, name, category, start, end, args=None):
+        """
+        记录一个已结束的区间
+
+        参数:
+            name (str): 区间名称
+            category (str): 类别，如'phase'或'shortcut'
+            start (float): 开始时的time.perf_counter()
+            end (float): 结束时的time.perf_counter()
+            args (dict): 附加参数，在查看器中点击区间时显示
+        """
+        self.events.append((name, category, start, end - start, self._tid(), args))
+
+    def span(self, name, category='phase', args=None):
+        """
+        以上下文管理器的形式记录区间
+
+        参数:
+            name (str): 区间名称
+            category (str): 类别
+            args (dict): 附加参数
+
+        返回:
+            上下文管理器，退出时记录区间
+        """
+        return _Span(self, name, category, args)
+
+    def _tid(self):
+        """当前线程在时间线中的编号，首次出现时登记线程名"""
+        try:
+            return self._local.tid
+        except AttributeError:
+            with self._lock:
+                tid = len(self._threads) + 1
+                self._threads[tid] = threading.current_thread().name
+            self._local.tid = tid
+            return tid
+
+    def to_dict(self):
+        """
+        返回:
+            dict: trace-event格式的数据，时间单位为微秒
+        """
+        trace = [{'name': 'process_name', 'ph': 'M', 'pid': self.pid, 'tid': 0,
+                  'args': {'name': 'CheckInk'}}]
+        with self._lock:
+            threads = dict(self._threads)
+        for tid, name in threads.items():
+            trace.append({'name': 'thread_name', 'ph': 'M', 'pid': self.pid, 'tid': tid,
+                          'args': {'name': name}})
+
+        for name, category, start, duration, tid, args in list(self.events):
+            event = {
+                'name': name, 'cat': category, 'ph': 'X', 'pid': self.pid, 'tid': tid,
+                'ts': round((start - self.origin) * 1e6, 3),
+                'dur': round(duration * 1e6, 3),
+            }
+            if args:
+                event['args'] = args
+            trace.append(event)
+        return {'traceEvents': trace, 'displayTimeUnit': 'ms'}
+
+    def write(self, path):
+        """
+        把时间线写入文件
+
+        参数:
+            path (str): 输出的JSON文件路径
+        """
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False)
+
+    def __len__(self):
+        return len(self.events)
+
+
+class _Span:
+    """TraceRecorder.span返回的上下文管理器"""
+
+    __slots__ = ('recorder', 'name', 'category', 'args', 'start')
+
+    def __init__(self, recorder, name, category, args):
+        self.recorder = recorder
+        self.name = name
+        self.category = category
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.recorder.complete(self.name, self.category, self.start, time.perf_counter(),
+                               self.args)
+        return False
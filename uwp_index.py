@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+UWP应用索引模块
+把已安装的UWP包名一次性读入内存，支持快速的不区分大小写子串查询
+"""
+
+import threading
+
+from registry import HKEY_CURRENT_USER
+
+
+# 登记UWP包的注册表项
+PACKAGE_ID_KEY = r"Software\Classes\Extensions\ContractId\Windows.Launch\PackageId"
+
+# 子串索引使用的n-gram长度
+_GRAM = 3
+
+
+class PackageIndex:
+    """
+    UWP包名快照
+
+    以三元组(trigram)倒排索引加速子串查询：查询串的每个三元组都必须出现在
+    候选包名中，先取最少见的几个三元组求交集，再对少量候选逐个确认
+    """
+
+    def __init__(self, names):
+        """
+        参数:
+            names (iterable): 包名列表
+        """
+        self._names = [name.lower() for name in names]
+        self._grams = {}
+        for i, name in enumerate(self._names):
+            for gram in {name[j:j + _GRAM] for j in range(len(name) - _GRAM + 1)}:
+                self._grams.setdefault(gram, set()).add(i)
+        self._lock = threading.Lock()
+        self._memo = {}
+
+    @classmethod
+    def from_registry(cls, registry):
+        """
+        从注册表读取已安装的UWP包
+
+        参数:
+            registry: 注册表后端，见registry模块
+
+        返回:
+            PackageIndex: 包名快照，读取失败时为空
+        """
+        try:
+            names = registry.enum_subkeys(HKEY_CURRENT_USER, PACKAGE_ID_KEY)
+        except OSError:
+            names = []
+        return cls(names)
+
+    def contains(self, app_id):
+        """
+        判断是否有包名包含app_id(不区分大小写)
+
+        参数:
+            app_id (str): 应用ID
+
+        返回:
+            bool: 是否找到
+        """
+        query = app_id.lower()
+        result = self._memo.get(query)
+        if result is None:
+            result = self._search(query)
+            with self._lock:
+                self._memo[query] = result
+        return result
+
+    def _search(self, query):
+        if len(query) < _GRAM:
+            return any(query in name for name in self._names)
+
+        grams = {query[j:j + _GRAM] for j in range(len(query) - _GRAM + 1)}
+        postings = sorted((self._grams.get(gram, ()) for gram in grams), key=len)
+        if not postings[0]:
+            return False
+
+        candidates = set(postings[0])
+        for posting in postings[1:4]:
+            candidates &= posting
+            if not candidates:
+                return False
+
+        names = self._names
+        return any(query in names[i] for i in candidates)
+
+    def __len__(self):
+        return len(self._names)
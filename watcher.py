@@ -0,0 +1,392 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+监视模块
+持续监视文件夹，只重新检查新建、修改过的快捷方式以及目标所在目录发生变化的快捷方式
+"""
+
+import os
+import time
+import threading
+from importlib.util import find_spec
+
+from existence import ProbeTimeout
+
+
+# 轮询模式下比较快捷方式目录修改时间的间隔(秒)
+DEFAULT_INTERVAL = 2.0
+
+# 轮询模式下重新检查所有快捷方式文件修改时间的间隔(秒)
+DEFAULT_FILE_CHECK_INTERVAL = 60.0
+
+# 检查目标目录修改时间的间隔(秒)，每个不同的目标目录只stat一次
+DEFAULT_TARGET_CHECK_INTERVAL = 5.0
+
+
+class FolderWatcher:
+    """
+    文件夹监视器
+
+    Windows上安装了pywin32时使用ReadDirectoryChangesW接收变更通知，只在收到通知时处理；
+    通知线程出错退出后改为轮询，每隔interval比较一次目录的修改时间，只列举发生变化的目录。
+    快捷方式目标所在的目录每隔target_check_interval按修改时间比较一次，
+    比较受存在性检查的时限和根熔断约束，目标被删除或恢复时重新检查相关快捷方式
+    """
+
+    def __init__(self, checker, folders, callback, recursive=True, interval=DEFAULT_INTERVAL,
+                 file_check_interval=DEFAULT_FILE_CHECK_INTERVAL, use_notifications=True,
+                 target_check_interval=DEFAULT_TARGET_CHECK_INTERVAL):
+        """
+        参数:
+            checker (ShortcutChecker): 检查器
+            folders (list): 要监视的文件夹
+            callback (callable): 结果回调，接收(快捷方式路径, 是否有效)，
+                快捷方式被删除时是否有效为None
+            recursive (bool): 是否监视子文件夹
+            interval (float): 轮询模式下比较快捷方式目录修改时间的间隔(秒)
+            file_check_interval (float): 轮询模式下检查快捷方式文件本身修改时间的间隔(秒)
+            use_notifications (bool): 是否优先使用系统的变更通知
+            target_check_interval (float): 检查目标目录修改时间的间隔(秒)
+        """
+        self.checker = checker
+        self.folders = list(folders)
+        self.callback = callback
+        self.recursive = recursive
+        self.interval = interval
+        self.file_check_interval = file_check_interval
+        self.target_check_interval = target_check_interval
+        self.use_notifications = use_notifications
+        self.stop_event = threading.Event()
+
+        # 快捷方式目录: {目录: 修改时间}，{目录: 子目录集合}，{目录: 快捷方式集合}
+        self._dirs = {}
+        self._subdirs = {}
+        self._dir_shortcuts = {}
+        # 快捷方式: {路径: (修改时间, 大小, 目标目录键)}
+        self._shortcuts = {}
+        # 目标目录: {目录键: [目录, 修改时间, 依赖该目录的快捷方式集合]}
+        self._targets = {}
+
+        # 变更通知记录的待处理目录和文件
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._dirty_dirs = set()
+        self._dirty_files = set()
+        self._resync = False
+        self._notifiers = []
+
+    def run(self):
+        """
+        先完整检查一次，然后持续监视直到stop()被调用
+        """
+        with self.checker.session():
+            for folder in self.folders:
+                self._sync_dir(folder)
+        if self.stop_event.is_set():
+            return
+
+        if self.use_notifications:
+            self._notifiers = _start_notifiers(self.folders, self.recursive,
+                                               self._on_change, self.stop_event)
+        last_file_check = last_target_check = time.monotonic()
+
+        while not self.stop_event.is_set():
+            # 任一通知线程出错退出后改为轮询
+            polling = not self._notifiers or any(n.failed for n in self._notifiers)
+            if polling:
+                timeout = min(self.interval, self.target_check_interval)
+            else:
+                timeout = self.target_check_interval
+            self._wake.wait(timeout)
+            self._wake.clear()
+            if self.stop_event.is_set():
+                break
+
+            now = time.monotonic()
+            check_files = polling and now - last_file_check >= self.file_check_interval
+            if check_files:
+                last_file_check = now
+            check_targets = now - last_target_check >= self.target_check_interval
+            if check_targets:
+                last_target_check = now
+
+            self.poll(polling, check_files, check_targets)
+
+    def stop(self):
+        """停止监视"""
+        self.stop_event.set()
+        self._wake.set()
+
+    def poll(self, check_dirs=True, check_files=False, check_targets=True):
+        """
+        处理一轮变化，没有需要处理的内容时不产生任何I/O
+
+        参数:
+            check_dirs (bool): 是否比较所有快捷方式目录的修改时间(轮询模式)
+            check_files (bool): 是否比较所有快捷方式文件的修改时间和大小
+            check_targets (bool): 是否比较目标目录的修改时间，收到变更通知时总会比较
+        """
+        with self._lock:
+            dirty_dirs, self._dirty_dirs = self._dirty_dirs, set()
+            dirty_files, self._dirty_files = self._dirty_files, set()
+            if self._resync:
+                self._resync = False
+                check_dirs = True
+                check_files = True
+                check_targets = True
+
+        if dirty_dirs or dirty_files:
+            # 收到变更通知时顺带比较目标目录
+            check_targets = True
+        elif not (check_dirs or check_files or check_targets):
+            return
+
+        stopped = self.stop_event.is_set
+        with self.checker.session():
+            if check_dirs:
+                for directory, mtime in list(self._dirs.items()):
+                    if stopped():
+                        return
+                    if _mtime(directory) != mtime:
+                        dirty_dirs.add(directory)
+            for directory in dirty_dirs:
+                if stopped():
+                    return
+                if directory in self._dirs:
+                    self._sync_dir(directory)
+
+            if check_files:
+                dirty_files.update(self._shortcuts)
+            for shortcut_path in dirty_files:
+                if stopped():
+                    return
+                if shortcut_path in self._shortcuts:
+                    self._refresh_file(shortcut_path)
+
+            if check_targets:
+                self._poll_targets()
+
+    def _on_change(self, path):
+        """变更通知回调，在通知线程中执行"""
+        with self._lock:
+            if path is None:
+                # 通知缓冲区溢出，全部重新比较
+                self._resync = True
+            else:
+                self._dirty_dirs.add(os.path.dirname(path))
+                self._dirty_dirs.add(path)
+                self._dirty_files.add(path)
+        self._wake.set()
+
+    def _sync_dir(self, directory):
+        """重新列举目录并与记录比较，stop()被调用后立即返回，不再更新记录"""
+        if self.stop_event.is_set():
+            return
+        mtime = _mtime(directory)
+        try:
+            entries, subdirs = self.checker.list_directory(directory)
+        except OSError:
+            self._drop_dir(directory)
+            return
+
+        self._dirs[directory] = mtime
+
+        # 子目录
+        if self.recursive:
+            old_subdirs = self._subdirs.get(directory, set())
+            new_subdirs = set(subdirs)
+            self._subdirs[directory] = new_subdirs
+            for subdir in old_subdirs - new_subdirs:
+                self._drop_dir(subdir)
+            for subdir in subdirs:
+                if subdir not in old_subdirs:
+                    self._sync_dir(subdir)
+            if self.stop_event.is_set():
+                return
+
+        # 快捷方式
+        old_shortcuts = self._dir_shortcuts.get(directory, set())
+        new_shortcuts = set()
+        for entry in entries:
+            if self.stop_event.is_set():
+                return
+            new_shortcuts.add(entry.path)
+            try:
+                stat = entry.stat()
+                signature = (stat.st_mtime_ns, stat.st_size)
+            except OSError:
+                signature = None
+            known = self._shortcuts.get(entry.path)
+            if known is None or known[:2] != signature:
+                self._check(entry.path, signature)
+        self._dir_shortcuts[directory] = new_shortcuts
+
+        for shortcut_path in old_shortcuts - new_shortcuts:
+            self._forget_shortcut(shortcut_path)
+            self.callback(shortcut_path, None)
+
+    def _drop_dir(self, directory):
+        """目录被删除时移除其下所有记录"""
+        self._dirs.pop(directory, None)
+        for subdir in self._subdirs.pop(directory, ()):
+            self._drop_dir(subdir)
+        for shortcut_path in self._dir_shortcuts.pop(directory, ()):
+            self._forget_shortcut(shortcut_path)
+            self.callback(shortcut_path, None)
+
+    def _refresh_file(self, shortcut_path):
+        """快捷方式文件本身被修改时重新检查"""
+        try:
+            stat = os.stat(shortcut_path)
+        except OSError:
+            # 已删除，由目录比较处理
+            return
+        signature = (stat.st_mtime_ns, stat.st_size)
+        if self._shortcuts[shortcut_path][:2] != signature:
+            self._check(shortcut_path, signature)
+
+    def _check(self, shortcut_path, signature):
+        """检查快捷方式并登记其目标所在目录"""
+        self._forget_shortcut(shortcut_path)
+        target, valid = self.checker.check_shortcut(shortcut_path)
+
+        target_dir = None
+        if target and shortcut_path.lower().endswith('.lnk') and os.path.dirname(target):
+            target_dir = os.path.dirname(target)
+            key = os.path.normcase(target_dir)
+            record = self._targets.get(key)
+            if record is None:
+                try:
+                    mtime = self._target_mtime(target_dir)
+                except ProbeTimeout:
+                    mtime = None
+                record = self._targets[key] = [target_dir, mtime, set()]
+            record[2].add(shortcut_path)
+            target_dir = key
+
+        self._shortcuts[shortcut_path] = (signature[0], signature[1], target_dir) \
+            if signature else (None, None, target_dir)
+        self.callback(shortcut_path, valid)
+
+    def _forget_shortcut(self, shortcut_path):
+        known = self._shortcuts.pop(shortcut_path, None)
+        if known is None or known[2] is None:
+            return
+        record = self._targets.get(known[2])
+        if record is not None:
+            record[2].discard(shortcut_path)
+            if not record[2]:
+                del self._targets[known[2]]
+
+    def _poll_targets(self):
+        """目标目录发生变化时重新检查依赖它的快捷方式"""
+        for key, record in list(self._targets.items()):
+            if self.stop_event.is_set():
+                return
+            try:
+                mtime = self._target_mtime(record[0])
+            except ProbeTimeout:
+                # 暂时无法访问时保留原记录，等恢复后再比较
+                continue
+            if mtime == record[1]:
+                continue
+            record[1] = mtime
+            for shortcut_path in list(record[2]):
+                if self.stop_event.is_set():
+                    return
+                known = self._shortcuts.get(shortcut_path)
+                if known is not None:
+                    self._check(shortcut_path, known[:2])
+
+    def _target_mtime(self, directory):
+        """
+        目标目录的修改时间，目录不存在时为None
+
+        异常:
+            ProbeTimeout: 超过存在性检查的时限，或所在的共享根或盘符已熔断
+        """
+        return self.checker.call_guarded(_mtime, directory)
+
+
+def _mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _start_notifiers(folders, recursive, on_change, stop_event):
+    """
+    为每个文件夹启动变更通知线程
+
+    返回:
+        list: 通知线程，当前平台不支持时为空列表
+    """
+    if find_spec('win32file') is None:
+        return []
+
+    notifiers = []
+    for folder in folders:
+        notifier = _Win32Notifier(folder, recursive, on_change, stop_event)
+        notifier.start()
+        notifiers.append(notifier)
+    return notifiers
+
+
+class _Win32Notifier(threading.Thread):
+    """使用ReadDirectoryChangesW接收文件夹变更通知"""
+
+    def __init__(self, folder, recursive, on_change, stop_event):
+        super().__init__(name="folder-watcher", daemon=True)
+        self.folder = folder
+        self.recursive = recursive
+        self.on_change = on_change
+        self.stop_event = stop_event
+        # 出错退出后为True，监视器据此改为轮询
+        self.failed = False
+
+    def run(self):
+        import win32con
+        import win32event
+        import win32file
+        import pywintypes
+
+        handle = None
+        try:
+            handle = win32file.CreateFile(
+                self.folder,
+                0x0001,  # FILE_LIST_DIRECTORY
+                win32con.FILE_SHARE_READ | win32con.FILE_SHARE_WRITE | win32con.FILE_SHARE_DELETE,
+                None,
+                win32con.OPEN_EXISTING,
+                win32con.FILE_FLAG_BACKUP_SEMANTICS | win32con.FILE_FLAG_OVERLAPPED,
+                None
+            )
+            overlapped = pywintypes.OVERLAPPED()
+            overlapped.hEvent = win32event.CreateEvent(None, True, False, None)
+            buffer = win32file.AllocateReadBuffer(64 * 1024)
+            flags = (win32con.FILE_NOTIFY_CHANGE_FILE_NAME | win32con.FILE_NOTIFY_CHANGE_DIR_NAME |
+                     win32con.FILE_NOTIFY_CHANGE_LAST_WRITE | win32con.FILE_NOTIFY_CHANGE_SIZE)
+
+            while not self.stop_event.is_set():
+                win32file.ReadDirectoryChangesW(handle, buffer, self.recursive, flags, overlapped)
+
+                # 每隔0.5秒检查一次是否需要停止
+                while win32event.WaitForSingleObject(overlapped.hEvent, 500) != win32event.WAIT_OBJECT_0:
+                    if self.stop_event.is_set():
+                        win32file.CancelIo(handle)
+                        return
+
+                size = win32file.GetOverlappedResult(handle, overlapped, True)
+                if size == 0:
+                    self.on_change(None)
+                    continue
+                for _, name in win32file.FILE_NOTIFY_INFORMATION(buffer, size):
+                    self.on_change(os.path.join(self.folder, name))
+        except pywintypes.error:
+            # 文件夹被删除或无法访问时退回轮询，并全部重新比较一次
+            self.failed = True
+            self.on_change(None)
+        finally:
+            if handle is not None:
+                handle.Close()